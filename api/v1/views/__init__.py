@@ -6,11 +6,24 @@ It also initializes the blueprint.
 see each view for more information on the routes.
 """
 
-from flask import Blueprint
+from flask import Blueprint, Response
 
 app_views = Blueprint('app_views', __name__, url_prefix='/api/v1/')
 
 
+def jsonify_objects(objects):
+    """
+    Return a JSON list response of model objects.
+
+    The list is spliced from the JSON encoding each object caches
+    (see `BaseModel.to_json`) instead of re-encoding every `to_dict()`.
+    """
+    return Response(
+        "[{}]\n".format(", ".join(obj.to_json() for obj in objects)),
+        mimetype="application/json"
+    )
+
+
 if app_views:
     from api.v1.views.index import *
     from api.v1.views.states import *
@@ -34,16 +34,13 @@ The following error codes are returned:
 from flask import jsonify, abort, request
 from models import storage
 from models.amenity import Amenity
-from api.v1.views import app_views
+from api.v1.views import app_views, jsonify_objects
 
 
 @app_views.route("/amenities", methods=["GET"])
 def get_amenities():
     """Return a JSON list of all Amenity objects"""
-    return jsonify([
-        amenity.to_dict()
-        for amenity in storage.all(Amenity).values()
-    ])
+    return jsonify_objects(storage.all(Amenity).values())
 
 
 @app_views.route("/amenities/<amenity_id>", methods=["GET"])
@@ -39,20 +39,17 @@ from flask import jsonify, abort, request
 from models.state import State
 from models.city import City
 from models import storage
-from api.v1.views import app_views
+from api.v1.views import app_views, jsonify_objects
 
 
 @app_views.route("/states/<state_id>/cities/", methods=["GET"])
 def get_cities(state_id):
     """Return a JSON list of all City objects in a State"""
-    state = storage.get(State, state_id)
+    state = storage.get(State, state_id, load=["cities"])
     if not state:
         abort(404)
 
-    return jsonify([
-        city.to_dict()
-        for city in state.cities
-    ])
+    return jsonify_objects(state.cities)
 
 
 @app_views.route("/cities/<city_id>", methods=["GET"])
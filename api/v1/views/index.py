@@ -32,9 +32,11 @@ def get_stats():
         "reviews": "Review"
     }
 
+    counts = storage.counts()
+
     return jsonify(
         {
-            key: storage.count(storage.get_class(value))
+            key: counts.get(value, 0)
             for key, value in classes.items()
         }
     )
@@ -11,7 +11,7 @@ from models.city import City
 from models.place import Place
 from models import storage
 
-from api.v1.views import app_views
+from api.v1.views import app_views, jsonify_objects
 
 
 @app_views.route("/cities/<city_id>/places", methods=["GET"])
@@ -23,14 +23,11 @@ def get_places(city_id):
     Return 200 status code with the list of Place objects
     with City with <city_id> in JSON format if success.
     """
-    city = storage.get(City, city_id)
+    city = storage.get(City, city_id, load=["places"])
     if not city:
         abort(404)
 
-    return jsonify([
-        place.to_dict()
-        for place in city.places
-    ])
+    return jsonify_objects(city.places)
 
 
 @app_views.route("/places/<place_id>", methods=["GET"])
@@ -144,50 +141,12 @@ def places_search():
     if search_data is None:
         abort(400, "Not a JSON")
 
-    # Fetch all places
-    places = storage.all(Place).values()
-
-    # List to store filtered places
-    filtered_places = []
-
-    # Iterate through all places
-    for place in places:
-        # Initialize variables to track filter matches (default True)
-        state_matches = True
-        city_matches = True
-
-        # Check for state filter
-        if search_data.get("states"):
-            # Check if place's city state matches any in search data
-            state_matches = place.city.state_id in search_data["states"]
-
-            # If state filter matches, set city_matches to False (OR logic)
-            city_matches = False
-
-        # Check for city filter (only if no state filter or \
-        # "cities" key exists)
-        if ((not state_matches or not search_data.get("states")) and
-                search_data.get("cities")):
-            # Check if place's city ID matches any in search data
-            city_matches = place.city_id in search_data["cities"]
-
-            # If city filter matches, set state_matches to False (OR logic)
-            state_matches = False
-
-        # Check for amenity filter
-        amenity_matches = True
-        if search_data.get("amenities"):
-            # Check if all amenity IDs in search data are present \
-            # in the place's amenities
-            amenity_matches = all(
-                amenity_id in [amenity.id for amenity in place.amenities]
-                for amenity_id in search_data["amenities"]
-            )
-
-        # Add place to filtered list if state or \
-        # city matches AND all amenity matches
-        if (state_matches or city_matches) and amenity_matches:
-            filtered_places.append(place)
+    # Filter the places in the storage, in a single query in DB mode
+    filtered_places = storage.search_places(
+        states=search_data.get("states"),
+        cities=search_data.get("cities"),
+        amenities=search_data.get("amenities")
+    )
 
     # Return JSON response with list of place dictionaries
-    return jsonify([place.to_dict() for place in filtered_places])
+    return jsonify_objects(filtered_places)
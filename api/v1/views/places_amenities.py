@@ -14,7 +14,7 @@ from models.amenity import Amenity
 from models.place import Place
 
 from models import storage
-from api.v1.views import app_views
+from api.v1.views import app_views, jsonify_objects
 
 
 @app_views.route("/places/<place_id>/amenities", methods=["GET"])
@@ -26,14 +26,11 @@ def get_place_amenities(place_id):
     Returns a JSON-formatted list of Amenity objects in the Place object
     with the given id or 404 if no Place object with the given id is found
     """
-    place = storage.get(Place, place_id)
+    place = storage.get(Place, place_id, load=["amenities"])
     if not place:
         abort(404)
 
-    return jsonify([
-        amenity.to_dict()
-        for amenity in place.amenities
-    ])
+    return jsonify_objects(place.amenities)
 
 
 @app_views.route(
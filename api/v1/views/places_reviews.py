@@ -51,7 +51,7 @@ from models.review import Review
 from models.user import User
 from models import storage
 
-from api.v1.views import app_views
+from api.v1.views import app_views, jsonify_objects
 
 
 @app_views.route('/places/<place_id>/reviews', methods=['GET'])
@@ -62,12 +62,11 @@ def get_reviews(place_id):
     Returns a JSON list of all Review objects of a Place
     or a 404 error if the Place is not found.
     """
-    place = storage.get(Place, place_id)
+    place = storage.get(Place, place_id, load=["reviews"])
     if place is None:
         abort(404)
 
-    reviews = [review.to_dict() for review in place.reviews]
-    return jsonify(reviews)
+    return jsonify_objects(place.reviews)
 
 
 @app_views.route('/reviews/<review_id>', methods=['GET'])
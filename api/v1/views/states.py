@@ -38,16 +38,13 @@ from flask import jsonify, abort, request
 from models import storage
 from models.state import State
 
-from api.v1.views import app_views
+from api.v1.views import app_views, jsonify_objects
 
 
 @app_views.route("/states/", methods=["GET"])
 def get_states():
     """Return a JSON list of all State objects"""
-    return jsonify([
-        state.to_dict()
-        for state in storage.all(State).values()
-    ])
+    return jsonify_objects(storage.all(State).values())
 
 
 @app_views.route("/states/<state_id>", methods=["GET"])
@@ -39,16 +39,13 @@ The following error codes are returned:
 from flask import jsonify, abort, request
 from models.user import User
 from models import storage
-from api.v1.views import app_views
+from api.v1.views import app_views, jsonify_objects
 
 
 @app_views.route("/users", methods=["GET"])
 def get_users():
     """Return a JSON list of all User objects"""
-    return jsonify([
-        user.to_dict()
-        for user in storage.all(User).values()
-    ])
+    return jsonify_objects(storage.all(User).values())
 
 
 @app_views.route("/users/<user_id>", methods=["GET"])
@@ -0,0 +1,69 @@
+#!/usr/bin/python3
+"""
+Shared helpers for the storage benchmarks.
+
+Every benchmark in this package is a standalone script that can be run
+from the repository root, for example:
+
+    python3 -m benchmarks.file_storage_all --objects 1000000
+
+The helpers below build synthetic datasets and time the measured calls.
+"""
+import time
+
+from models.engine.stored_classes import CLASSES
+
+
+def populate(storage, size):
+    """
+    Fills a storage with `size` objects spread evenly over
+    every stored class.
+
+    Parameters:
+        storage (Storage): the storage to fill
+        size (int): the total number of objects to create
+
+    Returns:
+        Storage: the filled storage
+    """
+    classes = tuple(CLASSES.values())
+
+    for index in range(size):
+        _class = classes[index % len(classes)]
+        storage.new(_class(name="obj-{}".format(index)))
+
+    return storage
+
+
+def measure(func, repeat=5):
+    """
+    Calls a function several times and returns the best wall time.
+
+    Parameters:
+        func (callable): the function to time
+        repeat (int): the number of calls
+
+    Returns:
+        float: the fastest call duration in seconds
+    """
+    best = float("inf")
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def report(title, rows):
+    """
+    Prints a benchmark result table.
+
+    Parameters:
+        title (str): the table title
+        rows (list[tuple[str, float]]): (label, seconds) pairs
+    """
+    print(title)
+    for label, seconds in rows:
+        print("  {:<40} {:>12.3f} ms".format(label, seconds * 1000))
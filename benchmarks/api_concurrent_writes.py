@@ -0,0 +1,69 @@
+#!/usr/bin/python3
+"""
+Benchmarks the API throughput of `POST /api/v1/states` sent by several
+threads at once, when each request writes the file in turn, as
+`FileStorage.save()` used to, and with group commit.
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+from models import storage
+from api.v1.app import app
+
+from benchmarks import populate
+
+
+def requests_per_second(threads, requests):
+    """
+    Sends `requests` POST requests from each of `threads` threads
+    and returns the overall throughput
+    """
+    def post_states():
+        client = app.test_client()
+        for index in range(requests):
+            client.post("/api/v1/states", json={"name": str(index)})
+
+    workers = [threading.Thread(target=post_states) for _ in range(threads)]
+    start = time.perf_counter()
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    return threads * requests / (time.perf_counter() - start)
+
+
+def main():
+    """Runs the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--objects", type=int, default=100000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=10,
+                        help="requests sent by each thread")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.chdir(tmp_dir)
+        populate(storage, args.objects)
+        storage.save()
+
+        rows = []
+        for label, save in (("one write per request",
+                             storage._locked_save),
+                            ("group commit", storage.save)):
+            storage.save = save
+            for threads in (1, args.threads):
+                rows.append(("{}, {} threads".format(label, threads),
+                             requests_per_second(threads, args.requests)))
+            del storage.save
+
+    print("{} stored objects".format(args.objects))
+    for label, throughput in rows:
+        print("  {:<40} {:>12.1f} req/s".format(label, throughput))
+
+
+if __name__ == "__main__":
+    main()
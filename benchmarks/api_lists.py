@@ -0,0 +1,46 @@
+#!/usr/bin/python3
+"""
+Benchmarks building a `/api/v1/cities/<city_id>/places` style list
+response with `jsonify` over every `to_dict()`, as the list endpoints
+used to, and by splicing the JSON cached on each object.
+"""
+import argparse
+
+from flask import jsonify
+
+from models.place import Place
+from api.v1.app import app
+from api.v1.views import jsonify_objects
+
+from benchmarks import measure, report
+
+
+def main():
+    """Runs the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--places", type=int, default=1000)
+    args = parser.parse_args()
+
+    places = [
+        Place(name="place-{}".format(index), city_id="city", user_id="user",
+              description="A place to stay", number_rooms=3,
+              number_bathrooms=1, max_guest=4, price_by_night=120,
+              latitude=37.77, longitude=-122.41)
+        for index in range(args.places)
+    ]
+
+    with app.app_context():
+        rows = [
+            ("jsonify(to_dict())", measure(
+                lambda: jsonify([place.to_dict() for place in places]))),
+            ("jsonify_objects, cold cache", measure(
+                lambda: jsonify_objects(places), repeat=1)),
+            ("jsonify_objects, warm cache", measure(
+                lambda: jsonify_objects(places))),
+        ]
+
+    report("list of {} places".format(args.places), rows)
+
+
+if __name__ == "__main__":
+    main()
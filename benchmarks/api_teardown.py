@@ -0,0 +1,52 @@
+#!/usr/bin/python3
+"""
+Benchmarks the API requests per second on `/api/v1/status` when every
+request teardown re-reads the file, as `FileStorage.close()` used to,
+and with the change detection of `close()`.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from models import storage
+from api.v1.app import app
+
+from benchmarks import populate
+
+
+def requests_per_second(client, requests, after_request=None):
+    """Sends requests to /api/v1/status and returns the throughput"""
+    start = time.perf_counter()
+    for _ in range(requests):
+        client.get("/api/v1/status")
+        if after_request:
+            after_request()
+
+    return requests / (time.perf_counter() - start)
+
+
+def main():
+    """Runs the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--objects", type=int, default=100000)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        os.chdir(tmp_dir)
+        populate(storage, args.objects)
+        storage.save()
+
+        with app.test_client() as client:
+            before = requests_per_second(client, args.requests,
+                                         storage.reload)
+            after = requests_per_second(client, args.requests)
+
+    print("{} stored objects".format(args.objects))
+    print("  {:<40} {:>12.1f} req/s".format("reload on teardown", before))
+    print("  {:<40} {:>12.1f} req/s".format("change detection", after))
+
+
+if __name__ == "__main__":
+    main()
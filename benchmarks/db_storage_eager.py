@@ -0,0 +1,139 @@
+#!/usr/bin/python3
+"""
+Benchmarks the statements sent by the relationship-heavy API endpoints
+and web_flask pages, counted by an engine event, when every relationship
+is loaded lazily, one query per object, as they used to, and with the
+relationships they read loaded along with the objects (`load=`).
+
+Runs in DB mode only: `HBNB_TYPE_STORAGE=db` and the `HBNB_MYSQL_*`
+environment variables must be set.
+"""
+import argparse
+import importlib
+import json
+from unittest import mock
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from models import storage
+from models.amenity import Amenity
+from models.city import City
+from models.engine.db_storage import DBStorage
+from models.place import Place
+from models.review import Review
+from models.state import State
+from models.user import User
+from api.v1.app import app
+
+
+def create_dataset(states, cities, places):
+    """
+    Saves `states` states of `cities` cities of `places` places each,
+    every place with a review and two amenities
+
+    Returns:
+        list[BaseModel]: the created objects, parents first
+    """
+    user = User(email="benchmark@hbnb.io", password="benchmark",
+                first_name="Bench", last_name="Mark")
+    amenities = [Amenity(name="amenity-{}".format(index))
+                 for index in range(2)]
+    objects = [user] + amenities
+
+    for state_index in range(states):
+        state = State(name="state-{}".format(state_index))
+        objects.append(state)
+        for city_index in range(cities):
+            city = City(name="city-{}".format(city_index), state_id=state.id)
+            objects.append(city)
+            for place_index in range(places):
+                place = Place(name="place-{}".format(place_index),
+                              city_id=city.id, user_id=user.id)
+                place.amenities = amenities
+                objects += [place, Review(text="Nice", place_id=place.id,
+                                          user_id=user.id)]
+
+    for obj in objects:
+        storage.new(obj)
+    storage.save()
+    storage.close()
+
+    return objects
+
+
+def statements(func):
+    """Returns the number of statements sent by a call, in a new session"""
+    sent = []
+
+    def count(*args):
+        sent.append(args)
+
+    storage.close()
+    event.listen(Engine, "before_cursor_execute", count)
+    try:
+        func()
+    finally:
+        event.remove(Engine, "before_cursor_execute", count)
+    return len(sent)
+
+
+def main():
+    """Runs the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--states", type=int, default=10)
+    parser.add_argument("--cities", type=int, default=5,
+                        help="cities of each state")
+    parser.add_argument("--places", type=int, default=2,
+                        help="places of each city")
+    args = parser.parse_args()
+
+    if not isinstance(storage, DBStorage):
+        parser.error("set HBNB_TYPE_STORAGE=db to run this benchmark")
+
+    objects = create_dataset(args.states, args.cities, args.places)
+    state = next(obj for obj in objects if isinstance(obj, State))
+    amenity = next(obj for obj in objects if isinstance(obj, Amenity))
+    api = app.test_client()
+    hbnb = importlib.import_module("web_flask.100-hbnb").app.test_client()
+    cities_by_states = importlib.import_module(
+        "web_flask.8-cities_by_states").app.test_client()
+
+    def places_search(search):
+        def call():
+            api.post("/api/v1/places_search", data=json.dumps(search),
+                     content_type="application/json")
+        return call
+
+    calls = [
+        ("GET /states/<id>/cities", lambda: api.get(
+            "/api/v1/states/{}/cities".format(state.id))),
+        ("POST /places_search {}", places_search({})),
+        ("POST /places_search states", places_search(
+            {"states": [state.id]})),
+        ("POST /places_search amenities", places_search(
+            {"amenities": [amenity.id]})),
+        ("GET /cities_by_states", lambda: cities_by_states.get(
+            "/cities_by_states")),
+        ("GET /hbnb", lambda: hbnb.get("/hbnb")),
+    ]
+
+    with mock.patch.object(DBStorage, "_load_options",
+                           staticmethod(lambda cls, load: [])):
+        lazy = [statements(call) for _, call in calls]
+    eager = [statements(call) for _, call in calls]
+
+    print("statements per request, {} states, {} cities, {} places".format(
+        args.states, args.states * args.cities,
+        args.states * args.cities * args.places))
+    print("  {:<32} {:>8} {:>8}".format("request", "lazy", "load="))
+    for (label, _), before, after in zip(calls, lazy, eager):
+        print("  {:<32} {:>8} {:>8}".format(label, before, after))
+
+    for obj in reversed(objects):
+        storage.delete(storage.get(type(obj), obj.id))
+    storage.save()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/python3
+"""
+Benchmarks the database round trips of the API requests built on
+`storage.get`, counted by an engine event, when `DBStorage.find` queries
+then refreshes every object, as it used to, when it reads the session
+identity map, and when it also refreshes every object it finds
+(`max_staleness` of 0).
+
+Runs in DB mode only: `HBNB_TYPE_STORAGE=db` and the `HBNB_MYSQL_*`
+environment variables must be set.
+"""
+import argparse
+import json
+from unittest import mock
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from models import storage
+from models.engine.db_storage import DBStorage
+from models.city import City
+from models.place import Place
+from models.state import State
+from models.user import User
+from api.v1.app import app
+
+
+class QueryCounter:
+    """Counts the statements sent to the database"""
+    def __init__(self):
+        """Starts counting"""
+        self.count = 0
+        event.listen(Engine, "before_cursor_execute", self.increment)
+
+    def increment(self, *args):
+        """Counts one statement"""
+        self.count += 1
+
+
+def query_then_refresh(self, class_name, _id, load=None):
+    """The former DBStorage.find: a SELECT, then a refresh SELECT"""
+    session = self._DBStorage__session
+    _class = self.get_class(class_name)
+    obj = session.query(_class).options(
+        *self._load_options(_class, load)).filter_by(id=_id).first()
+    if obj:
+        session.refresh(obj)
+    return obj
+
+
+def round_trips(client, counter, place, requests):
+    """
+    Sends each request and returns its number of statements, averaged
+    over `requests` runs
+    """
+    calls = [
+        ("GET /places/<id>", lambda: client.get(
+            "/api/v1/places/{}".format(place.id))),
+        ("GET /places/<id>/reviews", lambda: client.get(
+            "/api/v1/places/{}/reviews".format(place.id))),
+        ("POST /places/<id>/reviews", lambda: client.post(
+            "/api/v1/places/{}/reviews".format(place.id),
+            data=json.dumps({"user_id": place.user_id, "text": "Nice"}),
+            content_type="application/json")),
+        ("PUT /places/<id>", lambda: client.put(
+            "/api/v1/places/{}".format(place.id),
+            data=json.dumps({"name": "Renamed"}),
+            content_type="application/json")),
+    ]
+
+    results = []
+    for label, call in calls:
+        counter.count = 0
+        for _ in range(requests):
+            call()
+        results.append((label, counter.count / requests))
+
+    return results
+
+
+def main():
+    """Runs the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    if not isinstance(storage, DBStorage):
+        parser.error("set HBNB_TYPE_STORAGE=db to run this benchmark")
+
+    state = State(name="Benchmark")
+    city = City(name="Benchmark", state_id=state.id)
+    user = User(email="benchmark@hbnb.io", password="benchmark")
+    place = Place(name="Benchmark", city_id=city.id, user_id=user.id)
+    for obj in (state, city, user, place):
+        storage.new(obj)
+    storage.save()
+    storage.close()
+
+    counter = QueryCounter()
+    policies = [
+        ("query + refresh", mock.patch.object(
+            DBStorage, "find", query_then_refresh)),
+        ("identity map", mock.patch.object(
+            storage, "max_staleness", None)),
+        ("max_staleness=0", mock.patch.object(
+            storage, "max_staleness", 0)),
+    ]
+
+    with app.test_client() as client:
+        rows = []
+        for policy, patch in policies:
+            with patch:
+                rows.append((policy, round_trips(
+                    client, counter, place, args.requests)))
+
+    print("statements per request, {} requests each".format(args.requests))
+    print("  {:<28}".format("request") + "".join(
+        "{:>18}".format(policy) for policy, _ in rows))
+    for index, (label, _) in enumerate(rows[0][1]):
+        print("  {:<28}".format(label) + "".join(
+            "{:>18.1f}".format(results[index][1]) for _, results in rows))
+
+    storage.delete(storage.get(User, user.id))
+    storage.delete(storage.get(State, state.id))
+    storage.save()
+
+
+if __name__ == "__main__":
+    main()
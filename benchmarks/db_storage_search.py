@@ -0,0 +1,79 @@
+#!/usr/bin/python3
+"""
+Benchmarks `places_search` in DB mode, filtering every loaded place in
+Python, as the view used to, and with the single query of
+`DBStorage.search_places`: the statements sent, counted by an engine
+event, and the best duration of each search.
+
+Runs in DB mode only: `HBNB_TYPE_STORAGE=db` and the `HBNB_MYSQL_*`
+environment variables must be set.
+"""
+import argparse
+
+from models import storage
+from models.amenity import Amenity
+from models.engine.db_storage import DBStorage
+from models.engine.storage import Storage
+from models.state import State
+
+from benchmarks import measure
+from benchmarks.db_storage_eager import create_dataset, statements
+
+
+def python_filter(search):
+    """The former places_search: every place, its city and amenities"""
+    def call():
+        storage.close()
+        Storage.search_places(storage, **search)
+    return call
+
+
+def sql_filter(search):
+    """The single query of DBStorage.search_places"""
+    def call():
+        storage.close()
+        storage.search_places(**search)
+    return call
+
+
+def main():
+    """Runs the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--states", type=int, default=10)
+    parser.add_argument("--cities", type=int, default=10,
+                        help="cities of each state")
+    parser.add_argument("--places", type=int, default=10,
+                        help="places of each city")
+    args = parser.parse_args()
+
+    if not isinstance(storage, DBStorage):
+        parser.error("set HBNB_TYPE_STORAGE=db to run this benchmark")
+
+    objects = create_dataset(args.states, args.cities, args.places)
+    state = next(obj for obj in objects if isinstance(obj, State))
+    amenities = [obj.id for obj in objects if isinstance(obj, Amenity)]
+    searches = [
+        ("{}", {}),
+        ("states", {"states": [state.id]}),
+        ("amenities", {"amenities": amenities}),
+        ("states + amenities", {"states": [state.id],
+                                "amenities": amenities}),
+    ]
+
+    print("places_search over {} places".format(
+        args.states * args.cities * args.places))
+    print("  {:<20} {:>14} {:>14} {:>12} {:>12}".format(
+        "search", "python stmts", "python (ms)", "sql stmts", "sql (ms)"))
+    for label, search in searches:
+        before, after = python_filter(search), sql_filter(search)
+        print("  {:<20} {:>14} {:>14.1f} {:>12} {:>12.1f}".format(
+            label, statements(before), measure(before, repeat=3) * 1000,
+            statements(after), measure(after, repeat=3) * 1000))
+
+    for obj in reversed(objects):
+        storage.delete(storage.get(type(obj), obj.id))
+    storage.save()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+#!/usr/bin/python3
+"""
+Benchmarks `/api/v1/stats` and `DBStorage.count()` over every class, with
+one COUNT per class, as they used to run, and with the single UNION ALL
+statement of `DBStorage.counts()`: the number of statements sent,
+counted by an engine event, and the best duration.
+
+Runs in DB mode only: `HBNB_TYPE_STORAGE=db` and the `HBNB_MYSQL_*`
+environment variables must be set.
+"""
+import argparse
+from unittest import mock
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from models import storage
+from models.engine.db_storage import DBStorage
+from models.engine.storage import Storage
+from api.v1.app import app
+
+from benchmarks import measure
+
+
+def statements(func):
+    """Returns the number of statements sent by a call"""
+    sent = []
+
+    def count(*args):
+        sent.append(args)
+
+    event.listen(Engine, "before_cursor_execute", count)
+    try:
+        func()
+    finally:
+        event.remove(Engine, "before_cursor_execute", count)
+    return len(sent)
+
+
+def row(label, func):
+    """Returns the statements and best duration of a fresh session call"""
+    def call():
+        storage.close()
+        func()
+
+    return label, statements(call), measure(call)
+
+
+def main():
+    """Runs the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.parse_args()
+
+    if not isinstance(storage, DBStorage):
+        parser.error("set HBNB_TYPE_STORAGE=db to run this benchmark")
+
+    with app.test_client() as client:
+        def stats():
+            client.get("/api/v1/stats")
+
+        with mock.patch.object(storage, "counts",
+                               lambda: Storage.counts(storage)):
+            rows = [row("/stats, one COUNT per class", stats),
+                    row("count(), one COUNT per class", storage.count)]
+        rows += [
+            row("/stats, counts()", stats),
+            row("count(), counts()", storage.count),
+        ]
+
+    print("{} objects of {} classes".format(
+        storage.count(), len(storage.get_classes())))
+    print("  {:<32} {:>10} {:>12}".format("call", "statements", "best (ms)"))
+    for label, sent, seconds in rows:
+        print("  {:<32} {:>10} {:>12.3f}".format(label, sent, seconds * 1000))
+
+
+if __name__ == "__main__":
+    main()
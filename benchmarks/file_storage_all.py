@@ -0,0 +1,39 @@
+#!/usr/bin/python3
+"""
+Benchmarks `FileStorage.all(cls)`, `find_all` and `count_by_class_name`
+against the full scan of every stored object they used to perform.
+"""
+import argparse
+
+from models.engine.file_storage import FileStorage
+from models.state import State
+
+from benchmarks import populate, measure, report
+
+
+def full_scan(storage, cls):
+    """The previous `all(cls)` implementation: scans every object"""
+    return {key: obj for key, obj in storage.all().items()
+            if obj.__class__ == cls}
+
+
+def main():
+    """Runs the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--objects", type=int, default=1000000)
+    args = parser.parse_args()
+
+    storage = populate(FileStorage(), args.objects)
+
+    report("{} mixed objects".format(args.objects), [
+        ("full scan all(State)", measure(lambda: full_scan(storage, State))),
+        ("indexed all(State)", measure(lambda: storage.all(State))),
+        ("full scan count(State)", measure(
+            lambda: sum(1 for key in storage.all()
+                        if key.startswith("State")))),
+        ("indexed count(State)", measure(lambda: storage.count(State))),
+    ])
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/python3
+"""
+Benchmarks the cold start of an API and a web_flask worker: the wall
+time of a fresh interpreter importing the application, which reloads
+the storage, without and with the snapshot cache (`HBNB_FILE_CACHE`).
+
+The first start with the cache parses the JSON file and writes the
+cache; the next ones read the cache.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.file_storage_interning import make_dataset
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APPLICATIONS = (("API", "api.v1.app"), ("web_flask", "web_flask.100-hbnb"))
+
+
+def start(module, tmp_dir, cache):
+    """
+    Imports an application in a new interpreter and returns its
+    wall time in seconds. The storage file is `file.json` in `tmp_dir`.
+    """
+    env = dict(os.environ, PYTHONPATH=ROOT,
+               HBNB_FILE_CACHE="1" if cache else "0")
+    env.pop("HBNB_TYPE_STORAGE", None)
+
+    begin = time.perf_counter()
+    subprocess.run(
+        [sys.executable, "-c",
+         "import importlib; importlib.import_module({!r})".format(module)],
+        cwd=tmp_dir, env=env, check=True
+    )
+    return time.perf_counter() - begin
+
+
+def main():
+    """Runs the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--places", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, "file.json")
+        with open(file_path, "w") as file:
+            json.dump(make_dataset(args.places), file)
+
+        print("{:.1f} MiB file".format(
+            os.path.getsize(file_path) / 1024 / 1024))
+        print("  {:<10} {:>14} {:>14} {:>14}".format(
+            "worker", "no cache (ms)", "cache miss (ms)", "cache hit (ms)"))
+        for label, module in APPLICATIONS:
+            no_cache = min(start(module, tmp_dir, False)
+                           for _ in range(args.repeat))
+            miss = start(module, tmp_dir, True)
+            hit = min(start(module, tmp_dir, True)
+                      for _ in range(args.repeat))
+            os.remove(file_path + ".cache")
+
+            print("  {:<10} {:>14.0f} {:>14.0f} {:>14.0f}".format(
+                label, no_cache * 1000, miss * 1000, hit * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+#!/usr/bin/python3
+"""
+Benchmarks `save()`, a cold `reload()` and the file size of a dataset
+of places, reviews, cities and users, uncompressed and with each
+compression codec at several levels.
+"""
+import argparse
+import json
+import os
+import tempfile
+
+from models.engine import compression as compression_module
+from models.engine.compression import Compression
+from models.engine.file_storage import FileStorage
+
+from benchmarks import measure
+from benchmarks.file_storage_interning import make_dataset
+
+LEVELS = {"gzip": (1, 6, 9), "lzma": (0, 6), "zstd": (1, 3, 9)}
+
+
+def main():
+    """Runs the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--places", type=int, default=100000)
+    parser.add_argument("--format", default="json",
+                        choices=("json", "packed"))
+    args = parser.parse_args()
+
+    codecs = [(None, None)] + [
+        (codec, level) for codec, levels in LEVELS.items()
+        for level in levels
+        if codec != "zstd" or compression_module.zstandard
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        dataset_path = os.path.join(tmp_dir, "dataset.json")
+        with open(dataset_path, "w") as file:
+            json.dump(make_dataset(args.places), file)
+        dataset = FileStorage(dataset_path)
+        dataset.reload()
+        objects = dataset.all().values()
+
+        print("{} objects, {} format".format(len(objects), args.format))
+        print("  {:<10} {:>12} {:>12} {:>12}".format(
+            "codec", "save (ms)", "reload (ms)", "size (MiB)"))
+        for codec, level in codecs:
+            compression = Compression(codec, level) if codec else None
+            file_path = os.path.join(tmp_dir, "file-{}-{}".format(
+                codec, level))
+            storage = FileStorage(file_path, file_format=args.format,
+                                  compression=compression)
+            for obj in objects:
+                storage.new(obj)
+
+            save = measure(storage.save, repeat=3)
+            reload = measure(lambda: FileStorage(
+                file_path, file_format=args.format,
+                compression=compression).reload(), repeat=3)
+            size = os.path.getsize(
+                file_path + (compression.suffix if compression else ""))
+            print("  {:<10} {:>12.0f} {:>12.0f} {:>12.1f}".format(
+                "{} {}".format(codec, level) if codec else "none",
+                save * 1000, reload * 1000, size / 1024 / 1024))
+
+
+if __name__ == "__main__":
+    main()
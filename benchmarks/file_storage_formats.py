@@ -0,0 +1,49 @@
+#!/usr/bin/python3
+"""
+Benchmarks `save()`, a cold `reload()` and the file size of a dataset
+of places, reviews, cities and users in the JSON and the packed formats.
+"""
+import argparse
+import json
+import os
+import tempfile
+
+from models.engine.file_storage import FileStorage
+
+from benchmarks import measure
+from benchmarks.file_storage_interning import make_dataset
+
+
+def main():
+    """Runs the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--places", type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        dataset_path = os.path.join(tmp_dir, "dataset.json")
+        with open(dataset_path, "w") as file:
+            json.dump(make_dataset(args.places), file)
+        dataset = FileStorage(dataset_path)
+        dataset.reload()
+        objects = dataset.all().values()
+
+        print("{} objects".format(len(objects)))
+        print("  {:<8} {:>12} {:>12} {:>12}".format(
+            "format", "save (ms)", "reload (ms)", "size (MiB)"))
+        for file_format in ("json", "packed"):
+            file_path = os.path.join(tmp_dir, "file." + file_format)
+            storage = FileStorage(file_path, file_format=file_format)
+            for obj in objects:
+                storage.new(obj)
+
+            save = measure(storage.save, repeat=3)
+            reload = measure(lambda: FileStorage(
+                file_path, file_format=file_format).reload(), repeat=3)
+            print("  {:<8} {:>12.0f} {:>12.0f} {:>12.1f}".format(
+                file_format, save * 1000, reload * 1000,
+                os.path.getsize(file_path) / 1024 / 1024))
+
+
+if __name__ == "__main__":
+    main()
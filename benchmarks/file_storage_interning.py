@@ -0,0 +1,116 @@
+#!/usr/bin/python3
+"""
+Benchmarks the memory taken by a reloaded dataset where places, cities
+and reviews reference their parents, without and with the interning of
+ids and foreign keys, and the speed of the parent id lookups.
+"""
+import argparse
+import json
+import os
+import random
+import tempfile
+import timeit
+import tracemalloc
+from datetime import datetime
+from uuid import uuid4
+
+from models.city import City
+from models.engine.file_storage import FileStorage
+from models.place import Place
+from models.review import Review
+
+from benchmarks import measure
+
+
+def record(class_name, **fields):
+    """Returns a stored record of a class"""
+    now = datetime.now().isoformat()
+    fields.update(id=str(uuid4()), created_at=now, updated_at=now,
+                  __class__=class_name)
+    return fields
+
+
+def make_dataset(places):
+    """
+    Returns the records of a dataset with `places` places, one city
+    per 20 places, 3 reviews per place and one user per 10 places
+    """
+    states = [record("State", name="state") for _ in range(50)]
+    cities = [record("City", name="city",
+                     state_id=random.choice(states)["id"])
+              for _ in range(max(places // 20, 1))]
+    users = [record("User", email="user@hbnb.io")
+             for _ in range(max(places // 10, 1))]
+    amenities = [record("Amenity", name="amenity") for _ in range(100)]
+    records = states + cities + users + amenities
+
+    for _ in range(places):
+        place = record("Place", name="place",
+                       city_id=random.choice(cities)["id"],
+                       user_id=random.choice(users)["id"],
+                       amenity_ids=[amenity["id"] for amenity
+                                    in random.sample(amenities, 5)])
+        records.append(place)
+        records.extend(
+            record("Review", text="review", place_id=place["id"],
+                   user_id=random.choice(users)["id"])
+            for _ in range(3)
+        )
+
+    return {"{}.{}".format(r["__class__"], r["id"]): r for r in records}
+
+
+def main():
+    """Runs the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--places", type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, "file.json")
+        with open(file_path, "w") as file:
+            json.dump(make_dataset(args.places), file)
+
+        print("{} places, {} objects".format(
+            args.places, args.places * 4 + args.places // 20 +
+            args.places // 10 + 150))
+        for interned in (False, True):
+            storage = FileStorage(file_path)
+            if not interned:
+                storage.INTERNED_ATTRIBUTES = ()
+
+            tracemalloc.start()
+            storage.reload()
+            used = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+
+            places = list(storage.all(Place).values())
+            cities = list(storage.all(City).values())
+
+            def children_lookups():
+                for place in places:
+                    storage.all_by_foreign_key(Review, "place_id", place.id)
+                for city in cities:
+                    storage.all_by_foreign_key(Place, "city_id", city.id)
+
+            print("  interned={}".format(interned))
+            print("    {:<38} {:>12.1f} MiB".format(
+                "reloaded objects and indexes", used / 1024 / 1024))
+            print("    {:<38} {:>12.3f} ms".format(
+                "children lookups", measure(children_lookups) * 1000))
+            del storage, places, cities
+
+    table = {str(uuid4()): None for _ in range(1000)}
+    keys = list(table)
+    same = keys * 100
+    equal = [key.encode().decode() for key in keys] * 100
+    print("  dict lookup, 100k hits")
+    for label, lookups in (("equal string", equal),
+                           ("same string", same)):
+        seconds = min(timeit.repeat(
+            lambda: [table[key] for key in lookups], number=1, repeat=5))
+        print("    {:<38} {:>12.3f} ms".format(label, seconds * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+#!/usr/bin/python3
+"""
+Benchmarks a worker reloading a stored dataset of places, reviews,
+cities and users, eagerly, in the lazy mode (`HBNB_FILE_LAZY`) and in
+the lazy mode from a warm snapshot cache (`HBNB_FILE_CACHE`): the
+reload duration, the RSS once loaded, the duration of counting every
+class (what `/stats` does) and of a request-like working set, reading
+a few places with their reviews, and the RSS after it.
+
+Each mode runs in its own interpreter, so each RSS is its own.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.file_storage_interning import make_dataset
+
+
+def rss():
+    """Returns the current RSS in bytes, read from /proc (Linux only)"""
+    with open("/proc/self/statm") as statm:
+        return int(statm.read().split()[1]) * resource.getpagesize()
+
+
+def load(mode, file_path, ids_path):
+    """
+    Reloads the dataset and reads the places of a working set, returning
+    the durations in seconds and the RSS in bytes.
+    """
+    from models.engine.file_storage import FileStorage
+    from models.engine.stored_classes import CLASSES
+    from models.place import Place
+    from models.review import Review
+
+    with open(ids_path) as file:
+        ids = json.load(file)
+
+    storage = FileStorage(file_path, lazy=mode != "eager",
+                          cache=mode == "cached")
+    start = time.perf_counter()
+    storage.reload()
+    reload_time = time.perf_counter() - start
+    loaded = rss()
+
+    start = time.perf_counter()
+    for _class in CLASSES.values():
+        storage.count(_class)
+    count_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _id in ids:
+        place = storage.get(Place, _id)
+        storage.all_by_foreign_key(Review, "place_id", place.id)
+    working_set_time = time.perf_counter() - start
+
+    return reload_time, loaded, count_time, working_set_time, rss()
+
+
+def main():
+    """Runs the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--places", type=int, default=100000)
+    parser.add_argument("--load", nargs=3, metavar=("MODE", "FILE", "IDS"),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.load:
+        print(json.dumps(load(*args.load)))
+        return
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, "file.json")
+        ids_path = os.path.join(tmp_dir, "ids.json")
+        dataset = make_dataset(args.places)
+        with open(file_path, "w") as file:
+            json.dump(dataset, file)
+        with open(ids_path, "w") as file:
+            json.dump([key.split(".", 1)[1] for key in dataset
+                       if key.startswith("Place.")][:20], file)
+        del dataset
+
+        print("{:.1f} MiB file".format(
+            os.path.getsize(file_path) / 1024 / 1024))
+        print("  {:<6} {:>12} {:>12} {:>11} {:>17} {:>12}".format(
+            "mode", "reload (ms)", "loaded (MiB)", "count (ms)",
+            "working set (ms)", "after (MiB)"))
+        # The first cached run writes the cache, the second reads it
+        for mode in ("eager", "lazy", "cached", "cached"):
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.file_storage_lazy",
+                 "--load", mode, file_path, ids_path],
+                capture_output=True, text=True, check=True
+            ).stdout
+            reload_time, loaded, count_time, working_set_time, after = \
+                json.loads(output)
+            print("  {:<6} {:>12.0f} {:>12.1f} {:>11.3f} {:>17.1f} {:>12.1f}"
+                  .format(mode, reload_time * 1000, loaded / 1024 / 1024,
+                          count_time * 1000, working_set_time * 1000,
+                          after / 1024 / 1024))
+
+
+if __name__ == "__main__":
+    main()
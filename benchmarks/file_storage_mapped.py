@@ -0,0 +1,138 @@
+#!/usr/bin/python3
+"""
+Benchmarks several worker processes serving the same dataset of places,
+reviews, cities and users at once, from a JSON file loaded eagerly, in
+the lazy mode (`HBNB_FILE_LAZY`) and from a mapped file
+(`HBNB_FILE_FORMAT=mapped`): the reload duration of each worker, then,
+once every worker has reloaded and read a request-like working set, the
+memory of each worker, private and shared with the other workers.
+
+The memory is read from /proc (Linux only).
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.file_storage_interning import make_dataset
+
+
+def memory():
+    """Returns the private and shared RSS of the process, in bytes"""
+    fields = {}
+    with open("/proc/self/smaps_rollup") as smaps:
+        for line in smaps:
+            name, _, value = line.partition(":")
+            if value.strip().endswith("kB"):
+                fields[name] = int(value.split()[0]) * 1024
+
+    return (fields["Private_Clean"] + fields["Private_Dirty"],
+            fields["Shared_Clean"] + fields["Shared_Dirty"])
+
+
+def serve(mode, file_path, ids_path):
+    """
+    Reloads the dataset and reads a working set, reports the reload
+    duration, then the memory once asked to on stdin.
+    """
+    from models.engine.file_storage import FileStorage
+    from models.engine.stored_classes import CLASSES
+    from models.place import Place
+    from models.review import Review
+
+    with open(ids_path) as file:
+        ids = json.load(file)
+
+    storage = FileStorage(file_path, lazy=mode == "lazy",
+                          file_format="mapped" if mode == "mapped"
+                          else "json")
+    start = time.perf_counter()
+    storage.reload()
+    reload_time = time.perf_counter() - start
+
+    for _class in CLASSES.values():
+        storage.count(_class)
+    for _id in ids:
+        place = storage.get(Place, _id)
+        storage.all_by_foreign_key(Review, "place_id", place.id)
+
+    print(json.dumps(reload_time), flush=True)
+    sys.stdin.readline()
+    print(json.dumps(memory()), flush=True)
+
+
+def main():
+    """Runs the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--places", type=int, default=100000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--serve", nargs=3, metavar=("MODE", "FILE", "IDS"),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.serve:
+        serve(*args.serve)
+        return
+
+    from models.engine.file_storage import FileStorage
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, "file.json")
+        map_path = os.path.join(tmp_dir, "file.map")
+        ids_path = os.path.join(tmp_dir, "ids.json")
+        dataset = make_dataset(args.places)
+        with open(file_path, "w") as file:
+            json.dump(dataset, file)
+        with open(ids_path, "w") as file:
+            json.dump([key.split(".", 1)[1] for key in dataset
+                       if key.startswith("Place.")][:20], file)
+        del dataset
+
+        storage = FileStorage(file_path)
+        storage.reload()
+        mapped_storage = FileStorage(map_path, file_format="mapped")
+        for obj in storage.all().values():
+            mapped_storage.new(obj)
+        mapped_storage.save()
+        del storage, mapped_storage
+
+        print("{:.1f} MiB JSON file, {:.1f} MiB mapped file, {} workers"
+              .format(os.path.getsize(file_path) / 1024 / 1024,
+                      os.path.getsize(map_path) / 1024 / 1024,
+                      args.workers))
+        print("  {:<6} {:>12} {:>22} {:>21}".format(
+            "mode", "reload (ms)", "private/worker (MiB)",
+            "shared/worker (MiB)"))
+        for mode in ("eager", "lazy", "mapped"):
+            workers = [
+                subprocess.Popen(
+                    [sys.executable, "-m", "benchmarks.file_storage_mapped",
+                     "--serve", mode,
+                     map_path if mode == "mapped" else file_path, ids_path],
+                    stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+                for _ in range(args.workers)
+            ]
+            reload_times = [json.loads(worker.stdout.readline())
+                            for worker in workers]
+            for worker in workers:
+                worker.stdin.write("\n")
+                worker.stdin.flush()
+            memories = [json.loads(worker.stdout.readline())
+                        for worker in workers]
+            for worker in workers:
+                worker.stdin.close()
+                worker.wait()
+
+            print("  {:<6} {:>12.0f} {:>22.1f} {:>21.1f}".format(
+                mode, sum(reload_times) / len(workers) * 1000,
+                sum(private for private, _ in memories)
+                / len(workers) / 1024 / 1024,
+                sum(shared for _, shared in memories)
+                / len(workers) / 1024 / 1024))
+
+
+if __name__ == "__main__":
+    main()
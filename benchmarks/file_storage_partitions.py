@@ -0,0 +1,47 @@
+#!/usr/bin/python3
+"""
+Benchmarks `save()` after a single change and a cold `reload()` with the
+single-file layout and with the per-class partitioned layout.
+"""
+import argparse
+import os
+import tempfile
+
+from models.engine.file_storage import FileStorage
+from models.review import Review
+
+from benchmarks import populate, measure, report
+
+
+def main():
+    """Runs the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--objects", type=int, default=100000)
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for partitioned in (False, True):
+            file_path = os.path.join(tmp_dir, "{}.json".format(partitioned))
+            storage = populate(FileStorage(file_path, partitioned=partitioned),
+                               args.objects)
+            storage.save()
+            review = next(iter(storage.all(Review).values()))
+
+            def write():
+                review.text = "changed"
+                storage.save()
+
+            def reload():
+                FileStorage(file_path, partitioned=partitioned).reload()
+
+            rows.append(("partitioned={} one write + save".format(
+                partitioned), measure(write)))
+            rows.append(("partitioned={} cold reload".format(partitioned),
+                         measure(reload, repeat=3)))
+
+    report("{} stored objects".format(args.objects), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+#!/usr/bin/python3
+"""
+Benchmarks the peak RSS, the RSS once loaded and the duration of
+loading a stored dataset by decoding the whole file then building the
+objects, as
+`FileStorage.reload()` used to, and with the streaming `reload()`.
+
+Each load runs in its own interpreter, so each peak RSS is its own.
+"""
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks import populate
+
+
+def load(mode, file_path):
+    """
+    Loads the dataset and returns (seconds, peak RSS, RSS) in bytes.
+    The current RSS is read from /proc, so this only runs on Linux.
+    """
+    from models.engine.file_storage import FileStorage
+    from models.engine.indexes import ObjectIndexes
+    from models.engine.snapshots import load_json
+
+    storage = FileStorage(file_path)
+    start = time.perf_counter()
+    if mode == "whole":
+        indexes = ObjectIndexes()
+        for key, dictionary in load_json(file_path).items():
+            storage._load_object(indexes, key, dictionary)
+    else:
+        storage.reload()
+    seconds = time.perf_counter() - start
+
+    with open("/proc/self/statm") as statm:
+        rss = int(statm.read().split()[1]) * resource.getpagesize()
+
+    # ru_maxrss is in kilobytes on Linux
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+    return seconds, peak, rss
+
+
+def main():
+    """Runs the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--objects", type=int, default=1000000)
+    parser.add_argument("--load", nargs=2, metavar=("MODE", "FILE"),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.load:
+        print(json.dumps(load(*args.load)))
+        return
+
+    from models.engine.file_storage import FileStorage
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, "file.json")
+        populate(FileStorage(file_path), args.objects).save()
+        size = os.path.getsize(file_path)
+
+        print("{} stored objects, {:.1f} MiB file".format(
+            args.objects, size / 1024 / 1024))
+        for mode, label in (("whole", "decode whole file, then build"),
+                            ("stream", "streaming reload()")):
+            output = subprocess.run(
+                [sys.executable, "-m", "benchmarks.file_storage_peak_memory",
+                 "--load", mode, file_path],
+                capture_output=True, text=True, check=True
+            ).stdout
+            seconds, peak, rss = json.loads(output)
+            print("  {:<32} {:>7.1f} MiB peak RSS, {:>7.1f} MiB loaded,"
+                  " {:>7.0f} ms".format(label, peak / 1024 / 1024,
+                                        rss / 1024 / 1024, seconds * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/python3
+"""
+Benchmarks the file-mode relationship properties (`State.cities`)
+against the scan of every child object they used to perform, by
+rendering the cities of every state like `8-cities_by_states` does.
+"""
+import argparse
+
+from models.engine.file_storage import FileStorage
+from models.state import State
+from models.city import City
+
+from benchmarks import measure, report
+
+
+def full_scan(storage, state):
+    """The previous `State.cities` implementation: scans every city"""
+    return [city for city in storage.all(City).values()
+            if city.state_id == state.id]
+
+
+def main():
+    """Runs the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--states", type=int, default=100)
+    parser.add_argument("--cities", type=int, default=100,
+                        help="cities per state")
+    args = parser.parse_args()
+
+    storage = FileStorage()
+    states = []
+    for index in range(args.states):
+        state = State(name="state-{}".format(index))
+        storage.new(state)
+        states.append(state)
+        for city_index in range(args.cities):
+            storage.new(City(name="city-{}".format(city_index),
+                             state_id=state.id))
+
+    report("{} states x {} cities".format(args.states, args.cities), [
+        ("full scan, every state", measure(
+            lambda: [full_scan(storage, state) for state in states])),
+        ("indexed, every state", measure(
+            lambda: [storage.all_by_foreign_key(City, "state_id", state.id)
+                     for state in states])),
+    ])
+
+
+if __name__ == "__main__":
+    main()
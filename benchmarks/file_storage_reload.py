@@ -0,0 +1,70 @@
+#!/usr/bin/python3
+"""
+Benchmarks building model objects from stored records with the
+constructor, as `FileStorage.reload()` used to, and with the
+`from_dict()` bulk hydration path, then a full `FileStorage.reload()`.
+"""
+import argparse
+import json
+import os
+import tempfile
+from datetime import datetime
+from uuid import uuid4
+
+from models.engine.file_storage import FileStorage
+from models.engine.stored_classes import CLASSES
+
+from benchmarks import measure, report
+
+
+def make_records(size):
+    """Returns `size` stored records spread over every stored class"""
+    classes = tuple(CLASSES.keys())
+    created_at = datetime.now().isoformat()
+    records = []
+
+    for index in range(size):
+        records.append({
+            "id": str(uuid4()),
+            "created_at": created_at,
+            "updated_at": datetime.now().isoformat(),
+            "__class__": classes[index % len(classes)],
+            "name": "obj-{}".format(index),
+        })
+
+    return records
+
+
+def main():
+    """Runs the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--records", type=int, default=1000000)
+    args = parser.parse_args()
+
+    records = make_records(args.records)
+    rows = [
+        ("constructor", measure(lambda: [
+            CLASSES[record["__class__"]](**record) for record in records
+        ], repeat=1)),
+        ("from_dict", measure(lambda: [
+            CLASSES[record["__class__"]].from_dict(record)
+            for record in records
+        ], repeat=1)),
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, "file.json")
+        with open(file_path, "w") as file:
+            json.dump({
+                "{}.{}".format(record["__class__"], record["id"]): record
+                for record in records
+            }, file)
+
+        rows.append(("FileStorage.reload()", measure(
+            lambda: FileStorage(file_path).reload(), repeat=1)))
+
+    report("{} records".format(args.records), rows)
+
+
+if __name__ == "__main__":
+    main()
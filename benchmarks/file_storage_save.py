@@ -0,0 +1,52 @@
+#!/usr/bin/python3
+"""
+Benchmarks the latency of a single-object write followed by `save()`,
+with a full rewrite of the file and with the append-only journal: a new
+object, and an attribute set directly on a stored object.
+"""
+import argparse
+import os
+import tempfile
+
+from models.engine.file_storage import FileStorage
+from models.state import State
+
+from benchmarks import populate, measure, report
+
+
+def main():
+    """Runs the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--objects", type=int, default=100000)
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for journal in (False, True):
+            file_path = os.path.join(tmp_dir, "{}.json".format(journal))
+            storage = populate(FileStorage(file_path), args.objects)
+            storage.save()
+
+            storage = FileStorage(file_path, journal=journal)
+            storage.reload()
+
+            state = next(iter(storage.all(State).values()))
+
+            def write():
+                storage.new(State(name="write"))
+                storage.save()
+
+            def set_attribute():
+                state.name = "set"
+                storage.save()
+
+            rows.append(("journal={} write + save".format(journal),
+                         measure(write, repeat=20)))
+            rows.append(("journal={} attribute set + save".format(journal),
+                         measure(set_attribute, repeat=20)))
+
+    report("{} stored objects".format(args.objects), rows)
+
+
+if __name__ == "__main__":
+    main()
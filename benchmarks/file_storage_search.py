@@ -0,0 +1,99 @@
+#!/usr/bin/python3
+"""
+Benchmarks `places_search` in file mode, filtering every place in
+Python, as `Storage.search_places` does, and with the unions and
+intersections of the sets of keys indexed by parent of
+`FileStorage.search_places`: cities by state, places by city and places
+by amenity.
+"""
+import argparse
+
+import models
+from models.amenity import Amenity
+from models.city import City
+from models.engine.file_storage import FileStorage
+from models.engine.storage import Storage
+from models.place import Place
+from models.state import State
+
+from benchmarks import measure
+
+
+def make_storage(states, cities, places, amenities):
+    """
+    Fills a storage with `states` states of `cities` cities of `places`
+    places each, the n-th place of a city having the amenities whose
+    index divides n + 1
+
+    Returns:
+        tuple[FileStorage, list[State], list[City], list[Amenity]]
+    """
+    storage = FileStorage()
+    all_amenities = [Amenity(name="amenity-{}".format(index))
+                     for index in range(amenities)]
+    all_states, all_cities = [], []
+    for obj in all_amenities:
+        # Place.amenities reads the amenities from the global storage
+        storage.new(obj)
+        models.storage.new(obj)
+
+    for state_index in range(states):
+        state = State(name="state-{}".format(state_index))
+        storage.new(state)
+        all_states.append(state)
+        for city_index in range(cities):
+            city = City(name="city-{}".format(city_index), state_id=state.id)
+            storage.new(city)
+            all_cities.append(city)
+            for place_index in range(places):
+                storage.new(Place(
+                    name="place-{}".format(place_index), city_id=city.id,
+                    amenity_ids=[amenity.id for index, amenity
+                                 in enumerate(all_amenities, 1)
+                                 if (place_index + 1) % index == 0]))
+
+    return storage, all_states, all_cities, all_amenities
+
+
+def main():
+    """Runs the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--states", type=int, default=50)
+    parser.add_argument("--cities", type=int, default=20,
+                        help="cities of each state")
+    parser.add_argument("--places", type=int, default=100,
+                        help="places of each city")
+    parser.add_argument("--amenities", type=int, default=10)
+    args = parser.parse_args()
+
+    storage, states, cities, amenities = make_storage(
+        args.states, args.cities, args.places, args.amenities)
+    searches = [
+        ("{}", {}),
+        ("1 state", {"states": [states[0].id]}),
+        ("1 city", {"cities": [cities[0].id]}),
+        ("1 rare amenity", {"amenities": [amenities[-1].id]}),
+        ("2 amenities", {"amenities": [amenities[1].id, amenities[2].id]}),
+        ("1 state + 1 amenity", {"states": [states[0].id],
+                                 "amenities": [amenities[1].id]}),
+        ("10 states + 2 amenities", {
+            "states": [state.id for state in states[:10]],
+            "amenities": [amenities[1].id, amenities[-1].id]}),
+    ]
+
+    print("places_search over {} places".format(storage.count(Place)))
+    print("  {:<26} {:>8} {:>12} {:>12}".format(
+        "search", "places", "loop (ms)", "sets (ms)"))
+    for label, search in searches:
+        places = storage.search_places(**search)
+        assert sorted(place.id for place in places) == sorted(
+            place.id for place in Storage.search_places(storage, **search))
+        print("  {:<26} {:>8} {:>12.2f} {:>12.2f}".format(
+            label, len(places),
+            measure(lambda: Storage.search_places(storage, **search),
+                    repeat=3) * 1000,
+            measure(lambda: storage.search_places(**search)) * 1000))
+
+
+if __name__ == "__main__":
+    main()
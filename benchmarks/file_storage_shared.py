@@ -0,0 +1,99 @@
+#!/usr/bin/python3
+"""
+Benchmarks several processes sharing the files of a FileStorage, each
+save rewriting the file (the default) and in shared mode
+(`HBNB_FILE_SHARED`): the number of saves kept when processes save new
+objects at once, and the duration of the `close()` that makes a process
+see one object saved by another, over a stored dataset.
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+
+from models.engine.file_storage import FileStorage
+from models.state import State
+
+from benchmarks import populate
+
+
+def save_states(file_path, shared, count):
+    """Saves new states one at a time"""
+    storage = FileStorage(file_path, shared=shared)
+    storage.reload()
+    for index in range(count):
+        storage.new(State(name="state-{}".format(index)))
+        storage.save()
+
+
+def kept_saves(file_path, shared, processes, count):
+    """
+    Saves new states from several processes at once, and returns the
+    number of them found once they are done
+    """
+    workers = [multiprocessing.Process(target=save_states,
+                                       args=(file_path, shared, count))
+               for _ in range(processes)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    storage = FileStorage(file_path, shared=shared)
+    storage.reload()
+    return storage.count(State)
+
+
+def catch_up(file_path, shared, repeat=3):
+    """
+    Returns the best duration of the close() of a reader after a writer
+    saved one object
+    """
+    writer = FileStorage(file_path, shared=shared)
+    writer.reload()
+    reader = FileStorage(file_path, shared=shared)
+    reader.reload()
+
+    best = float("inf")
+    for _ in range(repeat):
+        writer.new(State(name="new"))
+        writer.save()
+        start = time.perf_counter()
+        reader.close()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def main():
+    """Runs the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--objects", type=int, default=100000)
+    parser.add_argument("--processes", type=int, default=4)
+    parser.add_argument("--saves", type=int, default=50,
+                        help="saves made by each process")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        print("{} processes saving {} states each, {} stored objects"
+              .format(args.processes, args.saves, args.objects))
+        print("  {:<10} {:>12} {:>16}".format(
+            "mode", "saves kept", "catch up (ms)"))
+        for shared in (False, True):
+            file_path = os.path.join(tmp_dir, "{}.json".format(shared))
+            storage = FileStorage(file_path, shared=shared)
+            populate(storage, args.objects)
+            storage.save()
+
+            states = storage.count(State)
+            kept = kept_saves(file_path, shared, args.processes,
+                              args.saves) - states
+            print("  {:<10} {:>12} {:>16.2f}".format(
+                "shared" if shared else "default",
+                "{}/{}".format(kept, args.processes * args.saves),
+                catch_up(file_path, shared) * 1000))
+
+
+if __name__ == "__main__":
+    main()
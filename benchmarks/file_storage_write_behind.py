@@ -0,0 +1,57 @@
+#!/usr/bin/python3
+"""
+Benchmarks the latency of a single-object write followed by `save()`,
+with synchronous saves and in write-behind mode, and the time a burst
+of writes takes to reach the disk in write-behind mode.
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from models.engine.file_storage import FileStorage
+from models.state import State
+
+from benchmarks import populate, measure, report
+
+
+def main():
+    """Runs the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--objects", type=int, default=100000)
+    parser.add_argument("--burst", type=int, default=100)
+    parser.add_argument("--interval", type=int, default=50,
+                        help="write-behind flush interval in milliseconds")
+    args = parser.parse_args()
+
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, "file.json")
+        populate(FileStorage(file_path), args.objects).save()
+
+        for interval in (0, args.interval):
+            storage = FileStorage(file_path, flush_interval=interval)
+            storage.reload()
+
+            def write():
+                storage.new(State(name="write"))
+                storage.save()
+
+            rows.append(("flush_interval={} write + save".format(interval),
+                         measure(write, repeat=20)))
+
+            def burst():
+                for _ in range(args.burst):
+                    write()
+                storage.flush()
+
+            start = time.perf_counter()
+            burst()
+            rows.append(("flush_interval={} {} writes + flush".format(
+                interval, args.burst), time.perf_counter() - start))
+
+    report("{} stored objects".format(args.objects), rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/python3
+"""
+Benchmarks the memory taken by each model object loaded from storage,
+with the default `__dict__` representation and with the compact
+`__slots__` representation (`HBNB_COMPACT_MODELS=1`).
+
+Each representation is measured in its own interpreter, since the
+representation is chosen when the models are imported.
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tracemalloc
+from uuid import uuid4
+
+SAMPLE_FIELDS = {
+    "Amenity": {"name": "Wifi"},
+    "City": {"name": "San Francisco", "state_id": None},
+    "Place": {"name": "Loft", "city_id": None, "user_id": None,
+              "description": "A nice loft", "number_rooms": 2,
+              "number_bathrooms": 1, "max_guest": 4,
+              "price_by_night": 120, "latitude": 37.77,
+              "longitude": -122.41},
+    "Review": {"text": "Great stay", "place_id": None, "user_id": None},
+    "State": {"name": "California"},
+    "User": {"email": "a@b.c", "password": "x" * 32,
+             "first_name": "Ada", "last_name": "Lovelace"},
+}
+
+
+def bytes_per_object(class_name, size):
+    """
+    Loads `size` objects of a class the way `FileStorage.reload()`
+    does and returns the memory they take, per object
+    """
+    from models.engine.stored_classes import CLASSES
+
+    records = []
+    for _ in range(size):
+        fields = {
+            key: str(uuid4()) if value is None else value
+            for key, value in SAMPLE_FIELDS[class_name].items()
+        }
+        record = CLASSES[class_name](**fields).to_dict()
+        records.append(json.loads(json.dumps(record)))
+
+    tracemalloc.start()
+    objects = [CLASSES[class_name].from_dict(record) for record in records]
+    used = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    return used / len(objects)
+
+
+def main():
+    """Runs the benchmark"""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--objects", type=int, default=100000)
+    parser.add_argument("--measure", action="store_true",
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.measure:
+        print(json.dumps({
+            class_name: bytes_per_object(class_name, args.objects)
+            for class_name in SAMPLE_FIELDS
+        }))
+        return
+
+    results = {}
+    for compact in ("0", "1"):
+        output = subprocess.run(
+            [sys.executable, "-m", "benchmarks.model_memory",
+             "--objects", str(args.objects), "--measure"],
+            env=dict(os.environ, HBNB_COMPACT_MODELS=compact),
+            capture_output=True, text=True, check=True
+        ).stdout
+        results[compact] = json.loads(output)
+
+    print("{} objects per class, bytes per object".format(args.objects))
+    print("  {:<12} {:>12} {:>12}".format("class", "__dict__", "__slots__"))
+    for class_name in SAMPLE_FIELDS:
+        print("  {:<12} {:>12.0f} {:>12.0f}".format(
+            class_name, results["0"][class_name], results["1"][class_name]))
+
+
+if __name__ == "__main__":
+    main()
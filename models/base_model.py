@@ -4,24 +4,97 @@ This module contains the BaseModel class, which serves
 as the base class for all models in the application.
 """
 import os
+import json
+import weakref
 from uuid import uuid4
 from datetime import datetime
 
-from sqlalchemy import Column, String, DATETIME
+from sqlalchemy import Column, String, DATETIME, inspect
 from sqlalchemy.ext.declarative import declarative_base
 
+from models.compact import COMPACT_MODELS, CompactModelMeta
+
 STORAGE_TYPE = os.getenv('HBNB_TYPE_STORAGE')
 
 Base = declarative_base()
 
+# The observers told when a file mode instance changes, see
+# observe_changes(), and the fields they are told about on every write
+CHANGE_OBSERVERS = weakref.WeakSet()
+OBSERVED_FIELDS = set()
+
+
+def observe_changes(observer, fields=()):
+    """
+    Registers an observer of the file mode instances, such as a
+    FileStorage: its `object_changed(obj, key)` method is called when
+    an instance becomes dirty, the first attribute write since the last
+    `clear_dirty_fields()`, and on every write of one of `fields`.
+    The observer is only referenced weakly.
+
+    Parameters:
+    - observer (object): The observer.
+    - fields (iterable[str]): The attribute names always observed.
+    """
+    CHANGE_OBSERVERS.add(observer)
+    OBSERVED_FIELDS.update(fields)
+
 
-class BaseModel:
+class BaseModel(metaclass=CompactModelMeta if COMPACT_MODELS else type):
     """
     Base class for all models.
     """
 
     NOT_UPDATABLE = ["id", "created_at", "updated_at"]
 
+    if COMPACT_MODELS:
+        __slots__ = ("id", "created_at", "updated_at",
+                     "_json", "_dirty_fields", "_extra")
+
+        def __new__(cls, *args, **kwargs):
+            """Creates an instance with its internal slots cleared"""
+            obj = super().__new__(cls)
+            object.__setattr__(obj, "_json", None)
+            object.__setattr__(obj, "_dirty_fields", None)
+            object.__setattr__(obj, "_extra", None)
+            return obj
+
+        def __getattr__(self, name):
+            """
+            Returns an attribute that is not in a slot: an attribute
+            that is not a declared field, or the default of an unset field.
+            """
+            if not name.startswith("_"):
+                if self._extra and name in self._extra:
+                    return self._extra[name]
+                if name in self._FIELD_DEFAULTS:
+                    return self._FIELD_DEFAULTS[name]
+
+            raise AttributeError("'{}' object has no attribute '{}'".format(
+                self.__class__.__name__, name))
+
+        def __getstate__(self):
+            """
+            Returns the set slots of the instance, for pickling,
+            leaving out the defaults of the unset fields.
+            """
+            state = {}
+            for name in self._SLOTS:
+                try:
+                    state[name] = object.__getattribute__(self, name)
+                except AttributeError:
+                    pass
+
+            return None, state
+
+        def __setstate__(self, state):
+            """
+            Restores an unpickled instance: its slots are set directly,
+            bypassing the dirty fields tracking of `__setattr__`.
+            """
+            for name, value in state[1].items():
+                object.__setattr__(self, name, value)
+
     if STORAGE_TYPE == 'db':
         id = Column(String(60), primary_key=True)
         created_at = Column(DATETIME, nullable=False,
@@ -53,6 +126,51 @@ class BaseModel:
         for attr, value in kwargs.items():
             setattr(self, attr, value)
 
+    @classmethod
+    def from_dict(cls, dictionary):
+        """
+        Builds an instance from a trusted `to_dict()` representation,
+        such as a record loaded by the storage.
+
+        Unlike `__init__`, the attributes are copied straight into the
+        instance: no `__setattr__` call, so the stored
+        `updated_at` is kept, and each distinct timestamp string is
+        parsed once.
+
+        Parameters:
+        - dictionary (dict[str, any]): The dictionary representation.
+
+        Returns:
+        - BaseModel: The new instance.
+        """
+        if STORAGE_TYPE == 'db':
+            return cls(**dictionary)
+
+        attributes = dict(dictionary)
+        attributes.pop("__class__", None)
+
+        updated_at = attributes.get("updated_at")
+        created_at = attributes.get("created_at")
+        attributes["updated_at"] = datetime.fromisoformat(updated_at) \
+            if updated_at else datetime.now()
+        if created_at == updated_at:
+            attributes["created_at"] = attributes["updated_at"]
+        else:
+            attributes["created_at"] = datetime.fromisoformat(created_at) \
+                if created_at else datetime.now()
+
+        if "id" not in attributes:
+            attributes["id"] = str(uuid4())
+
+        obj = cls.__new__(cls)
+        if COMPACT_MODELS:
+            for attr, value in attributes.items():
+                obj._store(attr, value)
+        else:
+            obj.__dict__.update(attributes)
+
+        return obj
+
     def save(self):
         """
         Saves the current object instance to persistent storage.
@@ -82,16 +200,38 @@ class BaseModel:
         - dictionary (dict[str, any]): Dictionary containing object attributes.
         """
 
-        dictionary = dict(self.__dict__)
+        dictionary = self._public_dict()
 
         dictionary["created_at"] = getattr(self, "created_at").isoformat()
         dictionary["updated_at"] = getattr(self, "updated_at").isoformat()
         dictionary["__class__"] = self.__class__.__name__
 
-        dictionary.pop("_sa_instance_state", None)
-
         return dictionary
 
+    def to_json(self):
+        """
+        Returns the JSON encoding of the dictionary representation.
+
+        In file mode the encoding is cached on the instance
+        until the next attribute write, unless the instance holds a list
+        or a dict, which can change in place without a write.
+
+        Returns:
+        - str: The JSON encoding of `to_dict()`.
+        """
+        if STORAGE_TYPE == 'db':
+            return json.dumps(self.to_dict())
+
+        encoded = getattr(self, "_json", None)
+        if encoded is None:
+            dictionary = self.to_dict()
+            encoded = json.dumps(dictionary)
+            if not any(type(value) in (list, dict)
+                       for value in dictionary.values()):
+                object.__setattr__(self, "_json", encoded)
+
+        return encoded
+
     def delete(self):
         from models import storage
 
@@ -109,9 +249,37 @@ class BaseModel:
         """
         from models import storage
 
-        for attr, value in kwargs.items():
-            if attr not in set(self.NOT_UPDATABLE + BaseModel.NOT_UPDATABLE):
-                storage.update(self, attr=attr, value=value)
+        not_updatable = set(self.NOT_UPDATABLE + BaseModel.NOT_UPDATABLE)
+        storage.update_attributes(self, {
+            attr: value for attr, value in kwargs.items()
+            if attr not in not_updatable
+        })
+
+    def get_dirty_fields(self):
+        """
+        Returns the names of the attributes changed since the object
+        was last loaded from or saved to storage.
+
+        Returns:
+            frozenset[str]: The changed attribute names.
+        """
+        if STORAGE_TYPE == 'db':
+            state = inspect(self, raiseerr=False)
+            return frozenset(
+                attr.key for attr in (state.attrs if state else ())
+                if attr.history.has_changes()
+            )
+
+        return frozenset(getattr(self, "_dirty_fields", None) or ())
+
+    def clear_dirty_fields(self):
+        """
+        Marks the object as in sync with storage.
+
+        In DB mode the session tracks changes itself, so this does nothing.
+        """
+        if STORAGE_TYPE != 'db':
+            object.__setattr__(self, "_dirty_fields", None)
 
     def __str__(self):
         """
@@ -120,14 +288,83 @@ class BaseModel:
         Returns:
         - str: String representation of the object.
         """
-        dictionary = dict(self.__dict__)
-        dictionary.pop("_sa_instance_state", None)
-
         return "[{}] ({}) {}".format(
-            self.__class__.__name__, self.id, dictionary
+            self.__class__.__name__, self.id, self._public_dict()
         )
 
+    def _public_dict(self):
+        """
+        Returns a copy of the instance attributes without the
+        internal ones (SQLAlchemy state, dirty fields tracking,
+        cached JSON encoding), nor, in DB mode, the loaded relationships.
+
+        Returns:
+        - dictionary (dict[str, any]): The public instance attributes.
+        """
+        if COMPACT_MODELS:
+            dictionary = {}
+            for name, get in self._FIELD_GETTERS:
+                try:
+                    dictionary[name] = get(self)
+                except AttributeError:
+                    pass
+
+            for key, value in (self._extra or {}).items():
+                if not key.startswith("_"):
+                    dictionary[key] = value
+
+            return dictionary
+
+        if STORAGE_TYPE == 'db':
+            # BaseModel itself is not mapped, it has no relationships
+            mapper = inspect(type(self), raiseerr=False)
+            relationships = mapper.relationships if mapper else ()
+            return {
+                key: value for key, value in self.__dict__.items()
+                if not key.startswith("_") and key not in relationships
+            }
+
+        return {
+            key: value for key, value in self.__dict__.items()
+            if not key.startswith("_")
+        }
+
+    def _store(self, key, value):
+        """
+        Stores an attribute of a compact instance, in its slot or, for
+        an attribute that is not a declared field, in the instance
+        extra attributes.
+
+        Parameters:
+        - key (str): The attribute name.
+        - value (any): The attribute value.
+        """
+        if key in self._SLOTS:
+            object.__setattr__(self, key, value)
+            return
+
+        if self._extra is None:
+            object.__setattr__(self, "_extra", {})
+        self._extra[key] = value
+
     if STORAGE_TYPE != 'db':
         def __setattr__(self, key, value):
             object.__setattr__(self, "updated_at", datetime.now())
-            object.__setattr__(self, key, value)
+            if COMPACT_MODELS and not isinstance(
+                    getattr(type(self), key, None), property):
+                self._store(key, value)
+            else:
+                object.__setattr__(self, key, value)
+
+            dirty_fields = getattr(self, "_dirty_fields", None)
+            became_dirty = dirty_fields is None
+            if became_dirty:
+                dirty_fields = set()
+                object.__setattr__(self, "_dirty_fields", dirty_fields)
+
+            dirty_fields.update((key, "updated_at"))
+            object.__setattr__(self, "_json", None)
+
+            if became_dirty or key in OBSERVED_FIELDS:
+                for observer in tuple(CHANGE_OBSERVERS):
+                    observer.object_changed(self, key)
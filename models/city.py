@@ -51,7 +51,8 @@ class City(*parent_classes):
             where the city_id is equal to the current `City.id`
             """
             from models import storage
-            return [
-                place for place in storage.all("Place").values()
-                if place.city_id == self.id
-            ]
+            from models.place import Place
+
+            return list(
+                storage.all_by_foreign_key(Place, "city_id", self.id).values()
+            )
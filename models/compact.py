@@ -0,0 +1,88 @@
+#!/usr/bin/python3
+"""
+This module defines the compact representation of the file storage models.
+
+Setting the `HBNB_COMPACT_MODELS` environment variable to "1" (file
+storage only) builds every model class with `__slots__` instead of a
+per-instance `__dict__`:
+
+- The fields declared as class attributes (`name = ""`, ...) become
+  slots. Their class-level values are kept as defaults, returned while
+  a slot is unset, exactly like class attributes shadowed by instance
+  attributes.
+- Attributes that are not declared fields (added by the console or an
+  API update) are kept in a small per-instance dictionary, created on
+  the first such attribute only.
+"""
+import os
+
+COMPACT_MODELS = (os.getenv('HBNB_TYPE_STORAGE') != 'db' and
+                  os.getenv('HBNB_COMPACT_MODELS') == "1")
+
+
+def is_field(name, value):
+    """
+    Tells if a class attribute declares a model field.
+
+    Parameters:
+    - name (str): The class attribute name.
+    - value (any): The class attribute value.
+
+    Returns:
+    - bool: True for public, lowercase attributes holding plain values.
+    """
+    return (not name.startswith("_") and not name.isupper() and
+            isinstance(value, (str, int, float, list, type(None))))
+
+
+class CompactModelMeta(type):
+    """
+    Metaclass turning the fields of a model class into slots.
+
+    Each class gets:
+    - `_FIELD_DEFAULTS` (dict): The default value of each field.
+    - `_FIELD_GETTERS` (tuple): (name, slot getter) pairs of the public
+      slots, in declaration order, used to list the set fields.
+    - `_SLOTS` (frozenset): The names of every slot of its instances.
+    """
+
+    def __new__(mcs, name, bases, namespace):
+        """
+        Creates the model class, with its fields moved to `__slots__`.
+
+        Parameters:
+        - name (str): The class name.
+        - bases (tuple): The parent classes.
+        - namespace (dict): The class body.
+
+        Returns:
+        - type: The new class.
+        """
+        fields = {
+            attr: value for attr, value in namespace.items()
+            if is_field(attr, value)
+        }
+        for attr in fields:
+            del namespace[attr]
+
+        slots = tuple(namespace.get("__slots__", ())) + tuple(fields)
+        namespace["__slots__"] = slots
+
+        cls = super().__new__(mcs, name, bases, namespace)
+
+        cls._FIELD_DEFAULTS = {}
+        cls._SLOTS = frozenset(slots)
+        field_getters = ()
+        for base in reversed(bases):
+            if isinstance(base, CompactModelMeta):
+                cls._FIELD_DEFAULTS.update(base._FIELD_DEFAULTS)
+                cls._SLOTS |= base._SLOTS
+                field_getters += base._FIELD_GETTERS
+        cls._FIELD_DEFAULTS.update(fields)
+
+        cls._FIELD_GETTERS = field_getters + tuple(
+            (slot, getattr(cls, slot).__get__)
+            for slot in slots if not slot.startswith("_")
+        )
+
+        return cls
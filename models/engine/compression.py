@@ -0,0 +1,98 @@
+#!/usr/bin/python3
+"""
+Compression Module
+
+This module defines the Compression class, the streaming compression a
+FileStorage snapshot can be written with.
+
+The gzip and lzma codecs come from the standard library. The zstd codec
+needs the `zstandard` package and is only available when it is installed.
+Unless given a level, each codec compresses at its fastest level,
+see `Compression.DEFAULT_LEVELS`.
+
+Classes:
+    - Compression: A compression codec and level.
+"""
+
+import gzip
+import lzma
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+class Compression:
+    """
+    Compression class represents a streaming compression codec.
+    """
+
+    SUFFIXES = {"gzip": ".gz", "lzma": ".xz", "zstd": ".zst"}
+    # The fastest levels: the higher ones cost far more save time than
+    # the size they save (python -m benchmarks.file_storage_compression)
+    DEFAULT_LEVELS = {"gzip": 1, "lzma": 0, "zstd": 1}
+
+    def __init__(self, name, level=None):
+        """
+        Initialize the Compression instance.
+
+        Parameters:
+            name (str): The codec: "gzip", "lzma" or "zstd".
+            level (int, optional): The compression level. Defaults to
+                the fastest level of the codec, `DEFAULT_LEVELS[name]`.
+
+        Raises:
+            ValueError: If the codec is unknown or not installed.
+        """
+        if name not in self.SUFFIXES:
+            raise ValueError("Unknown compression: {}".format(name))
+        if name == "zstd" and zstandard is None:
+            raise ValueError("zstd compression needs the zstandard package")
+
+        self.name = name
+        self.level = self.DEFAULT_LEVELS[name] if level is None else level
+
+    @property
+    def suffix(self):
+        """The file name suffix of the codec"""
+        return self.SUFFIXES[self.name]
+
+    def writer(self, file):
+        """
+        Wraps a binary file in a compressing stream. Closing the stream
+        writes the end of the compressed data but leaves the file open.
+
+        Parameters:
+            file (BinaryIO): The file to write to.
+
+        Returns:
+            BinaryIO: The compressing stream.
+        """
+        if self.name == "gzip":
+            return gzip.GzipFile(fileobj=file, mode="wb",
+                                 compresslevel=self.level, mtime=0)
+        if self.name == "lzma":
+            return lzma.LZMAFile(file, "wb", preset=self.level)
+
+        return zstandard.ZstdCompressor(level=self.level).stream_writer(
+            file, closefd=False)
+
+    def reader(self, path):
+        """
+        Opens a compressed file as a decompressing stream. Closing the
+        stream closes the file.
+
+        Parameters:
+            path (str): The file path.
+
+        Returns:
+            BinaryIO: The decompressing stream.
+        """
+        if self.name == "gzip":
+            return gzip.open(path, "rb")
+        if self.name == "lzma":
+            return lzma.open(path, "rb")
+
+        return zstandard.ZstdDecompressor().stream_reader(
+            open(path, "rb"), closefd=True)
@@ -12,10 +12,14 @@ Classes:
 """
 
 import os
+import time
+from collections import OrderedDict
 
-from sqlalchemy import create_engine, func
+from sqlalchemy import (create_engine, event, func, inspect, literal, or_,
+                        select, union_all)
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.orm import sessionmaker, scoped_session
+from sqlalchemy.orm import (joinedload, scoped_session, selectinload,
+                            sessionmaker)
 
 from models.base_model import Base
 from models.engine.storage import Storage
@@ -24,14 +28,43 @@ from models.engine.storage import Storage
 class DBStorage(Storage):
     """
     DBStorage class represents the database storage system using SQLAlchemy.
+
+    find(), behind get(), reads the session identity map first, and only
+    queries the database for the objects the session has not loaded yet.
+    The session lasts until close(), which the API and web_flask call at
+    the end of every request, so an object is at most as old as the
+    request by default. `max_staleness` bounds its age instead.
+    The identity map only references unchanged objects weakly, so the
+    session keeps the last `PINNED_OBJECTS` objects found referenced,
+    for a find() of the same object to need no query either.
+
+    counts() sends a single statement, the UNION ALL of the count of
+    each table, whatever the number of classes.
+
+    all() and find() take the relationships to load along with the
+    objects: the collections with one SELECT ... IN query each for all
+    the objects, and the many-to-one relationships joined to the query.
+    Reading them then sends no query per object.
+
+    search_places() filters the places in a single query.
     """
     __engine = None
     __session = None
+    PINNED_OBJECTS = 1000
 
-    def __init__(self):
+    def __init__(self, max_staleness=None):
         """
         Initialize the DBStorage instance.
         Connects to the database and creates a session.
+
+        Parameters:
+            max_staleness (float, optional): The number of seconds an
+                object loaded by the session is trusted for by find().
+                An older one is refreshed from the database, unless it
+                has unflushed changes. 0 refreshes it on every find().
+                Defaults to the `HBNB_MYSQL_MAX_STALENESS` environment
+                variable, None if unset: objects are trusted until the
+                session is closed.
         """
         user = os.getenv('HBNB_MYSQL_USER')
         pwd = os.getenv('HBNB_MYSQL_PWD')
@@ -53,6 +86,10 @@ class DBStorage(Storage):
                 "{}".format(', '.join(missing_vars))
             )
 
+        if max_staleness is None and os.getenv('HBNB_MYSQL_MAX_STALENESS'):
+            max_staleness = float(os.getenv('HBNB_MYSQL_MAX_STALENESS'))
+        self.max_staleness = max_staleness
+
         self._connect(user, pwd, host, db)
 
         if hbnb_env == 'test':
@@ -68,15 +105,21 @@ class DBStorage(Storage):
             pool_pre_ping=pool_pre_ping
         )
 
-    def all(self, cls=None):
+    def all(self, cls=None, load=None):
         """
         Retrieve all objects of a given class from the database.
 
         Parameters:
             cls (class): The class of objects to retrieve.
+            load (list[str], optional): The relationships of `cls` to
+                load along with the objects, see _load_options().
+                Ignored without a class.
 
         Returns:
             dict: A dictionary of objects, where keys are object IDs.
+
+        Raises:
+            ValueError: If a loaded name is not a relationship.
         """
         dictionary = {}
         try:
@@ -86,7 +129,8 @@ class DBStorage(Storage):
                     dictionary.update(
                         self._class_to_dict(_class.__name__, instances))
             else:
-                instances = self.__session.query(cls).all()
+                instances = self.__session.query(cls).options(
+                    *self._load_options(cls, load)).all()
                 dictionary.update(
                     self._class_to_dict(cls.__name__, instances))
         except SQLAlchemyError as err:
@@ -153,25 +197,43 @@ class DBStorage(Storage):
 
         DBStorage.__session = scoped_session(session_factory)
 
-    def find(self, class_name, _id):
+        for event_name in ("load", "refresh"):
+            if not event.contains(Base, event_name, _mark_loaded):
+                event.listen(Base, event_name, _mark_loaded, propagate=True)
+
+    def find(self, class_name, _id, load=None):
         """
         Finds an object in the database by its class name and ID.
 
+        An object already in the session is returned without a query,
+        and refreshed first if it is older than `max_staleness`.
+        Otherwise a single SELECT loads it.
+
         Parameters:
             class_name (str): The name of the class.
             _id (str): The ID of the object.
+            load (list[str], optional): The relationships to load along
+                with the object, see _load_options(). The ones of an
+                object already in the session are loaded when read.
 
         Returns:
             object: The found object, or None if not found.
+
+        Raises:
+            ValueError: If a loaded name is not a relationship.
         """
         _class = self.get_class(class_name)
         if not _class:
             return None
 
         try:
-            obj = self.__session.query(_class).filter_by(id=_id).first()
+            start = time.monotonic()
+            obj = self.__session.get(
+                _class, _id, options=self._load_options(_class, load))
             if obj:
-                self.__session.refresh(obj)
+                if self._is_stale(obj, start):
+                    self.__session.refresh(obj)
+                self._pin(obj)
             return obj
         except SQLAlchemyError as err:
             self.__session.rollback()
@@ -202,9 +264,9 @@ class DBStorage(Storage):
 
         This method updates the specified attribute of an
         object in the database using the provided attribute name and value.
-        The method queries the object's class in the session and applies
-        the update to the object with the matching ID. Changes are flushed
-        to the session but not committed.
+        The attribute is set on the object and the session, which tracks
+        the changed columns, flushes a single UPDATE for them.
+        Changes are flushed to the session but not committed.
 
         Parameters:
             obj (BaseModel): The object to be updated. If None,
@@ -224,11 +286,34 @@ class DBStorage(Storage):
         if not obj or attr is None:
             return
 
+        self.update_attributes(obj, {attr: value})
+
+    def update_attributes(self, obj, attributes):
+        """
+        Updates several attributes of a given object with one UPDATE.
+
+        The new values are set on the object, then a single flush sends
+        one UPDATE statement containing only the columns whose value
+        actually changed. Nothing is sent if no column changed.
+
+        Parameters:
+            obj (BaseModel): The object to be updated. If None,
+                        the method returns without making any changes.
+            attributes (dict[str, any]): The new values by attribute name.
+
+        Raises:
+            SQLAlchemyError: If an error occurs during the update process, it
+                             rolls back the session and raises the exception.
+        """
+        if not obj or not attributes:
+            return
+
         try:
-            self.__session.refresh(obj)
-            self.__session.query(obj.__class__) \
-                .filter_by(id=obj.id).update({attr: value})
-            self.__session.flush()
+            for attr, value in attributes.items():
+                setattr(obj, attr, value)
+
+            if obj.get_dirty_fields():
+                self.__session.flush()
         except SQLAlchemyError as err:
             self.__session.rollback()
             raise err
@@ -253,6 +338,75 @@ class DBStorage(Storage):
             self.__session.rollback()
             raise err
 
+    def counts(self):
+        """
+        Counts the number of objects of every class in the database,
+        with a single statement: the UNION ALL of the COUNT of each table.
+
+        Returns:
+            dict[str, int]: The number of objects by class name.
+        """
+        statement = union_all(*(
+            select(literal(_class.__name__), func.count(_class.id))
+            for _class in self.get_classes()
+        ))
+
+        try:
+            return {
+                class_name: count
+                for class_name, count in self.__session.execute(statement)
+            }
+        except SQLAlchemyError as err:
+            self.__session.rollback()
+            raise err
+
+    def search_places(self, states=None, cities=None, amenities=None):
+        """
+        Search the places of some states or cities that have some
+        amenities, with a single query, see Storage.search_places().
+
+        The places are joined to their city to match `states` and
+        `cities`, and kept if the place_amenity rows linking them to
+        `amenities`, grouped by place, count every one of them.
+
+        Parameters:
+            states (list[str], optional): The ids of the states.
+            cities (list[str], optional): The ids of the cities.
+            amenities (list[str], optional): The ids of the amenities.
+
+        Returns:
+            list[Place]: The matching places.
+        """
+        place = self.get_class("Place")
+        city = self.get_class("City")
+        query = self.__session.query(place)
+
+        if states or cities:
+            query = query.join(city, place.city_id == city.id)
+            conditions = []
+            if states:
+                conditions.append(city.state_id.in_(states))
+            if cities:
+                conditions.append(place.city_id.in_(cities))
+            query = query.filter(or_(*conditions))
+
+        if amenities:
+            place_amenity = Base.metadata.tables["place_amenity"]
+            amenity_ids = set(amenities)
+            query = query.filter(place.id.in_(
+                select(place_amenity.c.place_id)
+                .where(place_amenity.c.amenity_id.in_(amenity_ids))
+                .group_by(place_amenity.c.place_id)
+                .having(func.count(place_amenity.c.amenity_id) ==
+                        len(amenity_ids))
+            ))
+
+        try:
+            return query.all()
+        except SQLAlchemyError as err:
+            self.__session.rollback()
+            raise err
+
     def close(self):
         """
         Remove the current SQLAlchemy session.
@@ -262,6 +416,87 @@ class DBStorage(Storage):
         """
         self.__session.remove()
 
+    @staticmethod
+    def _load_options(cls, load):
+        """
+        Builds the loader options of the relationships to load along
+        with the objects of a class.
+
+        A collection, such as "reviews", is loaded by one SELECT ... IN
+        query for all the objects, a many-to-one relationship, such as
+        "city", by a join in the query of the objects.
+
+        Parameters:
+            cls (class): The class of the objects.
+            load (list[str]): The relationship names, or dotted paths
+                through relationships such as "cities.places".
+
+        Returns:
+            list: The loader options.
+
+        Raises:
+            ValueError: If a name is not a relationship of its class.
+        """
+        options = []
+        for path in load or ():
+            option, _class = None, cls
+            for name in path.split("."):
+                relationship = inspect(_class).relationships.get(name)
+                if relationship is None:
+                    raise ValueError("{} has no relationship {}".format(
+                        _class.__name__, name))
+
+                attr = getattr(_class, name)
+                if relationship.uselist:
+                    option = option.selectinload(attr) if option \
+                        else selectinload(attr)
+                else:
+                    option = option.joinedload(attr) if option \
+                        else joinedload(attr)
+                _class = relationship.mapper.class_
+
+            options.append(option)
+
+        return options
+
+    def _is_stale(self, obj, since):
+        """
+        Tells whether an object of the session must be refreshed.
+
+        Parameters:
+            obj (BaseModel): The object, loaded by the session.
+            since (float): The time.monotonic() the lookup started at,
+                an object loaded since then is up to date.
+
+        Returns:
+            bool: True if it was loaded more than `max_staleness` seconds
+                ago, before the lookup, and has no unflushed changes.
+        """
+        if self.max_staleness is None:
+            return False
+
+        loaded = inspect(obj).info.get(LOADED)
+        if loaded is None or loaded >= since:
+            return False
+
+        return (time.monotonic() - loaded > self.max_staleness and
+                not self.__session.is_modified(obj))
+
+    def _pin(self, obj):
+        """
+        Keeps an object found referenced by the session, until the
+        session is closed or `PINNED_OBJECTS` objects were found since.
+
+        Parameters:
+            obj (BaseModel): The object found.
+        """
+        pinned = self.__session.info.setdefault(PINNED, OrderedDict())
+        key = (type(obj), obj.id)
+        pinned[key] = obj
+        pinned.move_to_end(key)
+        if len(pinned) > self.PINNED_OBJECTS:
+            pinned.popitem(last=False)
+
     def _class_to_dict(self, class_name, instances):
         """
         Helper method to convert a list of instances to a dictionary.
@@ -277,3 +512,20 @@ class DBStorage(Storage):
             self._get_obj_key(class_name, instance.id): instance
             for instance in instances
         }
+
+
+LOADED = "loaded"
+PINNED = "pinned"
+
+
+def _mark_loaded(obj, context, *args):
+    """
+    Records when an object was loaded or refreshed from the database,
+    in the info of its instance state, which does not keep the object
+    alive.
+
+    Parameters:
+        obj (BaseModel): The loaded object.
+        context (QueryContext): The context of the query.
+    """
+    inspect(obj).info[LOADED] = time.monotonic()
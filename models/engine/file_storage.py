@@ -1,19 +1,203 @@
 #!/usr/bin/python3
 """FileStorage module - Handles file storage operations for objects"""
 
+import atexit
+import gc
 import json
 import os
-
+import threading
+
+from models.base_model import observe_changes
+from models.engine.compression import Compression
+from models.engine.flusher import WriteBehindFlusher
+from models.engine.group_commit import GroupCommit
+from models.engine.indexes import FOREIGN_KEYS, RECORD_TYPES, \
+    MappedIndexes, ObjectIndexes, intern_references
+from models.engine.journal import Journal
+from models.engine.shared import ChangeCounter, FileLock
+from models.engine.snapshot_cache import SnapshotCache
+from models.engine.snapshots import JSONSnapshot, MappedSnapshot, \
+    PackedSnapshot, PartitionedJSONSnapshot
 from models.engine.storage import Storage
 
 
 class FileStorage(Storage):
-    """FileStorage class - Handles file storage operations for objects"""
+    """
+    FileStorage class - Handles file storage operations for objects
+
+    The storage is safe to share between threads. Writers (new, delete,
+    update, save, reload) are serialized by a lock. Readers take no lock:
+    each read copies what it returns from the indexes in one atomic
+    operation, and reload() builds new indexes aside before publishing
+    them with a single reference swap, so a reader always sees either
+    the old or the new objects, never a mix.
+
+    In shared mode, the files can be shared between processes too, see
+    `shared`. The changes saved by the other processes are then applied
+    one object at a time.
+    """
 
     __file_path = "file.json"
-    __objects = {}
+    FLUSH_CHANGES = 1000
+    RELOAD_ATTEMPTS = 3
 
-    def all(self, cls=None):
+    def __init__(self, file_path=None, journal=None, partitioned=None,
+                 flush_interval=None, flush_changes=None, file_format=None,
+                 compression=None, cache=None, lazy=None, shared=None):
+        """
+        Initialize the FileStorage instance.
+
+        Parameters:
+            file_path (str, optional): The JSON file used to persist
+                the objects. Defaults to `file.json`.
+            journal (bool, optional): If True, save() appends the changes
+                made since the last save to a log instead of rewriting
+                the whole file. Defaults to the `HBNB_FILE_JOURNAL`
+                environment variable being set to "1".
+            partitioned (bool, optional): If True, each class is saved in
+                its own file and only the files of the changed classes are
+                rewritten. An existing single file is migrated on the first
+                save. Defaults to the `HBNB_FILE_PARTITIONED` environment
+                variable being set to "1".
+            flush_interval (int, optional): If greater than 0, save()
+                returns at once and a background thread persists the
+                pending saves at most every `flush_interval` milliseconds.
+                flush() and interpreter shutdown persist them immediately.
+                Defaults to the `HBNB_FILE_FLUSH_INTERVAL` environment
+                variable, 0 (synchronous saves) if unset.
+            flush_changes (int, optional): The number of pending saves
+                that triggers a background flush before the interval
+                elapses. Defaults to the `HBNB_FILE_FLUSH_CHANGES`
+                environment variable, `FileStorage.FLUSH_CHANGES` if unset.
+            file_format (str, optional): "json", "packed" for the
+                compact binary format of the packed module, which is
+                saved to `file.bin` by default and ignores `partitioned`,
+                or "mapped" for the file of the mapped module, saved to
+                `file.map` by default. A mapped file is never loaded:
+                reload() maps it read-only, so every process mapping it
+                shares one copy, and objects are built from it as they
+                are read, then kept with the ones written since in a
+                delta, see MappedIndexes. It ignores `partitioned`,
+                `compression`, `cache` and `lazy`. Defaults to the
+                `HBNB_FILE_FORMAT` environment variable, "json" if unset.
+            compression (Compression, optional): The streaming compression
+                the files are written with, each file name getting the
+                codec suffix (`file.json.gz`). Uncompressed files are
+                still read. Defaults to the codec named by the
+                `HBNB_FILE_COMPRESSION` environment variable ("gzip",
+                "lzma" or "zstd") at the `HBNB_FILE_COMPRESSION_LEVEL`
+                level, or the fastest level of the codec, see
+                Compression, no compression if unset.
+            cache (bool, optional): If True, reload() pickles the loaded
+                objects in a sidecar file (`file.json.cache`) tied to the
+                checksum of the files, and the next reloads unpickle
+                them instead of parsing the files as long as they are
+                unchanged, see SnapshotCache. Defaults to the
+                `HBNB_FILE_CACHE` environment variable being set to "1".
+            lazy (bool, optional): If True, reload() keeps each object as
+                a record, and only builds it the first time it is read,
+                see ObjectIndexes. A record is the position of the object
+                in the snapshot file, kept open, or its JSON text for
+                the compressed, packed and partitioned files. count()
+                builds nothing, and save() writes the unread objects
+                back as they were loaded. Its cache is
+                `file.json.lazy.cache`. Defaults to the `HBNB_FILE_LAZY`
+                environment variable being set to "1".
+            shared (bool, optional): If True, several processes can use
+                the files at once. Each save() takes an advisory lock
+                on the files (`file.json.lock`), applies the changes the
+                other processes saved since its last reload or save,
+                then appends its own to the journal, implied, numbered
+                by a change counter (`file.json.changes`). close() reads
+                the counter, and only reads the journal records it
+                missed, unless they were compacted into the snapshot
+                meanwhile, which takes a full reload. Every process must
+                use the same options. Defaults to the `HBNB_FILE_SHARED`
+                environment variable being set to "1".
+
+        Raises:
+            ValueError: If the file format or the compression is unknown,
+                or if shared mode is asked for where file locking is not
+                available.
+        """
+        if file_format is None:
+            file_format = os.getenv('HBNB_FILE_FORMAT', "json")
+        if file_format not in ("json", "packed", "mapped"):
+            raise ValueError("Unknown file format: {}".format(file_format))
+
+        if file_path:
+            self.__file_path = file_path
+        elif file_format == "packed":
+            self.__file_path = "file.bin"
+        elif file_format == "mapped":
+            self.__file_path = "file.map"
+
+        if journal is None:
+            journal = os.getenv('HBNB_FILE_JOURNAL') == "1"
+        if partitioned is None:
+            partitioned = os.getenv('HBNB_FILE_PARTITIONED') == "1"
+
+        if compression is None and os.getenv('HBNB_FILE_COMPRESSION'):
+            level = os.getenv('HBNB_FILE_COMPRESSION_LEVEL')
+            compression = Compression(os.getenv('HBNB_FILE_COMPRESSION'),
+                                      int(level) if level else None)
+
+        self.__mapped = file_format == "mapped"
+        if file_format == "packed":
+            snapshot_class = PackedSnapshot
+        elif self.__mapped:
+            snapshot_class = MappedSnapshot
+        elif partitioned:
+            snapshot_class = PartitionedJSONSnapshot
+        else:
+            snapshot_class = JSONSnapshot
+        self.__snapshot = snapshot_class(self.__file_path, compression)
+
+        if lazy is None:
+            lazy = os.getenv('HBNB_FILE_LAZY') == "1"
+        self.__lazy = lazy and not self.__mapped
+
+        if cache is None:
+            cache = os.getenv('HBNB_FILE_CACHE') == "1"
+        self.__cache = None
+        if cache and not self.__mapped:
+            self.__cache = SnapshotCache(
+                self.__file_path + (".lazy.cache" if lazy else ".cache"))
+
+        if shared is None:
+            shared = os.getenv('HBNB_FILE_SHARED') == "1"
+        self.__file_lock = None
+        self.__counter = None
+        self.__sequence = 0
+        if shared:
+            self.__file_lock = FileLock(self.__file_path + ".lock")
+            self.__counter = ChangeCounter(self.__file_path + ".changes")
+
+        self.__journaled = journal or shared
+        self.__journal = Journal(self.__snapshot)
+        self.__changes = {}
+        self.__dirty = {}
+        self.__files_signature = None
+        self.__lock = threading.RLock()
+        self.__indexes = MappedIndexes() if self.__mapped \
+            else ObjectIndexes()
+        self.__group_commit = GroupCommit(self._locked_save)
+        observe_changes(self, FOREIGN_KEYS)
+
+        if flush_interval is None:
+            flush_interval = int(os.getenv('HBNB_FILE_FLUSH_INTERVAL', 0))
+        if flush_changes is None:
+            flush_changes = int(os.getenv('HBNB_FILE_FLUSH_CHANGES',
+                                          self.FLUSH_CHANGES))
+
+        self.__flusher = None
+        if flush_interval > 0:
+            self.__flusher = WriteBehindFlusher(
+                self._locked_save, flush_interval, flush_changes
+            )
+            atexit.register(self.__flusher.stop)
+
+    def all(self, cls=None, load=None):
         """
         Retrieve all objects stored in the storage instance.
 
@@ -23,6 +207,8 @@ class FileStorage(Storage):
         Parameters:
             cls (class, optional): The class type to filter the objects.
             If not provided, returns all objects regardless of class type.
+            load (list[str], optional): Ignored, the relationships are
+                read from the in-memory indexes.
 
         Returns:
             dict or None: A dictionary containing all objects if cls is None.
@@ -32,13 +218,12 @@ class FileStorage(Storage):
                 the stored classes.
         """
         if not cls:
-            return self.__objects
+            return self.__indexes.all()
 
         if cls not in self.get_classes():
             return {}
 
-        return {key: obj for key, obj in self.__objects.items()
-                if obj.__class__ == cls}
+        return self.__indexes.all(cls.__name__)
 
     def new(self, obj):
         """Adds a new object to the storage.
@@ -50,35 +235,326 @@ class FileStorage(Storage):
             return
 
         key = self._get_obj_key(obj.__class__.__name__, obj.id)
-        self.__objects[key] = obj
+        with self.__lock:
+            self.__indexes.add(key, obj)
+            self.__changes[key] = obj
 
     def save(self):
-        """Serializes objects to JSON and saves to file"""
-        serialized_objects = {
-            key: obj.to_dict()
-            for key, obj in self.__objects.items()
-        }
+        """
+        Serializes objects to JSON and saves to file.
 
-        with open(self.__file_path, "w") as file:
-            json.dump(serialized_objects, file)
+        In journaled mode only the objects created, updated or deleted
+        since the last save are appended to the journal, and in
+        partitioned mode only the files of their classes are written. A
+        list or dict changed in place, such as
+        `place.amenity_ids.append(_id)`, does not make its object
+        updated: assign it again or use update().
 
-    def reload(self):
-        """Deserializes JSON from file and reloads objects"""
+        Threads saving while a save is being written wait for it and
+        are then all served by a single write, see GroupCommit.
 
-        if not os.path.isfile(self.__file_path):
+        In write-behind mode the save is only scheduled,
+        see flush() to persist it immediately.
+        """
+        if self.__flusher:
+            self.__flusher.notify()
             return
 
-        try:
-            with open(self.__file_path, "r") as file:
-                deserialized_objects = json.load(file)
+        self.__group_commit.commit()
+
+    def flush(self):
+        """
+        Persists the scheduled saves of write-behind mode immediately.
+        Saves synchronously otherwise.
+        """
+        if self.__flusher:
+            self.__flusher.flush()
+        else:
+            self.__group_commit.commit()
+
+    def _locked_save(self):
+        """Takes the lock and saves the objects, see save()"""
+        with self.__lock:
+            self._save()
+
+    def _save(self):
+        """
+        Saves the objects, see save(). Must be called with the lock held.
+        """
+        if self.__file_lock:
+            with self.__file_lock:
+                self._add_dirty_objects()
+                self._catch_up()
+                self._append_changes(self.__sequence + 1)
+            return
+
+        if self.__journaled:
+            self._add_dirty_objects()
+            self._append_changes()
+            return
+
+        self._add_dirty_objects()
+        changes, self.__changes = self.__changes, {}
+        changed_classes = {key.split(".", 1)[0] for key in changes}
+        for obj in changes.values():
+            if obj:
+                obj.clear_dirty_fields()
+
+        self.__journal.wait()
+        self.__snapshot.dump({
+            class_name: self._encoded_objects(class_name)
+            for class_name in self.get_classes_names()
+        }, changed_classes)
+        self.__journal.clear()
+        if self.__mapped:
+            self.__indexes = self.__indexes.remap(self.__snapshot.open_map())
+        self.__files_signature = self._files_signature()
+
+    def object_changed(self, obj, attr):
+        """
+        Called by an object when it becomes dirty and when one of its
+        foreign keys is set, see observe_changes(). If the object is
+        stored here, it is remembered for the next save, so attributes
+        set directly, without update(), are saved without scanning every
+        object, and it is indexed again under its new parent.
+
+        Parameters:
+            obj (BaseModel): The changed object.
+            attr (str): The attribute set.
+        """
+        _id = getattr(obj, "id", None)
+        if _id is None:
+            return
+
+        key = self._get_obj_key(obj.__class__.__name__, _id)
+        with self.__lock:
+            if not self.__indexes.holds(key, obj):
+                return
 
-                FileStorage.__objects = {
-                    key: self._deserialize(dictionary)
-                    for key, dictionary in deserialized_objects.items()
-                }
+            self.__dirty[key] = obj
+            if attr in FOREIGN_KEYS:
+                self.__indexes.add(key, obj)
+
+    def _add_dirty_objects(self):
+        """
+        Records as changed the objects that became dirty since the last
+        save, see object_changed(). Must be called with the lock held.
+        """
+        dirty, self.__dirty = self.__dirty, {}
+        for key, obj in dirty.items():
+            if key not in self.__changes and self.__indexes.holds(key, obj):
+                self.__changes[key] = obj
+
+    def _append_changes(self, sequence=None):
+        """
+        Appends the changes made since the last save to the journal.
+        Must be called with the lock held.
+        Parameters:
+            sequence (int): the number of the save in shared mode, stored
+                in the change counter once the changes are written
+        """
+        changes, self.__changes = self.__changes, {}
+        # Cleared first: an attribute set while the changes are encoded
+        # makes the object dirty again, for the next save
+        for obj in changes.values():
+            if obj:
+                obj.clear_dirty_fields()
+        self.__journal.append({
+            key: obj.to_json() if obj else None
+            for key, obj in changes.items()
+        }, sequence)
+
+        if sequence is not None and changes:
+            self.__counter.write(sequence)
+            self.__sequence = sequence
+        self.__files_signature = self._files_signature()
+
+    def _catch_up(self):
+        """
+        Applies the changes the other processes saved since the last
+        reload, save or catch up, in shared mode. Must be called with
+        the lock held.
+
+        Only the journal records missed are read, unless they can't be
+        anymore: the files are then reloaded. Either way the changes of
+        this process not saved yet are kept, over the ones read.
+        """
+        sequence = self.__counter.read()
+        if sequence == self.__sequence:
+            return
+
+        found = None
+        if sequence > self.__sequence:
+            found = self.__journal.changes_since(self.__sequence)
+
+        if found is None or found[1] < sequence:
+            changes = self.__changes
+            self._reload()
+            for key, obj in changes.items():
+                if obj is None:
+                    self.__indexes.remove(key)
+                else:
+                    self.__indexes.add(key, obj)
+            self.__changes = changes
+            return
+
+        dictionaries, self.__sequence = found
+        for key, dictionary in dictionaries.items():
+            if key in self.__changes:
+                continue
+            if dictionary is None:
+                self.__indexes.remove(key)
+            else:
+                self._load_object(self.__indexes, key, dictionary)
+        self.__files_signature = self._files_signature()
+
+    def reload(self):
+        """
+        Deserializes JSON from file, replays the journal
+        on top of it and reloads objects
+
+        The file is decoded one object at a time, each object being built
+        as soon as it is read, so the decoded file is never held whole in
+        memory next to the objects.
+
+        With the snapshot cache, the objects and their indexes are read
+        from the cache when the checksum of the files matches it, and
+        the cache is rewritten from the reloaded objects when it does not.
+
+        A mapped snapshot is mapped instead of decoded, and only the
+        journal changes are loaded on top of it, see MappedIndexes.
+
+        The files are read again if the snapshot is replaced while it is
+        read, by the journal compaction of another process, as the
+        rotated log read with it may already be gone.
+        """
+        with self.__lock:
+            self._reload()
+
+    def _reload(self):
+        """
+        Reloads the objects, see reload(). Must be called with
+        the lock held.
+        """
+        self.__journal.wait()
+        if self.__counter:
+            self.__journal.mark_tail()
+            self.__sequence = self.__counter.read()
+
+        for attempt in range(self.RELOAD_ATTEMPTS, 0, -1):
+            if self._reload_files(attempt == 1):
+                return
+
+    def _reload_files(self, last_attempt):
+        """
+        Reads the files and publishes the objects, unless the snapshot
+        was replaced meanwhile, see reload()
+        Parameters:
+            last_attempt (bool): if True, the objects are published
+                even if the snapshot was replaced
+        Returns:
+            False if the objects were not published, otherwise True
+        """
+        self.__files_signature = self._files_signature()
+        snapshot_files = len(self.__snapshot.paths())
+
+        if not self.__snapshot.exists() and not self.__journal.exists():
+            return True
+
+        # The snapshot file the lazy records point into is opened first
+        # and read, checksum included, through the same descriptor, so
+        # the records match it even if a save replaces the file meanwhile.
+        source = self.__snapshot.open_source() if self.__lazy else None
+
+        checksum = None
+        if self.__cache:
+            sources = (source,) if source else ()
+            checksum = self.__cache.checksum(tuple(
+                path for path in self.__snapshot.paths()
+                if not source or path != source.path
+            ) + self.__journal.log_paths(), sources)
+
+        indexes = ObjectIndexes()
+
+        # The objects built here all live as long as the storage, so the
+        # cyclic garbage collector passes triggered by allocating them
+        # would find nothing to free.
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            cached = self.__cache.load(checksum) if self.__cache else None
+            if isinstance(cached, ObjectIndexes):
+                indexes = cached
+            elif self.__mapped:
+                indexes = self._map_files()
+            else:
+                self._load_files(indexes, source)
+        except (OSError, ValueError):
+            if source:
+                source.close()
+            return True
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+        if not last_attempt and self._files_signature()[:snapshot_files] \
+                != self.__files_signature[:snapshot_files]:
+            return False
+
+        if self.__cache and indexes is not cached:
+            self.__cache.dump(checksum, indexes)
+
+        indexes.set_source(source)
+        self.__indexes = indexes
+        self.__changes = {}
+        self.__dirty = {}
+        return True
+
+    def _load_files(self, indexes, source):
+        """
+        Loads the snapshot and replays the journal on top of it
+        Parameters:
+            indexes (ObjectIndexes): the indexes being built
+            source (RecordSource): the snapshot file opened for
+                a lazy reload, if any
+        """
+        changes = self.__journal.changes()
+        if self.__lazy:
+            for key, dictionary, text, position in \
+                    self.__snapshot.stream_texts(source):
+                record = text
+                if key in changes:
+                    dictionary, record = changes.pop(key), None
+                elif source and position is not None:
+                    record = source.record(position, text) or text
+                self._load_record(indexes, key, dictionary, record)
+        else:
+            for key, dictionary in self.__snapshot.stream():
+                if key in changes:
+                    dictionary = changes.pop(key)
+                self._load_object(indexes, key, dictionary)
+
+        for key, dictionary in changes.items():
+            if self.__lazy:
+                self._load_record(indexes, key, dictionary, None)
+            else:
+                self._load_object(indexes, key, dictionary)
+
+    def _map_files(self):
+        """
+        Maps the snapshot and replays the journal on top of it
+        Returns:
+            The objects of the mapped file under the journal
+            changes (MappedIndexes)
+        """
+        indexes = MappedIndexes(self.__snapshot.open_map())
+        for key, dictionary in self.__journal.changes().items():
+            if dictionary is None:
+                indexes.remove(key)
+            else:
+                self._load_object(indexes, key, dictionary)
 
-        except (OSError, json.JSONDecodeError):
-            pass
+        return indexes
 
     def delete(self, obj=None):
         """
@@ -96,14 +572,18 @@ class FileStorage(Storage):
             return
 
         key = self._get_obj_key(obj.__class__.__name__, obj.id)
-        self.__objects.pop(key, None)
+        with self.__lock:
+            if self.__indexes.remove(key) is not None:
+                self.__changes[key] = None
 
-    def find(self, class_name, _id):
+    def find(self, class_name, _id, load=None):
         """
         Finds and returns an object by class name and ID
         Parameters:
             class_name (str): the name of the class
             _id (str): the ID of the object
+            load (list[str], optional): Ignored, the relationships are
+                read from the in-memory indexes.
         Returns:
             The object if found, otherwise None
         """
@@ -111,7 +591,7 @@ class FileStorage(Storage):
             return None
 
         key = self._get_obj_key(class_name, _id)
-        return self.__objects.get(key, None)
+        return self.__indexes.get(key)
 
     def find_all(self, class_name=""):
         """
@@ -122,13 +602,13 @@ class FileStorage(Storage):
             A list of objects if found, otherwise an empty list
         """
         if not class_name:
-            return [str(obj) for obj in self.__objects.values()]
+            return [str(obj) for obj in self.__indexes.all().values()]
 
         if class_name not in self.get_classes_names():
             return []
 
-        return [str(obj) for key, obj in self.__objects.items()
-                if obj.__class__.__name__ == class_name]
+        return [str(obj)
+                for obj in self.__indexes.all(class_name).values()]
 
     def update(self, obj=None, attr=None, value=None):
         """
@@ -147,7 +627,13 @@ class FileStorage(Storage):
         if not obj or type(obj) not in self.get_classes() or attr is None:
             return
 
-        setattr(obj, attr, value)
+        key = self._get_obj_key(obj.__class__.__name__, obj.id)
+        with self.__lock:
+            # A foreign key set is indexed again by object_changed()
+            setattr(obj, attr, value)
+
+            if self.__indexes.holds(key, obj):
+                self.__changes[key] = obj
 
     def count_by_class_name(self, class_name):
         """
@@ -160,18 +646,183 @@ class FileStorage(Storage):
         if not class_name or class_name not in self.get_classes_names():
             return 0
 
-        return sum(1 for key in self.__objects.keys()
-                   if key.startswith(class_name))
+        return self.__indexes.count(class_name)
+
+    def all_by_foreign_key(self, cls, foreign_key, _id):
+        """
+        Retrieve all objects of a given class that reference
+        a parent object through one of their foreign keys.
+
+        Parameters:
+            cls (class): The class type of the child objects.
+            foreign_key (str): The foreign key attribute name
+                (one of `FOREIGN_KEYS`).
+            _id (str): The ID of the parent object.
+
+        Returns:
+            dict: A dictionary of the matching objects, keyed like `all()`.
+        """
+        if cls not in self.get_classes() or foreign_key not in FOREIGN_KEYS:
+            return {}
+
+        return self.__indexes.children(cls.__name__, foreign_key, _id)
+
+    def search_places(self, states=None, cities=None, amenities=None):
+        """
+        Search the places of some states or cities that have some
+        amenities, see Storage.search_places(), with the indexes of the
+        objects by parent: the keys of the cities of each state, of the
+        places of each city and of the places of each amenity, through
+        their amenity_ids. The sets of keys are merged, the
+        intersections from the smallest set up, and only the matching
+        places are built, in the order of their keys. As in the default
+        loop, no place has an amenity that is not stored.
+
+        Parameters:
+            states (list[str], optional): the ids of the states
+            cities (list[str], optional): the ids of the cities
+            amenities (list[str], optional): the ids of the amenities
+
+        Returns:
+            list[Place]: the matching places
+        """
+        indexes = self.__indexes
+        keys_sets = []
+
+        if states or cities:
+            city_ids = set(cities or ())
+            for state_id in states or ():
+                city_ids.update(
+                    key.split(".", 1)[1]
+                    for key in indexes.child_keys("City", "state_id",
+                                                  state_id))
+            keys = set()
+            for city_id in city_ids:
+                keys |= indexes.child_keys("Place", "city_id", city_id)
+            keys_sets.append(keys)
+
+        for amenity_id in set(amenities or ()):
+            if indexes.get("Amenity." + amenity_id) is None:
+                return []
+            keys_sets.append(indexes.child_keys("Place", "amenity_ids",
+                                                amenity_id))
+
+        if not keys_sets:
+            return list(indexes.all("Place").values())
+
+        keys_sets.sort(key=len)
+        keys = keys_sets[0]
+        for other_keys in keys_sets[1:]:
+            if not keys:
+                break
+            keys = keys.intersection(other_keys)
+
+        places = (indexes.get(key) for key in sorted(keys))
+        return [place for place in places if place is not None]
 
     def close(self):
         """
-        Reload the object state from the database.
+        Reload the object state from the file if it changed.
 
         This method is intended to refresh the current instance with the latest
-        data from the database, ensuring that any changes made by other
-        transactions are reflected in the current instance.
+        data from the file, ensuring that any changes made by other
+        processes are reflected in the current instance. It does nothing
+        when the file and its journal are unchanged since the last
+        reload or save of this instance, or while saves of write-behind
+        mode are pending, as a reload would drop them.
         """
-        self.reload()
+        if self.__flusher and self.__flusher.pending():
+            return
+
+        if self.__counter:
+            if self.__counter.read() != self.__sequence:
+                with self.__lock:
+                    self._catch_up()
+            return
+
+        if self._files_signature() == self.__files_signature:
+            return
+
+        with self.__lock:
+            if self._files_signature() != self.__files_signature:
+                self._reload()
+
+    def _files_signature(self):
+        """
+        Returns a cheap fingerprint of the file and its journal logs,
+        made of the inode, size and modification time of each of them.
+        Returns:
+            A tuple that changes whenever one of the files is
+            written, replaced or removed (tuple)
+        """
+        signature = []
+        for path in self.__snapshot.paths() + self.__journal.log_paths():
+            try:
+                stat = os.stat(path)
+            except OSError:
+                signature.append(None)
+                continue
+            signature.append((stat.st_ino, stat.st_size, stat.st_mtime_ns))
+
+        return tuple(signature)
+
+    def _encoded_objects(self, class_name):
+        """
+        Lazily encodes the objects of a class for the snapshot
+        Parameters:
+            class_name (str): the name of the class
+        Returns:
+            A generator of (key, record) pairs, the record being what the
+            snapshot format expects, such as the JSON text cached on each
+            object until its next change (generator)
+        """
+        indexes = self.__indexes
+        encode_object = self.__snapshot.encode_object
+        encode_record = self.__snapshot.encode_record
+        return (
+            (key, encode_record(indexes.text(obj))
+             if type(obj) in RECORD_TYPES else encode_object(obj))
+            for key, obj in indexes.items(class_name)
+        )
+
+    def _load_object(self, indexes, key, dictionary):
+        """
+        Deserializes a stored object into indexes being built by reload
+        Parameters:
+            indexes (ObjectIndexes): the indexes being built
+            key (str): the storage key of the object
+            dictionary (dict[str, any]): the stored dictionary,
+                None for an object deleted by the journal
+        """
+        obj = self._deserialize(dictionary)
+        if obj:
+            indexes.add(key, obj)
+
+    def _load_record(self, indexes, key, dictionary, record):
+        """
+        Registers a stored object into indexes being built by a lazy
+        reload, to be built on first read
+        Parameters:
+            indexes (ObjectIndexes): the indexes being built
+            key (str): the storage key of the object
+            dictionary (dict[str, any]): the stored dictionary,
+                None for an object deleted by the journal
+            record (str | int): the JSON text of the dictionary or its
+                position in the source, None if it was not read from
+                the snapshot
+        """
+        if dictionary is None:
+            return
+
+        class_name = dictionary.get("__class__", None)
+        if not self.get_class(class_name) or \
+                key.split(".", 1)[0] != class_name:
+            self._load_object(indexes, key, dictionary)
+            return
+
+        indexes.add_record(key, dictionary,
+                           json.dumps(dictionary) if record is None
+                           else record)
 
     def _deserialize(self, dictionary):
         """
@@ -193,4 +844,5 @@ class FileStorage(Storage):
         if not _class:
             return None
 
-        return _class(**dictionary)
+        intern_references(dictionary)
+        return _class.from_dict(dictionary)
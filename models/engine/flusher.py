@@ -0,0 +1,125 @@
+#!/usr/bin/python3
+"""
+Flusher Module
+
+This module defines the WriteBehindFlusher class, the background thread
+a FileStorage uses to persist its saves asynchronously.
+
+Classes:
+    - WriteBehindFlusher: Coalesces save requests into periodic flushes.
+"""
+
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class WriteBehindFlusher:
+    """
+    WriteBehindFlusher class represents a background thread that calls
+    a flush function once saves are pending, at most every `interval`
+    milliseconds, or as soon as `max_changes` saves are pending.
+    Every save requested before a flush starts is persisted by it.
+    A flush that fails is logged and retried after the interval.
+    """
+
+    def __init__(self, flush, interval, max_changes):
+        """
+        Initialize the WriteBehindFlusher instance and start its thread.
+
+        Parameters:
+            flush (callable): The function persisting the storage.
+            interval (int): The longest time in milliseconds a save
+                stays pending.
+            max_changes (int): The number of pending saves that
+                triggers a flush without waiting for the interval.
+        """
+        self.__flush = flush
+        self.__interval = interval / 1000
+        self.__max_changes = max_changes
+        self.__condition = threading.Condition()
+        self.__pending = 0
+        self.__pending_since = None
+        self.__stopped = False
+        self.__thread = threading.Thread(target=self._run, daemon=True)
+        self.__thread.start()
+
+    def notify(self):
+        """Records a save request, to be persisted by a coming flush"""
+        with self.__condition:
+            first = not self.__pending
+            if first:
+                self.__pending_since = time.monotonic()
+            self.__pending += 1
+            # The thread waits without a timeout while nothing is pending
+            if first or self.__pending >= self.__max_changes:
+                self.__condition.notify()
+
+    def pending(self):
+        """Returns the number of save requests not flushed yet"""
+        return self.__pending
+
+    def flush(self):
+        """
+        Persists the pending saves now, in the calling thread.
+
+        Raises:
+            Exception: Any exception raised by the flush function. The
+                saves are kept pending so the next flush retries them.
+        """
+        with self.__condition:
+            pending, self.__pending = self.__pending, 0
+            pending_since = self.__pending_since
+
+        try:
+            self.__flush()
+        except Exception:
+            with self.__condition:
+                if not self.__pending:
+                    self.__pending_since = pending_since
+                self.__pending += pending
+            raise
+
+    def stop(self):
+        """
+        Stops the thread, then flushes what is still pending.
+        Meant to run at interpreter shutdown.
+        """
+        with self.__condition:
+            self.__stopped = True
+            self.__condition.notify()
+
+        self.__thread.join()
+        if self.__pending:
+            self.flush()
+
+    def _run(self):
+        """The thread loop: waits for a flush to be due, then flushes"""
+        while True:
+            with self.__condition:
+                while not self.__stopped and not self._flush_due():
+                    timeout = None
+                    if self.__pending:
+                        timeout = self.__interval - (
+                            time.monotonic() - self.__pending_since)
+                    self.__condition.wait(timeout)
+
+                if self.__stopped:
+                    return
+
+            try:
+                self.flush()
+            except Exception:
+                logger.exception("write-behind flush failed, retrying")
+                with self.__condition:
+                    self.__condition.wait(self.__interval)
+
+    def _flush_due(self):
+        """Returns True if the pending saves must be flushed now"""
+        if not self.__pending:
+            return False
+
+        return (self.__pending >= self.__max_changes or
+                time.monotonic() - self.__pending_since >= self.__interval)
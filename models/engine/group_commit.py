@@ -0,0 +1,67 @@
+#!/usr/bin/python3
+"""
+Group Commit Module
+
+This module defines the GroupCommit class, which lets the threads
+saving a FileStorage at the same time share a single write.
+
+Classes:
+    - GroupCommit: Batches concurrent commit requests into one write.
+"""
+
+import threading
+
+
+class GroupCommit:
+    """
+    GroupCommit class represents the commit queue of a storage.
+
+    A thread calling commit() while a write is running waits for it to
+    end, then either finds its request covered by a write started after
+    it, or becomes the leader writing for every thread that queued
+    meanwhile. Each call returns once a write that started after it
+    has completed, so it sees every change made before the call.
+    """
+
+    def __init__(self, write):
+        """
+        Initialize the GroupCommit instance.
+
+        Parameters:
+            write (callable): The function persisting the storage.
+        """
+        self.__write = write
+        self.__condition = threading.Condition()
+        self.__requested = 0
+        self.__durable = 0
+        self.__writing = False
+
+    def commit(self):
+        """
+        Blocks until the changes made before the call are written.
+
+        Raises:
+            Exception: Any exception raised by the write function, in
+                the leader thread. The waiting threads elect a new
+                leader which retries the write.
+        """
+        with self.__condition:
+            self.__requested += 1
+            ticket = self.__requested
+
+            while self.__durable < ticket:
+                if self.__writing:
+                    self.__condition.wait()
+                    continue
+
+                self.__writing = True
+                batch = self.__requested
+                self.__condition.release()
+                try:
+                    self.__write()
+                finally:
+                    self.__condition.acquire()
+                    self.__writing = False
+                    self.__condition.notify_all()
+
+                self.__durable = max(self.__durable, batch)
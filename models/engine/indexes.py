@@ -0,0 +1,776 @@
+#!/usr/bin/python3
+"""
+Indexes Module
+
+This module defines the ObjectIndexes class, the in-memory set of
+dictionaries a FileStorage keeps its objects in, and the MappedIndexes
+class, the objects of a mapped snapshot file under the changes of
+the process.
+
+Classes:
+    - ObjectIndexes: The objects dictionary and its secondary indexes.
+    - MappedIndexes: A mapped file under a delta layer of objects.
+
+Functions:
+    - references: The parents an object is indexed under.
+    - intern_references: Interns the ids of a stored dictionary.
+    - hydrate: Builds an object from its stored JSON text.
+"""
+
+import json
+import sys
+import threading
+
+from models.engine.stored_classes import CLASSES
+
+# amenity_ids holds a list of ids, each one indexed as a parent
+FOREIGN_KEYS = ("state_id", "city_id", "place_id", "user_id", "amenity_ids")
+INTERNED_ATTRIBUTES = ("id",) + FOREIGN_KEYS
+FOREIGN_KEYS_BY_CLASS = {
+    class_name: tuple(
+        foreign_key for foreign_key in FOREIGN_KEYS
+        if hasattr(_class, foreign_key)
+    )
+    for class_name, _class in CLASSES.items()
+}
+# The types of the objects not built yet: JSON texts (str) and
+# positions in a RecordSource (int)
+RECORD_TYPES = (str, int)
+
+# Serializes the writers of every ObjectIndexes with the readers
+# hydrating records. Shared by all the indexes so they stay picklable.
+LOCK = threading.RLock()
+
+
+def references(class_name, get):
+    """
+    Returns the parents an object of a class is indexed under: the
+    (foreign key, parent id) pairs of its foreign keys, one per id of a
+    list of ids such as amenity_ids.
+
+    Parameters:
+        class_name (str): The name of the class of the object.
+        get (callable): Returns the value of an attribute of the
+            object, None if unset.
+
+    Returns:
+        tuple[tuple[str, str], ...]: The pairs.
+    """
+    parents = ()
+    for foreign_key in FOREIGN_KEYS_BY_CLASS[class_name]:
+        value = get(foreign_key)
+        if type(value) is list:
+            parents += tuple((foreign_key, parent_id) for parent_id in value
+                             if parent_id and type(parent_id) is str)
+        elif value and type(value) is str:
+            parents += ((foreign_key, value),)
+
+    return parents
+
+
+def references_parent(value, parent_id):
+    """
+    Tells whether the value of a foreign key references a parent.
+
+    Parameters:
+        value (any): The value of the foreign key, or list of ids.
+        parent_id (str): The ID of the parent.
+
+    Returns:
+        bool: True if it is the parent id, or a list holding it.
+    """
+    if type(value) is list:
+        return parent_id in value
+
+    return value == parent_id
+
+
+def intern_references(dictionary):
+    """
+    Interns the ids and foreign keys of a stored dictionary, in place,
+    so every reference to an object shares one string with its id, and
+    looking it up in the indexes matches by identity.
+
+    Parameters:
+        dictionary (dict[str, any]): The dictionary to update.
+    """
+    for attr in INTERNED_ATTRIBUTES:
+        value = dictionary.get(attr)
+        if type(value) is str:
+            dictionary[attr] = sys.intern(value)
+        elif type(value) is list:
+            dictionary[attr] = [
+                sys.intern(item) if type(item) is str else item
+                for item in value
+            ]
+
+
+def hydrate(text):
+    """
+    Builds an object from the JSON text of its stored dictionary.
+
+    Parameters:
+        text (str): The JSON text.
+
+    Returns:
+        BaseModel: The object.
+    """
+    dictionary = json.loads(text)
+    intern_references(dictionary)
+    return CLASSES[dictionary["__class__"]].from_dict(dictionary)
+
+
+class ObjectIndexes:
+    """
+    ObjectIndexes class represents the stored objects and their
+    secondary indexes:
+        - objects: {key: obj}
+        - objects by class: {class name: {key: obj}}
+        - objects by parent: {class name: {foreign key:
+          {parent id: {key: obj}}}}, a place being under each id of
+          its amenity_ids, see references()
+        - indexed parents: {key: ((foreign key, parent id), ...)},
+          the foreign key values an object was indexed with, so it
+          can be removed even after its attributes were changed.
+
+    An object can be stored as a record, see add_record(): the JSON
+    text of its stored dictionary, or the position of that text in the
+    source, the snapshot file it was loaded from. It is then only built,
+    and stored in place of the record, when a read method returns it.
+    count() never builds objects, and items() returns records as they
+    are. The source is not pickled, see set_source().
+
+    Each read method returns a copy made by a single dict operation,
+    which the GIL makes atomic, so readers never see a half-applied write
+    and only take a lock to build records.
+    """
+
+    def __init__(self):
+        """Initialize empty indexes"""
+        self.__objects = {}
+        self.__objects_by_class = {
+            class_name: {} for class_name in CLASSES.keys()
+        }
+        self.__objects_by_parent = {
+            class_name: {foreign_key: {} for foreign_key in FOREIGN_KEYS}
+            for class_name in CLASSES.keys()
+        }
+        self.__indexed_parents = {}
+        self.__records_by_class = {class_name: 0 for class_name in CLASSES}
+        self.__source = None
+
+    def __getstate__(self):
+        """Returns the attributes to pickle, all but the source"""
+        state = self.__dict__.copy()
+        state["_ObjectIndexes__source"] = None
+        return state
+
+    def set_source(self, source):
+        """
+        Sets the file the position records are read from.
+
+        Parameters:
+            source (RecordSource): the open snapshot file
+        """
+        self.__source = source
+
+    def text(self, record):
+        """
+        Returns the JSON text of a record.
+
+        Parameters:
+            record (str | int): the record
+
+        Returns:
+            str: The JSON text.
+        """
+        if type(record) is str:
+            return record
+
+        return self.__source.read(record)
+
+    def get(self, key):
+        """
+        Returns the object stored under a key.
+
+        Parameters:
+            key (str): the storage key of the object (<class name>.<id>)
+
+        Returns:
+            BaseModel: The object, or None if not found.
+        """
+        obj = self.__objects.get(key)
+        if type(obj) in RECORD_TYPES:
+            obj = self._hydrate(key)
+
+        return obj
+
+    def holds(self, key, obj):
+        """
+        Tells whether an object is the one stored under a key, building
+        no record.
+
+        Parameters:
+            key (str): the storage key of the object (<class name>.<id>)
+            obj (BaseModel): the object
+
+        Returns:
+            bool: True if `obj` itself is stored under `key`.
+        """
+        return self.__objects.get(key) is obj
+
+    def all(self, class_name=None):
+        """
+        Returns a copy of the objects of a class, or of every object.
+
+        Parameters:
+            class_name (str, optional): the name of the class
+
+        Returns:
+            dict[str, BaseModel]: The objects by key.
+        """
+        if class_name is None:
+            for name, records in self.__records_by_class.items():
+                if records:
+                    self._hydrate_class(name)
+            return self.__objects.copy()
+
+        if self.__records_by_class[class_name]:
+            self._hydrate_class(class_name)
+
+        return self.__objects_by_class[class_name].copy()
+
+    def count(self, class_name):
+        """
+        Returns the number of objects of a class.
+
+        Parameters:
+            class_name (str): the name of the class
+
+        Returns:
+            int: The number of objects.
+        """
+        return len(self.__objects_by_class[class_name])
+
+    def children(self, class_name, foreign_key, parent_id):
+        """
+        Returns a copy of the objects of a class referencing a parent.
+
+        Parameters:
+            class_name (str): the name of the child class
+            foreign_key (str): the foreign key attribute name
+            parent_id (str): the ID of the parent object
+
+        Returns:
+            dict[str, BaseModel]: The objects by key.
+        """
+        children = self.__objects_by_parent[class_name][foreign_key] \
+            .get(parent_id)
+        if not children:
+            return {}
+
+        children = children.copy()
+        if self.__records_by_class[class_name]:
+            for key, obj in children.items():
+                if type(obj) in RECORD_TYPES:
+                    children[key] = self._hydrate(key)
+
+        return children
+
+    def child_keys(self, class_name, foreign_key, parent_id):
+        """
+        Returns the keys of the objects of a class referencing a parent,
+        building none of them.
+
+        Parameters:
+            class_name (str): the name of the child class
+            foreign_key (str): the foreign key attribute name
+            parent_id (str): the ID of the parent object
+
+        Returns:
+            set[str]: The keys.
+        """
+        if type(parent_id) is not str:
+            return set()
+
+        return set(self.__objects_by_parent[class_name][foreign_key]
+                   .get(parent_id, ()))
+
+    def add(self, key, obj):
+        """
+        Registers an object in the objects dictionary,
+        in the bucket of its class and under each of its parents.
+        An object already stored under the key is replaced.
+
+        Parameters:
+            key (str): the storage key of the object (<class name>.<id>)
+            obj (BaseModel): the object to register
+        """
+        class_name = obj.__class__.__name__
+        with LOCK:
+            self._add(key, class_name, obj, references(
+                class_name, lambda attr: getattr(obj, attr, None)))
+
+    def add_record(self, key, dictionary, record):
+        """
+        Registers an object as a record, to be built on first read.
+
+        Parameters:
+            key (str): the storage key of the object (<class name>.<id>)
+            dictionary (dict[str, any]): the stored dictionary of the
+                object, of a stored class, the class name of the key
+            record (str | int): the JSON text of the dictionary, or its
+                position in the source, see RecordSource
+        """
+        class_name = dictionary["__class__"]
+        parents = tuple(
+            (foreign_key, sys.intern(parent_id))
+            for foreign_key, parent_id in references(class_name,
+                                                     dictionary.get)
+        )
+
+        with LOCK:
+            self._add(key, class_name, record, parents)
+            self.__records_by_class[class_name] += 1
+
+    def remove(self, key):
+        """
+        Removes an object from the objects dictionary,
+        from the bucket of its class and from under each of its parents.
+
+        Parameters:
+            key (str): the storage key of the object (<class name>.<id>)
+
+        Returns:
+            BaseModel: The removed object, its record if it was
+            not built yet, or None if not found.
+        """
+        with LOCK:
+            return self._remove(key)
+
+    def items(self, class_name):
+        """
+        Returns a view of the (key, object) pairs of a class, the
+        objects not built yet being records, see text().
+
+        The view is live: it must only be iterated while no
+        writer can change the indexes.
+
+        Parameters:
+            class_name (str): the name of the class
+
+        Returns:
+            dict_items: The (key, object) pairs.
+        """
+        return self.__objects_by_class[class_name].items()
+
+    def _add(self, key, class_name, obj, parents):
+        """
+        Registers an object or a record under its key, its class and its
+        parents. Must be called with the lock held.
+        """
+        if key in self.__objects:
+            self._remove(key)
+
+        self.__objects[key] = obj
+        self.__objects_by_class[class_name][key] = obj
+
+        by_parent = self.__objects_by_parent[class_name]
+        for foreign_key, parent_id in parents:
+            by_parent[foreign_key].setdefault(parent_id, {})[key] = obj
+
+        if parents:
+            self.__indexed_parents[key] = parents
+
+    def _remove(self, key):
+        """
+        Removes an object or a record, see remove(). Must be called with
+        the lock held.
+        """
+        obj = self.__objects.pop(key, None)
+        if obj is None:
+            return None
+
+        if type(obj) in RECORD_TYPES:
+            class_name = key.split(".", 1)[0]
+            self.__records_by_class[class_name] -= 1
+        else:
+            class_name = obj.__class__.__name__
+        self.__objects_by_class[class_name].pop(key, None)
+
+        by_parent = self.__objects_by_parent[class_name]
+        for foreign_key, parent_id in self.__indexed_parents.pop(key, ()):
+            children = by_parent[foreign_key].get(parent_id, {})
+            children.pop(key, None)
+            if not children:
+                by_parent[foreign_key].pop(parent_id, None)
+
+        return obj
+
+    def _hydrate(self, key):
+        """
+        Builds the object of a record and stores it in place of the
+        record everywhere the record is indexed.
+
+        Parameters:
+            key (str): the storage key of the object
+
+        Returns:
+            BaseModel: The object, or None if it was removed meanwhile.
+        """
+        with LOCK:
+            obj = self.__objects.get(key)
+            if type(obj) not in RECORD_TYPES:
+                return obj
+
+            obj = hydrate(self.text(obj))
+            class_name = key.split(".", 1)[0]
+            self.__objects[key] = obj
+            self.__objects_by_class[class_name][key] = obj
+            by_parent = self.__objects_by_parent[class_name]
+            for foreign_key, parent_id in self.__indexed_parents.get(key, ()):
+                by_parent[foreign_key][parent_id][key] = obj
+            self.__records_by_class[class_name] -= 1
+
+            return obj
+
+    def _hydrate_class(self, class_name):
+        """
+        Builds the objects of every record of a class.
+
+        Parameters:
+            class_name (str): the name of the class
+        """
+        with LOCK:
+            for key, obj in list(self.__objects_by_class[class_name].items()):
+                if type(obj) in RECORD_TYPES:
+                    self._hydrate(key)
+
+
+class MappedIndexes:
+    """
+    MappedIndexes class represents the objects of a mapped file, see
+    the mapped module, under a delta layer: the ObjectIndexes of the
+    objects of the process, the ones it read, built from their text in
+    the map, and the ones it added, along with the keys of the objects
+    of the map it removed.
+
+    The map is shared with every process mapping the same file and is
+    never written: an object is read from it only while its key is
+    neither in the delta nor removed. Objects read once are kept in the
+    delta, so reading an object twice returns the same instance, and
+    save() finds the changes made to it. count() and items() build no
+    object.
+
+    It offers the interface of ObjectIndexes. Like it, the writers are
+    serialized by the shared lock, and objects are built under it.
+    """
+
+    def __init__(self, mapped_file=None, delta=None):
+        """
+        Initialize the indexes.
+
+        Parameters:
+            mapped_file (MappedFile, optional): the mapped file, none for
+                an empty map
+            delta (ObjectIndexes, optional): the objects of the process,
+                all of them stored in the mapped file. Defaults to
+                empty indexes.
+        """
+        self.__map = mapped_file
+        self.__delta = ObjectIndexes() if delta is None else delta
+        self.__removed = {class_name: set() for class_name in CLASSES}
+        self.__added = {class_name: set() for class_name in CLASSES}
+
+    def remap(self, mapped_file):
+        """
+        Returns indexes reading a new mapped file, holding every object
+        of these indexes, such as the one saved from them. The objects
+        already built are kept, the others are read from the new map.
+
+        Parameters:
+            mapped_file (MappedFile): the new mapped file
+
+        Returns:
+            MappedIndexes: The new indexes.
+        """
+        return MappedIndexes(mapped_file, self.__delta)
+
+    def set_source(self, source):
+        """Does nothing: the objects are read from the mapped file"""
+
+    def text(self, record):
+        """
+        Returns the JSON text of a record, see items().
+
+        Parameters:
+            record (str): the record
+
+        Returns:
+            str: The JSON text, the record itself.
+        """
+        return record
+
+    def get(self, key):
+        """
+        Returns the object stored under a key.
+
+        Parameters:
+            key (str): the storage key of the object (<class name>.<id>)
+
+        Returns:
+            BaseModel: The object, or None if not found.
+        """
+        obj = self.__delta.get(key)
+        if obj is not None or self.__map is None:
+            return obj
+
+        class_name, _id = key.split(".", 1)
+        if key in self.__removed[class_name]:
+            return None
+
+        index = self.__map.find(class_name, _id)
+        if index is None:
+            return None
+
+        return self._build(key, class_name, self.__map.text(class_name,
+                                                            index))
+
+    def holds(self, key, obj):
+        """
+        Tells whether an object is the one stored under a key, building
+        nothing: the objects of the map are only ever changed once built,
+        in the delta.
+
+        Parameters:
+            key (str): the storage key of the object (<class name>.<id>)
+            obj (BaseModel): the object
+
+        Returns:
+            bool: True if `obj` itself is stored under `key`.
+        """
+        return self.__delta.holds(key, obj)
+
+    def all(self, class_name=None):
+        """
+        Returns a copy of the objects of a class, or of every object,
+        building the ones of the map not read yet.
+
+        Parameters:
+            class_name (str, optional): the name of the class
+
+        Returns:
+            dict[str, BaseModel]: The objects by key.
+        """
+        if class_name is None:
+            for name in CLASSES:
+                self._build_class(name)
+            return self.__delta.all()
+
+        self._build_class(class_name)
+        return self.__delta.all(class_name)
+
+    def count(self, class_name):
+        """
+        Returns the number of objects of a class.
+
+        Parameters:
+            class_name (str): the name of the class
+
+        Returns:
+            int: The number of objects.
+        """
+        with LOCK:
+            return (self.__map.count(class_name) if self.__map else 0) - \
+                len(self.__removed[class_name]) + \
+                len(self.__added[class_name])
+
+    def children(self, class_name, foreign_key, parent_id):
+        """
+        Returns a copy of the objects of a class referencing a parent,
+        building the ones of the map not read yet.
+
+        Parameters:
+            class_name (str): the name of the child class
+            foreign_key (str): the foreign key attribute name
+            parent_id (str): the ID of the parent object
+
+        Returns:
+            dict[str, BaseModel]: The objects by key.
+        """
+        children = self.__delta.children(class_name, foreign_key, parent_id)
+        if self.__map is None or type(parent_id) is not str:
+            return children
+
+        removed = self.__removed[class_name]
+        for index in self.__map.children(class_name, foreign_key,
+                                         parent_id):
+            key = "{}.{}".format(class_name,
+                                 self.__map.id(class_name, index))
+            if key in children or key in removed:
+                continue
+
+            # An object of the delta is only a child if it still
+            # references the parent
+            obj = self.__delta.get(key)
+            if obj is None:
+                obj = self._build(key, class_name,
+                                  self.__map.text(class_name, index))
+            if obj is not None and references_parent(
+                    getattr(obj, foreign_key, None), parent_id):
+                children[key] = obj
+
+        return children
+
+    def child_keys(self, class_name, foreign_key, parent_id):
+        """
+        Returns the keys of the objects of a class referencing a parent,
+        building none of them.
+
+        Parameters:
+            class_name (str): the name of the child class
+            foreign_key (str): the foreign key attribute name
+            parent_id (str): the ID of the parent object
+
+        Returns:
+            set[str]: The keys.
+        """
+        keys = self.__delta.child_keys(class_name, foreign_key, parent_id)
+        if self.__map is None or type(parent_id) is not str:
+            return keys
+
+        removed = self.__removed[class_name]
+        for index in self.__map.children(class_name, foreign_key,
+                                         parent_id):
+            key = "{}.{}".format(class_name,
+                                 self.__map.id(class_name, index))
+            if key in keys or key in removed:
+                continue
+
+            # An object of the delta is only a child if it still
+            # references the parent
+            obj = self.__delta.get(key)
+            if obj is None or references_parent(
+                    getattr(obj, foreign_key, None), parent_id):
+                keys.add(key)
+
+        return keys
+
+    def add(self, key, obj):
+        """
+        Registers an object in the delta, in place of the object of the
+        map stored under the same key, if any.
+
+        Parameters:
+            key (str): the storage key of the object (<class name>.<id>)
+            obj (BaseModel): the object to register
+        """
+        class_name, _id = key.split(".", 1)
+        with LOCK:
+            self.__delta.add(key, obj)
+            self.__removed[class_name].discard(key)
+            if key not in self.__added[class_name] and (
+                    self.__map is None or
+                    self.__map.find(class_name, _id) is None):
+                self.__added[class_name].add(key)
+
+    def remove(self, key):
+        """
+        Removes an object from the delta, and hides the object of the map
+        stored under the same key, if any.
+
+        Parameters:
+            key (str): the storage key of the object (<class name>.<id>)
+
+        Returns:
+            BaseModel: The removed object, its JSON text if it was not
+            read yet, or None if not found.
+        """
+        class_name, _id = key.split(".", 1)
+        with LOCK:
+            obj = self.__delta.remove(key)
+            if key in self.__added[class_name]:
+                self.__added[class_name].discard(key)
+                return obj
+
+            if self.__map is None or key in self.__removed[class_name]:
+                return obj
+
+            index = self.__map.find(class_name, _id)
+            if index is not None:
+                self.__removed[class_name].add(key)
+                if obj is None:
+                    obj = self.__map.text(class_name, index)
+
+            return obj
+
+    def items(self, class_name):
+        """
+        Returns the (key, object) pairs of a class, the objects of the
+        map not read yet being their JSON text, see text().
+
+        Parameters:
+            class_name (str): the name of the class
+
+        Returns:
+            generator: The (key, object) pairs.
+        """
+        with LOCK:
+            objects = self.__delta.all(class_name)
+            removed = self.__removed[class_name].copy()
+
+        yield from objects.items()
+        if self.__map is None:
+            return
+
+        for _id, text in self.__map.entries(class_name):
+            key = "{}.{}".format(class_name, _id)
+            if key not in objects and key not in removed:
+                yield key, text
+
+    def _build(self, key, class_name, text):
+        """
+        Builds an object of the map and adds it to the delta, unless it
+        was added or removed meanwhile.
+
+        Parameters:
+            key (str): the storage key of the object
+            class_name (str): the name of the class
+            text (str): the JSON text of the object in the map
+
+        Returns:
+            BaseModel: The object of the delta, or None if it was
+            removed meanwhile.
+        """
+        obj = hydrate(text)
+        with LOCK:
+            current = self.__delta.get(key)
+            if current is not None or key in self.__removed[class_name]:
+                return current
+
+            self.__delta.add(key, obj)
+            return obj
+
+    def _build_class(self, class_name):
+        """
+        Builds the objects of a class not read from the map yet.
+
+        Parameters:
+            class_name (str): the name of the class
+        """
+        if self.__map is None:
+            return
+
+        with LOCK:
+            read = self.__delta.count(class_name) - \
+                len(self.__added[class_name])
+            if read == self.__map.count(class_name) - \
+                    len(self.__removed[class_name]):
+                return
+            objects = self.__delta.all(class_name)
+            removed = self.__removed[class_name].copy()
+
+        for _id, text in self.__map.entries(class_name):
+            key = "{}.{}".format(class_name, _id)
+            if key not in objects and key not in removed:
+                self._build(key, class_name, text)
@@ -0,0 +1,364 @@
+#!/usr/bin/python3
+"""
+Journal Module
+
+This module defines the Journal class, an append-only log of the
+changes made to a FileStorage since its last snapshot.
+
+Each line of the log is a JSON record:
+    {"key": "<class name>.<id>", "value": <object dict or null>}
+where a null value means the object was deleted. The records of a
+storage shared by several processes also hold the sequence number of
+the save that wrote them, `"seq": <int>`, so each process can read only
+the records saved since the last one it applied, see changes_since().
+
+Once the log grows past a size threshold it is rotated and folded into
+a new snapshot by a background thread, so appending stays cheap no
+matter how big the snapshot is. The process compacting writes its id
+next to the rotated log, so a rotated log left behind by a process that
+exited mid-compaction is folded by the next append instead of blocking
+every later compaction.
+
+Classes:
+    - Journal: Appends, replays and compacts a FileStorage change log.
+"""
+
+import glob
+import json
+import os
+import threading
+
+from models.engine.snapshots import group_by_class
+
+
+class Journal:
+    """
+    Journal class represents the append-only change log of a snapshot file.
+    """
+
+    MAX_SIZE = 4 * 1024 * 1024
+
+    def __init__(self, snapshot, max_size=None):
+        """
+        Initialize the Journal instance.
+
+        Parameters:
+            snapshot (JSONSnapshot): The snapshot the log applies to.
+            max_size (int, optional): The log size in bytes that
+                triggers a compaction. Defaults to `Journal.MAX_SIZE`.
+        """
+        self.__snapshot = snapshot
+        self.__log_path = "{}.log".format(snapshot.path)
+        self.__rotated_log_path = "{}.log.1".format(snapshot.path)
+        self.__owner_path = "{}.pid".format(self.__rotated_log_path)
+        self.__max_size = max_size or self.MAX_SIZE
+        self.__lock = threading.Lock()
+        self.__compaction = None
+        self.__recovered = False
+        self.__tail = None
+
+    def append(self, records, sequence=None):
+        """
+        Appends change records to the log and starts a compaction
+        when the log passes its size threshold.
+
+        Parameters:
+            records (dict[str, str | None]): The JSON encoding of the
+                changed objects by key, None for deleted objects.
+            sequence (int, optional): The sequence number of the save,
+                written in each record.
+        """
+        if not records:
+            return
+
+        prefix = "{"
+        if sequence is not None:
+            prefix = '{{"seq": {}, '.format(sequence)
+        lines = "".join(
+            '{}"key": {}, "value": {}}}\n'.format(
+                prefix, json.dumps(key), "null" if value is None else value)
+            for key, value in records.items()
+        )
+
+        with self.__lock:
+            if not self.__recovered:
+                self._recover()
+
+            with open(self.__log_path, "a") as file:
+                file.write(lines)
+                file.flush()
+                os.fsync(file.fileno())
+
+            if os.path.getsize(self.__log_path) >= self.__max_size:
+                self._start_compaction()
+
+    def replay(self, dictionaries):
+        """
+        Applies the logged changes on top of snapshot dictionaries.
+
+        The rotated log, left behind by a compaction that did not
+        finish, is replayed before the active one. Replaying it over a
+        snapshot that already contains it is harmless.
+
+        Parameters:
+            dictionaries (dict[str, dict]): The snapshot object
+                dictionaries by key, updated in place.
+
+        Returns:
+            dict[str, dict]: The updated dictionaries.
+        """
+        for key, value in self.changes().items():
+            if value is None:
+                dictionaries.pop(key, None)
+            else:
+                dictionaries[key] = value
+
+        return dictionaries
+
+    def changes(self):
+        """
+        Returns the logged changes, the last one of each object winning.
+
+        Returns:
+            dict[str, dict | None]: The object dictionaries by key,
+            None for deleted objects.
+        """
+        changes = {}
+        for path in (self.__rotated_log_path, self.__log_path):
+            changes.update(self._read_records(path))
+
+        return changes
+
+    def mark_tail(self):
+        """
+        Marks the end of the active log as the point changes_since()
+        reads from next, as the changes up to it are about to be read
+        another way, by a full reload.
+        """
+        try:
+            stat = os.stat(self.__log_path)
+        except OSError:
+            self.__tail = None
+        else:
+            self.__tail = (stat.st_ino, stat.st_size)
+
+    def changes_since(self, sequence):
+        """
+        Returns the changes logged after a sequence number, the last one
+        of each object winning.
+
+        The logs are read from where the previous call, or mark_tail(),
+        stopped, as long as that file is still a log, and the records
+        up to the sequence number are skipped.
+
+        Parameters:
+            sequence (int): The sequence number of the last save applied.
+
+        Returns:
+            tuple[dict[str, dict | None], int]: The object dictionaries
+            by key, None for deleted objects, and the sequence number of
+            the last save read, or None if some records after the
+            sequence number can't be read anymore: folded into the
+            snapshot by a compaction, or written without a number.
+        """
+        tail = self.__tail
+        logs = []
+        for path in (self.__rotated_log_path, self.__log_path):
+            try:
+                logs.append((path, os.stat(path).st_ino))
+            except OSError:
+                continue
+
+        # The logs before the one the tail is in were read already
+        inodes = [inode for _, inode in logs]
+        if tail and tail[0] in inodes:
+            logs = logs[inodes.index(tail[0]):]
+
+        changes = {}
+        first = last = None
+        for path, inode in logs:
+            offset = tail[1] if tail and tail[0] == inode else 0
+            try:
+                with open(path, "rb") as file:
+                    if os.fstat(file.fileno()).st_ino != inode:
+                        return None
+                    file.seek(offset)
+                    data = file.read()
+            except OSError:
+                return None
+
+            # A last line without its newline is still being written
+            size = data.rfind(b"\n") + 1
+            for line in data[:size].splitlines():
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                record_sequence = record.get("seq")
+                if record_sequence is None:
+                    return None
+                if record_sequence <= sequence:
+                    continue
+                if first is None:
+                    first = record_sequence
+                last = record_sequence
+                changes[record["key"]] = record["value"]
+            tail = (inode, offset + size)
+
+        if first is not None and first != sequence + 1:
+            return None
+
+        self.__tail = tail
+        return changes, sequence if last is None else last
+
+    def log_paths(self):
+        """Returns the rotated and the active log paths, in replay order"""
+        return self.__rotated_log_path, self.__log_path
+
+    def exists(self):
+        """Returns True if there are logged changes on disk"""
+        return (os.path.isfile(self.__log_path) or
+                os.path.isfile(self.__rotated_log_path))
+
+    def clear(self):
+        """
+        Removes the logs once a full snapshot has been written.
+        """
+        self.wait()
+
+        with self.__lock:
+            for path in (self.__rotated_log_path, self.__owner_path,
+                         self.__log_path):
+                if os.path.isfile(path):
+                    os.remove(path)
+
+    def wait(self):
+        """Blocks until the running compaction, if any, is done"""
+        compaction = self.__compaction
+        if compaction:
+            compaction.join()
+
+    def _start_compaction(self):
+        """
+        Rotates the active log and folds it into the snapshot in
+        a background thread. Does nothing if a compaction is running.
+        Must be called with the lock held.
+        """
+        if self.__compaction and self.__compaction.is_alive():
+            return
+
+        if os.path.isfile(self.__rotated_log_path):
+            self._recover()
+            if os.path.isfile(self.__rotated_log_path):
+                return
+
+        with open(self.__owner_path, "w") as file:
+            file.write(str(os.getpid()))
+        os.replace(self.__log_path, self.__rotated_log_path)
+        self.__compaction = threading.Thread(
+            target=self._compact, daemon=True
+        )
+        self.__compaction.start()
+
+    def _compact(self):
+        """
+        Writes a new snapshot from the current snapshot and the rotated
+        log, then removes the rotated log.
+        """
+        dictionaries = self.__snapshot.load()
+
+        changed_classes = set()
+        for key, value in self._read_records(self.__rotated_log_path):
+            changed_classes.add(key.split(".", 1)[0])
+            if value is None:
+                dictionaries.pop(key, None)
+            else:
+                dictionaries[key] = value
+
+        self.__snapshot.dump({
+            class_name: self.__snapshot.encode_dictionaries(
+                class_dictionaries)
+            for class_name, class_dictionaries
+            in group_by_class(dictionaries).items()
+        }, changed_classes)
+        os.remove(self.__rotated_log_path)
+        if os.path.isfile(self.__owner_path):
+            os.remove(self.__owner_path)
+
+    def _recover(self):
+        """
+        Folds the rotated log into the snapshot if the compaction that
+        rotated it is not running anymore, and removes the temporary
+        files the dead processes left next to the snapshot. Must be
+        called with the lock held.
+        """
+        self.__recovered = True
+        if self.__compaction and self.__compaction.is_alive():
+            return
+
+        for path in self.__snapshot.paths():
+            for tmp_path in glob.glob("{}.*.tmp".format(glob.escape(path))):
+                pid = tmp_path[len(path) + 1:].split(".", 1)[0]
+                if pid.isdigit() and not self._is_running(int(pid)):
+                    os.remove(tmp_path)
+
+        if not os.path.isfile(self.__rotated_log_path):
+            return
+
+        try:
+            with open(self.__owner_path, "r") as file:
+                owner = int(file.read())
+        except (OSError, ValueError):
+            owner = None
+        if owner is not None and owner != os.getpid() and \
+                self._is_running(owner):
+            return
+
+        self._compact()
+
+    @staticmethod
+    def _is_running(pid):
+        """
+        Returns True if a process is running.
+
+        Parameters:
+            pid (int): The process id.
+        """
+        if pid == os.getpid():
+            return True
+
+        try:
+            os.kill(pid, 0)
+        except ProcessLookupError:
+            return False
+        except PermissionError:
+            pass
+
+        return True
+
+    @staticmethod
+    def _read_records(path):
+        """
+        Reads the records of a log file.
+
+        A truncated last line, left by a crash during an append, is ignored.
+
+        Parameters:
+            path (str): The log file path.
+
+        Returns:
+            list[tuple[str, dict | None]]: The (key, value) records.
+        """
+        if not os.path.isfile(path):
+            return []
+
+        records = []
+        with open(path, "r") as file:
+            for line in file:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                records.append((record["key"], record["value"]))
+
+        return records
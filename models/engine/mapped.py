@@ -0,0 +1,314 @@
+#!/usr/bin/python3
+"""
+Mapped Module
+
+This module defines the mapped binary layout of a FileStorage snapshot:
+a file memory-mapped read-only, so the worker processes reading it share
+the one copy of it held by the page cache, and find an object in it
+without loading the rest.
+
+A mapped file is laid out as:
+
+    <MAGIC> <strings> <tables> <header: JSON> <header offset: uint64>
+
+The strings are the UTF-8 JSON text of each object, its id and the ids
+of its parents, each parent id written once. The header, found from the
+offset ending the file, gives for each class the offset and number of
+entries of its tables:
+
+    - keys: one entry per object, `<id offset, id size, text offset,
+      text size>` (uint64, uint32, uint64, uint32), sorted by id, so
+      an object is found by a binary search.
+    - parents, one table per foreign key: one entry per object with
+      that foreign key set, `<parent id offset, parent id size,
+      key index>` (uint64, uint32, uint32), sorted by parent id, then
+      by the index of the object in the keys table.
+
+Numbers are little-endian, ids are compared as UTF-8 bytes. The strings
+are encoded like the strings of a packed file, see encode_text().
+
+Classes:
+    - MappedFile: A mapped file opened for reading.
+
+Functions:
+    - map_chunks: Encodes objects into a mapped file, piece by piece.
+"""
+
+import json
+import mmap
+import struct
+
+from models.engine.packed import decode_text, encode_text
+
+MAGIC = b"HBNBMM1\n"
+KEY = struct.Struct("<QIQI")
+PARENT = struct.Struct("<QII")
+STRING = struct.Struct("<QI")
+OFFSET = struct.Struct("<Q")
+
+
+def map_chunks(encoded_by_class):
+    """
+    Encodes objects into the content of a mapped file. The strings are
+    produced as the objects are read, the tables once they are all read.
+
+    Parameters:
+        encoded_by_class (dict[str, iterable[tuple[str, tuple]]]): The
+            (key, (JSON text, parents)) pairs of the objects, by class
+            name, the parents being the (foreign key, parent id) pairs
+            of the object.
+
+    Returns:
+        generator: The content of the file, piece by piece (bytes).
+    """
+    yield MAGIC
+    offset = len(MAGIC)
+    parent_ids = {}
+    keys_by_class = {}
+
+    for class_name, encoded_objects in encoded_by_class.items():
+        keys = keys_by_class[class_name] = []
+        for key, (text, parents) in encoded_objects:
+            _id = encode_text(key.split(".", 1)[1])
+            data = encode_text(text)
+            yield _id
+            yield data
+            references = []
+            keys.append((_id, offset, offset + len(_id), len(data),
+                         references))
+            offset += len(_id) + len(data)
+
+            for foreign_key, parent_id in parents:
+                parent_id = encode_text(parent_id)
+                if parent_id not in parent_ids:
+                    parent_ids[parent_id] = offset
+                    yield parent_id
+                    offset += len(parent_id)
+                references.append((foreign_key, parent_id))
+
+    header = {}
+    for class_name, keys in keys_by_class.items():
+        keys.sort(key=lambda entry: entry[0])
+        table = b"".join(
+            KEY.pack(id_offset, len(_id), text_offset, text_size)
+            for _id, id_offset, text_offset, text_size, _ in keys
+        )
+        header[class_name] = {"keys": [offset, len(keys)], "parents": {}}
+        yield table
+        offset += len(table)
+
+        references_by_key = {}
+        for index, entry in enumerate(keys):
+            for foreign_key, parent_id in entry[4]:
+                references_by_key.setdefault(foreign_key, []).append(
+                    (parent_id, index))
+
+        for foreign_key, references in references_by_key.items():
+            references.sort()
+            table = b"".join(
+                PARENT.pack(parent_ids[parent_id], len(parent_id), index)
+                for parent_id, index in references
+            )
+            header[class_name]["parents"][foreign_key] = \
+                [offset, len(references)]
+            yield table
+            offset += len(table)
+
+    yield json.dumps(header).encode()
+    yield OFFSET.pack(offset)
+
+
+class MappedFile:
+    """
+    MappedFile class represents a mapped file opened for reading,
+    see the module for the layout.
+
+    The map is read-only and never changes, so it is safe to read from
+    several threads. It is unmapped once no one references it anymore.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize the MappedFile instance, mapping the file.
+
+        Parameters:
+            path (str): The mapped file path.
+
+        Raises:
+            OSError: If the file can't be opened.
+            ValueError: If the file is not a valid mapped file.
+        """
+        self.path = path
+        with open(path, "rb") as file:
+            self.__map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        data = self.__map
+        end = len(data) - OFFSET.size
+        if end < len(MAGIC) or data[:len(MAGIC)] != MAGIC:
+            raise ValueError("{} is not a mapped snapshot".format(path))
+
+        (header_offset,) = OFFSET.unpack_from(data, end)
+        try:
+            header = json.loads(data[header_offset:end])
+        except (UnicodeDecodeError, json.JSONDecodeError) as error:
+            raise ValueError("{} is corrupted: {}".format(path, error))
+
+        self.__keys = {
+            class_name: tuple(tables["keys"])
+            for class_name, tables in header.items()
+        }
+        self.__parents = {
+            (class_name, foreign_key): tuple(table)
+            for class_name, tables in header.items()
+            for foreign_key, table in tables["parents"].items()
+        }
+
+    def count(self, class_name):
+        """
+        Returns the number of objects of a class.
+
+        Parameters:
+            class_name (str): the name of the class
+
+        Returns:
+            int: The number of objects.
+        """
+        return self.__keys.get(class_name, (0, 0))[1]
+
+    def find(self, class_name, _id):
+        """
+        Finds an object by a binary search of the keys of its class.
+
+        Parameters:
+            class_name (str): the name of the class
+            _id (str): the ID of the object
+
+        Returns:
+            int: The index of the object in the keys of its class,
+            None if not found.
+        """
+        table = self.__keys.get(class_name)
+        if not table:
+            return None
+
+        target = encode_text(_id)
+        index = self._lower_bound(table, KEY.size, target)
+        if index < table[1] and self._string(table, KEY.size,
+                                             index) == target:
+            return index
+
+        return None
+
+    def id(self, class_name, index):
+        """
+        Returns the ID of an object.
+
+        Parameters:
+            class_name (str): the name of the class
+            index (int): the index of the object in the keys of its class
+
+        Returns:
+            str: The ID.
+        """
+        return decode_text(self._string(self.__keys[class_name], KEY.size,
+                                        index))
+
+    def text(self, class_name, index):
+        """
+        Returns the JSON text of an object.
+
+        Parameters:
+            class_name (str): the name of the class
+            index (int): the index of the object in the keys of its class
+
+        Returns:
+            str: The JSON text.
+        """
+        offset = self.__keys[class_name][0] + index * KEY.size
+        _, _, text_offset, text_size = KEY.unpack_from(self.__map, offset)
+        return decode_text(self.__map[text_offset:text_offset + text_size])
+
+    def entries(self, class_name):
+        """
+        Reads the objects of a class, in the order of their IDs.
+
+        Parameters:
+            class_name (str): the name of the class
+
+        Returns:
+            generator: The (ID, JSON text) pairs.
+        """
+        data = self.__map
+        offset, count = self.__keys.get(class_name, (0, 0))
+        for id_offset, id_size, text_offset, text_size in \
+                KEY.iter_unpack(data[offset:offset + count * KEY.size]):
+            yield (decode_text(data[id_offset:id_offset + id_size]),
+                   decode_text(data[text_offset:text_offset + text_size]))
+
+    def children(self, class_name, foreign_key, parent_id):
+        """
+        Finds the objects of a class referencing a parent.
+
+        Parameters:
+            class_name (str): the name of the child class
+            foreign_key (str): the foreign key attribute name
+            parent_id (str): the ID of the parent object
+
+        Returns:
+            list[int]: The indexes of the objects in the keys of
+            their class.
+        """
+        table = self.__parents.get((class_name, foreign_key))
+        if not table:
+            return []
+
+        target = encode_text(parent_id)
+        indexes = []
+        index = self._lower_bound(table, PARENT.size, target)
+        while index < table[1] and \
+                self._string(table, PARENT.size, index) == target:
+            indexes.append(PARENT.unpack_from(
+                self.__map, table[0] + index * PARENT.size)[2])
+            index += 1
+
+        return indexes
+
+    def _string(self, table, entry_size, index):
+        """
+        Returns the string an entry of a table starts with, the id of a
+        key or the parent id of a parent entry.
+
+        Parameters:
+            table (tuple[int, int]): the offset and size of the table
+            entry_size (int): the size of an entry
+            index (int): the index of the entry
+
+        Returns:
+            bytes: The string.
+        """
+        offset, size = STRING.unpack_from(
+            self.__map, table[0] + index * entry_size)
+        return self.__map[offset:offset + size]
+
+    def _lower_bound(self, table, entry_size, target):
+        """
+        Returns the index of the first entry of a table whose string,
+        see _string(), is not lower than a target.
+
+        Parameters:
+            table (tuple[int, int]): the offset and size of the table
+            entry_size (int): the size of an entry
+            target (bytes): the string searched
+
+        Returns:
+            int: The index, the size of the table if there is none.
+        """
+        low, high = 0, table[1]
+        while low < high:
+            middle = (low + high) // 2
+            if self._string(table, entry_size, middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+
+        return low
@@ -0,0 +1,332 @@
+#!/usr/bin/python3
+"""
+Packed Module
+
+This module defines the packed binary encoding of a FileStorage snapshot.
+
+A packed file starts with `MAGIC`, followed by one block per class:
+
+    <header size: uint32> <header: JSON> <column data>...
+
+The header holds the class name, the number of records and, for each
+attribute, its name, kind, number of values and data size, so each
+attribute name is written once per class instead of once per record.
+The columns follow in header order. A column holding a value for only
+some records starts with one presence byte per record. Then come the
+values, encoded by kind:
+
+    - uuid: canonical UUID strings, 16 bytes each.
+    - time: ISO timestamps as written by `datetime.isoformat()`
+      without a timezone, microseconds since 1970 (int64).
+    - int, float: int64 and float64 numbers.
+    - str: the UTF-8 text of every value, followed by the length of
+      each value in characters (uint32). Lone surrogates, which JSON
+      allows, are written as their 3-byte sequence ("surrogatepass").
+    - uuids: lists of UUID strings, each list length (uint32) followed
+      by every UUID, 16 bytes each.
+    - json: any other value, as a str column of JSON texts.
+
+Numbers are little-endian. The storage key of each record is rebuilt
+from its class name and id, and its `__class__` from the class name.
+
+Functions:
+    - pack_records: Encodes the records of a class into a block.
+    - unpack_records: Decodes the records of a block.
+    - encode_text, decode_text: The UTF-8 encoding of the strings,
+      lone surrogates included.
+"""
+
+import json
+import re
+import struct
+import sys
+from array import array
+from datetime import datetime, timedelta
+
+MAGIC = b"HBNBPK1\n"
+HEADER_SIZE = struct.Struct("<I")
+EPOCH = datetime(1970, 1, 1)
+MICROSECOND = timedelta(microseconds=1)
+UUID = re.compile(
+    r"[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}\Z"
+)
+TIMESTAMP = re.compile(
+    r"\d{4}-\d\d-\d\dT\d\d:\d\d:\d\d(\.(?!0{6})\d{6})?\Z"
+)
+INT64_MIN, INT64_MAX = -2 ** 63, 2 ** 63 - 1
+MISSING = object()
+
+
+def pack_records(class_name, records):
+    """
+    Encodes the records of a class into a packed block.
+
+    Parameters:
+        class_name (str): The name of the class.
+        records (list[dict]): The `to_dict()` records of the objects.
+
+    Returns:
+        bytes: The block.
+    """
+    names = {}
+    for record in records:
+        names.update(dict.fromkeys(record))
+    names.pop("__class__", None)
+
+    columns = []
+    blobs = []
+    for name in names:
+        values = [record.get(name, MISSING) for record in records]
+        present = [value for value in values if value is not MISSING]
+        kind = column_kind(present)
+        try:
+            blob = PACKERS[kind](present)
+        except ValueError:
+            # Timestamp-like strings that are not valid dates
+            kind = "str"
+            blob = PACKERS[kind](present)
+        if len(present) < len(values):
+            blob = bytes(value is not MISSING for value in values) + blob
+
+        columns.append([name, kind, len(present), len(blob)])
+        blobs.append(blob)
+
+    header = json.dumps({
+        "class": class_name, "count": len(records), "columns": columns
+    }).encode()
+
+    return b"".join([HEADER_SIZE.pack(len(header)), header] + blobs)
+
+
+def unpack_records(data, offset):
+    """
+    Decodes the packed block starting at an offset.
+
+    Parameters:
+        data (bytes): The packed file content.
+        offset (int): The offset of the block.
+
+    Returns:
+        tuple[list[tuple[str, dict]], int]: The (key, record) pairs of
+        the block and the offset of the next block.
+    """
+    (header_size,) = HEADER_SIZE.unpack_from(data, offset)
+    offset += HEADER_SIZE.size
+    header = json.loads(data[offset:offset + header_size])
+    offset += header_size
+
+    class_name = header["class"]
+    count = header["count"]
+    names = []
+    columns = []
+    partial = []
+    for name, kind, present, size in header["columns"]:
+        blob = memoryview(data)[offset:offset + size]
+        offset += size
+
+        presence = None
+        if present < count:
+            presence = blob[:count]
+            blob = blob[count:]
+        values = UNPACKERS[kind](blob, present)
+
+        if presence is not None:
+            values = iter(values)
+            values = [next(values) if flag else MISSING
+                      for flag in presence]
+            partial.append(name)
+
+        names.append(name)
+        columns.append(values)
+
+    names.append("__class__")
+    columns.append([class_name] * count)
+
+    records = [dict(zip(names, row)) for row in zip(*columns)]
+    for name in partial:
+        for record in records:
+            if record[name] is MISSING:
+                del record[name]
+
+    return [
+        ("{}.{}".format(class_name, record.get("id")), record)
+        for record in records
+    ], offset
+
+
+def column_kind(values):
+    """
+    Chooses the most compact kind able to hold every value of a column.
+
+    Parameters:
+        values (list): The values of the column.
+
+    Returns:
+        str: The column kind.
+    """
+    types = set(map(type, values))
+    if types == {str}:
+        if all(UUID.match(value) for value in values):
+            return "uuid"
+        if all(TIMESTAMP.match(value) for value in values):
+            return "time"
+        return "str"
+
+    if types == {int}:
+        if all(INT64_MIN <= value <= INT64_MAX for value in values):
+            return "int"
+    elif types == {float}:
+        return "float"
+    elif types == {list}:
+        if all(type(item) is str and UUID.match(item)
+               for value in values for item in value):
+            return "uuids"
+
+    return "json"
+
+
+def numbers(typecode, values):
+    """Returns the little-endian bytes of an array of numbers"""
+    numbers_array = array(typecode, values)
+    if sys.byteorder == "big":
+        numbers_array.byteswap()
+
+    return numbers_array.tobytes()
+
+
+def from_numbers(typecode, blob):
+    """Returns the numbers of little-endian bytes as a list"""
+    numbers_array = array(typecode)
+    numbers_array.frombytes(blob)
+    if sys.byteorder == "big":
+        numbers_array.byteswap()
+
+    return numbers_array.tolist()
+
+
+def pack_uuids(values):
+    """Packs UUID strings, 16 bytes each"""
+    return bytes.fromhex("".join(values).replace("-", ""))
+
+
+def unpack_uuids(blob, count):
+    """Unpacks UUID strings"""
+    text = blob.hex()
+    return [
+        text[i:i + 8] + "-" + text[i + 8:i + 12] + "-" +
+        text[i + 12:i + 16] + "-" + text[i + 16:i + 20] + "-" +
+        text[i + 20:i + 32]
+        for i in range(0, count * 32, 32)
+    ]
+
+
+def pack_times(values):
+    """Packs ISO timestamps as microseconds since 1970"""
+    return numbers("q", [
+        (datetime.fromisoformat(value) - EPOCH) // MICROSECOND
+        for value in values
+    ])
+
+
+def unpack_times(blob, count):
+    """Unpacks ISO timestamps, decoding each distinct time once"""
+    cache = {}
+    values = []
+    for microseconds in from_numbers("q", blob):
+        value = cache.get(microseconds)
+        if value is None:
+            value = (EPOCH + microseconds * MICROSECOND).isoformat()
+            cache[microseconds] = value
+        values.append(value)
+
+    return values
+
+
+def encode_text(text):
+    """
+    Encodes a string to UTF-8, a lone surrogate, which JSON allows, as
+    its 3-byte sequence instead of raising UnicodeEncodeError.
+
+    Parameters:
+        text (str): The string.
+
+    Returns:
+        bytes: The UTF-8 text.
+    """
+    return text.encode("utf-8", "surrogatepass")
+
+
+def decode_text(data):
+    """
+    Decodes the UTF-8 text written by encode_text().
+
+    Parameters:
+        data (bytes | memoryview): The UTF-8 text.
+
+    Returns:
+        str: The string.
+    """
+    return str(data, "utf-8", "surrogatepass")
+
+
+def pack_strings(values):
+    """Packs strings as their UTF-8 text followed by their lengths"""
+    text = encode_text("".join(values))
+    return text + numbers("I", map(len, values))
+
+
+def unpack_strings(blob, count):
+    """Unpacks strings"""
+    lengths = from_numbers("I", blob[len(blob) - count * 4:])
+    text = decode_text(blob[:len(blob) - count * 4])
+
+    values = []
+    start = 0
+    for length in lengths:
+        values.append(text[start:start + length])
+        start += length
+
+    return values
+
+
+def pack_uuid_lists(values):
+    """Packs lists of UUID strings as their lengths then their UUIDs"""
+    return numbers("I", map(len, values)) + pack_uuids(
+        [item for value in values for item in value]
+    )
+
+
+def unpack_uuid_lists(blob, count):
+    """Unpacks lists of UUID strings"""
+    lengths = from_numbers("I", blob[:count * 4])
+    items = unpack_uuids(blob[count * 4:], sum(lengths))
+
+    values = []
+    start = 0
+    for length in lengths:
+        values.append(items[start:start + length])
+        start += length
+
+    return values
+
+
+PACKERS = {
+    "uuid": pack_uuids,
+    "time": pack_times,
+    "int": lambda values: numbers("q", values),
+    "float": lambda values: numbers("d", values),
+    "str": pack_strings,
+    "uuids": pack_uuid_lists,
+    "json": lambda values: pack_strings(list(map(json.dumps, values))),
+}
+
+UNPACKERS = {
+    "uuid": unpack_uuids,
+    "time": unpack_times,
+    "int": lambda blob, count: from_numbers("q", blob),
+    "float": lambda blob, count: from_numbers("d", blob),
+    "str": unpack_strings,
+    "uuids": unpack_uuid_lists,
+    "json": lambda blob, count: list(
+        map(json.loads, unpack_strings(blob, count))),
+}
@@ -0,0 +1,125 @@
+#!/usr/bin/python3
+"""
+Shared Module
+
+This module defines what lets several processes share the files of a
+FileStorage, such as the workers of the API on one host.
+
+Locking needs the `fcntl` module, only available on Unix.
+
+Classes:
+    - FileLock: An advisory lock serializing the writers of every process.
+    - ChangeCounter: The number of saves made by every process, which
+      each process reads to tell cheaply whether it missed some.
+"""
+
+import os
+import struct
+import threading
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+
+class FileLock:
+    """
+    FileLock class represents an exclusive advisory lock on a file,
+    `flock()`, held by one thread of one process at a time. It is
+    released when its holder exits, even if it crashes.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize the FileLock instance.
+
+        Parameters:
+            path (str): The lock file path, created on first use.
+
+        Raises:
+            ValueError: If file locking is not available.
+        """
+        if fcntl is None:
+            raise ValueError("File locking needs the fcntl module")
+
+        self.path = path
+        self.__lock = threading.Lock()
+        self.__fd = None
+
+    def __enter__(self):
+        """Blocks until the lock is acquired"""
+        self.__lock.acquire()
+        try:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o666)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+            except BaseException:
+                os.close(fd)
+                raise
+        except BaseException:
+            self.__lock.release()
+            raise
+
+        self.__fd = fd
+        return self
+
+    def __exit__(self, *exc_info):
+        """Releases the lock"""
+        fd, self.__fd = self.__fd, None
+        try:
+            fcntl.flock(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+            self.__lock.release()
+
+
+class ChangeCounter:
+    """
+    ChangeCounter class represents the sequence number of the last save
+    made by any process, stored in a file. It must only be written with
+    the FileLock of the files held.
+
+    The file is replaced atomically, never written in place, so a
+    reader never sees a half-written number.
+    """
+
+    FORMAT = struct.Struct("<Q")
+
+    def __init__(self, path):
+        """
+        Initialize the ChangeCounter instance.
+
+        Parameters:
+            path (str): The counter file path.
+        """
+        self.path = path
+
+    def read(self):
+        """
+        Returns:
+            int: The sequence number, 0 if no save was counted yet.
+        """
+        try:
+            with open(self.path, "rb") as file:
+                data = file.read(self.FORMAT.size)
+        except OSError:
+            return 0
+
+        if len(data) != self.FORMAT.size:
+            return 0
+
+        return self.FORMAT.unpack(data)[0]
+
+    def write(self, sequence):
+        """
+        Stores a new sequence number.
+
+        Parameters:
+            sequence (int): The sequence number.
+        """
+        tmp_path = "{}.tmp".format(self.path)
+        with open(tmp_path, "wb") as file:
+            file.write(self.FORMAT.pack(sequence))
+
+        os.replace(tmp_path, self.path)
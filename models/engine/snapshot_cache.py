@@ -0,0 +1,132 @@
+#!/usr/bin/python3
+"""
+Snapshot Cache Module
+
+This module defines the SnapshotCache class, the binary sidecar file a
+FileStorage loads its objects from at startup instead of parsing its
+JSON files, as long as these files are unchanged.
+
+The cache holds the loaded ObjectIndexes, objects included, pickled:
+unpickling them skips the JSON decoding, the building of each object
+and of the indexes. Loading a pickle can run code, so the cache file
+must be as trusted as the directory of the storage files.
+
+A cache file is laid out as:
+
+    <MAGIC> <checksum: 20 bytes> <pickle data>
+
+MAGIC holds the version of the cache layout, to be bumped whenever the
+pickled classes change their attributes.
+
+Classes:
+    - SnapshotCache: A sidecar cache tied to the checksum of files.
+"""
+
+import hashlib
+import os
+import pickle
+import sys
+import tempfile
+
+MAGIC = b"HBNBPC3\n"
+READ_SIZE = 1024 * 1024
+
+
+class SnapshotCache:
+    """
+    SnapshotCache class represents a cached object, valid as long as
+    the checksum of the files it was loaded from is unchanged.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize the SnapshotCache instance.
+
+        Parameters:
+            path (str): The cache file path.
+        """
+        self.path = path
+
+    def checksum(self, paths, sources=()):
+        """
+        Computes the checksum of the content of files.
+
+        Parameters:
+            paths (list[str]): The file paths, missing files included.
+            sources (list[RecordSource], optional): Files already open,
+                read through their descriptor without moving its offset.
+
+        Returns:
+            bytes: The SHA-1 digest of the files, their paths
+            and the Python version.
+        """
+        digest = hashlib.sha1(sys.version.encode())
+        for path in paths:
+            digest.update(b"\0" + path.encode() + b"\0")
+            try:
+                with open(path, "rb") as file:
+                    for chunk in iter(lambda: file.read(READ_SIZE), b""):
+                        digest.update(chunk)
+            except FileNotFoundError:
+                digest.update(b"missing")
+
+        for source in sources:
+            digest.update(b"\0" + source.path.encode() + b"\0")
+            offset = 0
+            while True:
+                chunk = os.pread(source.fileno(), READ_SIZE, offset)
+                if not chunk:
+                    break
+                digest.update(chunk)
+                offset += len(chunk)
+
+        return digest.digest()
+
+    def load(self, checksum):
+        """
+        Loads the cached object if it was cached for a checksum.
+
+        Parameters:
+            checksum (bytes): The current checksum of the files.
+
+        Returns:
+            any: The cached object, or None if the cache is missing,
+            stale or unreadable.
+        """
+        header = MAGIC + checksum
+        try:
+            with open(self.path, "rb") as file:
+                if file.read(len(header)) != header:
+                    return None
+                return pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError,
+                ImportError, IndexError, TypeError, ValueError):
+            return None
+
+    def dump(self, checksum, obj):
+        """
+        Caches an object for a checksum. The file is replaced atomically,
+        so processes dumping at the same time never corrupt it. The cache
+        being an optimization, failing to write it is ignored.
+
+        Parameters:
+            checksum (bytes): The checksum of the files the object
+                was loaded from.
+            obj (any): The object to cache.
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+        except OSError:
+            return
+
+        try:
+            with os.fdopen(fd, "wb") as file:
+                file.write(MAGIC + checksum)
+                pickle.dump(obj, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, self.path)
+        except (OSError, pickle.PicklingError):
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
@@ -0,0 +1,1187 @@
+#!/usr/bin/python3
+"""
+Snapshots Module
+
+This module defines the on-disk layouts a FileStorage snapshot can use.
+
+A snapshot holds the serialized objects, as dictionaries keyed by
+`<class name>.<id>`. It is written from the already encoded JSON text of
+each object, spliced together as it streams to a temporary file that is
+then renamed over the previous one, so readers never see a half-written
+file. It is read back one object at a time by an incremental parser, so
+loading never holds the whole decoded file in memory at once.
+
+A snapshot can be compressed as it streams, see the compression module.
+Each file then gets the suffix of the codec (`file.json.gz`). A file
+written without compression is still read, and replaced by its
+compressed version on the next write.
+
+Classes:
+    - JSONSnapshot: Every object in one JSON file (`file.json`).
+    - PartitionedJSONSnapshot: One JSON file per stored class
+      (`file.User.json`, `file.State.json`, ...).
+    - PackedSnapshot: Every object in one packed binary file
+      (`file.bin`), see the packed module.
+    - MappedSnapshot: Every object in one file read through a memory
+      map (`file.map`), see the mapped module.
+    - RecordSource: A snapshot file kept open to read objects back
+      from their position.
+"""
+
+import io
+import json
+import json.scanner
+import os
+import re
+import struct
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+from models.engine.indexes import FOREIGN_KEYS_BY_CLASS, references
+from models.engine.mapped import MappedFile, map_chunks
+from models.engine.packed import MAGIC, pack_records, unpack_records
+from models.engine.stored_classes import CLASSES
+
+READ_SIZE = 64 * 1024
+WHITESPACE = re.compile(r"[ \t\n\r]*")
+DECODER = json.JSONDecoder()
+SCANNER = json.scanner.make_scanner(DECODER)
+
+
+def group_by_class(dictionaries):
+    """
+    Groups serialized objects by class name.
+
+    Parameters:
+        dictionaries (dict[str, dict]): The serialized objects by key.
+
+    Returns:
+        dict[str, dict[str, dict]]: The serialized objects by key,
+        by class name.
+    """
+    groups = {class_name: {} for class_name in CLASSES.keys()}
+    for key, dictionary in dictionaries.items():
+        groups.setdefault(key.split(".", 1)[0], {})[key] = dictionary
+
+    return groups
+
+
+def open_for_reading(path, compression=None, binary=False):
+    """
+    Opens a file for reading, decompressing it as it is read.
+
+    Parameters:
+        path (str): The file path.
+        compression (Compression, optional): The file compression.
+        binary (bool, optional): If True, the file is read as bytes,
+            otherwise as UTF-8 text.
+
+    Returns:
+        IO: The file object.
+    """
+    stream = compression.reader(path) if compression else open(path, "rb")
+    if not binary:
+        stream = io.TextIOWrapper(stream, encoding="utf-8", newline="")
+
+    return stream
+
+
+def load_json(path, compression=None):
+    """
+    Loads a JSON file.
+
+    Parameters:
+        path (str): The file path.
+        compression (Compression, optional): The file compression.
+
+    Returns:
+        any: The decoded content.
+    """
+    with open_for_reading(path, compression) as file:
+        return json.load(file)
+
+
+def iter_json_object(path, read_size=READ_SIZE, compression=None,
+                     texts=False):
+    """
+    Decodes a JSON object file one member at a time, reading it by
+    chunks, so only the member being decoded is held in memory.
+
+    Parameters:
+        path (str): The file path.
+        read_size (int, optional): The number of characters read at once.
+        compression (Compression, optional): The file compression.
+        texts (bool, optional): If True, the JSON text of each value and
+            its position are returned along with it, see iter_json_file.
+
+    Returns:
+        generator: The (key, value) pairs of the object, or the
+        (key, value, JSON text, position) tuples.
+
+    Raises:
+        OSError, json.JSONDecodeError: If the file can't be read.
+    """
+    with open_for_reading(path, compression) as file:
+        yield from iter_json_file(file, read_size, texts)
+
+
+def iter_json_file(file, read_size=READ_SIZE, texts=False):
+    """
+    Decodes a JSON object one member at a time from an open file,
+    see iter_json_object().
+
+    Parameters:
+        file (TextIO): The file, opened without newline translation.
+        read_size (int, optional): The number of characters read at once.
+        texts (bool, optional): If True, the JSON text of each value is
+            returned along with it, and its position: the offset of the
+            text in the file, None if it may differ from the character
+            offset, after non-ASCII text.
+
+    Returns:
+        generator: The (key, value) pairs of the object, or the
+        (key, value, JSON text, position) tuples.
+
+    Raises:
+        OSError, json.JSONDecodeError: If the file can't be read.
+    """
+    stream = JSONTextStream(file, read_size)
+    stream.expect("{")
+    if stream.peek() == "}":
+        stream.expect("}")
+    else:
+        while True:
+            yield stream.member(texts)
+            if stream.expect(",}") == "}":
+                break
+    stream.expect_end()
+
+
+class JSONTextStream:
+    """
+    JSONTextStream class represents a JSON text read incrementally from
+    a file: the tokens are consumed one by one from a buffer that is
+    refilled as needed.
+    """
+
+    def __init__(self, file, read_size):
+        """
+        Initialize the JSONTextStream instance.
+
+        Parameters:
+            file (TextIO): The file to read.
+            read_size (int): The minimum number of characters read at once.
+        """
+        self.__file = file
+        self.__read_size = read_size
+        self.__buffer = ""
+        self.__pos = 0
+        self.__eof = False
+        self.__offset = 0
+        self.__ascii = True
+
+    def peek(self):
+        """Returns the next non-whitespace character, "" at the end"""
+        self._skip_whitespace()
+        return self.__buffer[self.__pos:self.__pos + 1]
+
+    def expect(self, chars):
+        """
+        Consumes the next non-whitespace character.
+
+        Parameters:
+            chars (str): The characters allowed.
+
+        Returns:
+            str: The consumed character.
+
+        Raises:
+            json.JSONDecodeError: If the character is not allowed.
+        """
+        char = self.__buffer[self.__pos:self.__pos + 1]
+        if char and char in chars:
+            self.__pos += 1
+            return char
+
+        char = self.peek()
+        if not char or char not in chars:
+            raise json.JSONDecodeError(
+                "Expecting one of {!r}".format(chars),
+                self.__buffer, self.__pos)
+
+        self.__pos += 1
+        return char
+
+    def expect_end(self):
+        """
+        Raises:
+            json.JSONDecodeError: If anything but whitespace is left.
+        """
+        if self.peek():
+            raise json.JSONDecodeError(
+                "Extra data", self.__buffer, self.__pos)
+
+    def member(self, text=False):
+        """
+        Decodes the next `"key": value` member of an object.
+
+        The members written by `dump_json_objects()` that are whole in
+        the buffer are decoded by a fast path calling the C scanner
+        directly; anything else goes through decode() and expect().
+
+        Parameters:
+            text (bool, optional): If True, the JSON text of the value
+                and its position are returned too, see position().
+
+        Returns:
+            tuple[str, any]: The decoded key and value, followed by the
+            JSON text of the value and its position if asked for.
+
+        Raises:
+            json.JSONDecodeError: If the member is invalid.
+        """
+        buffer = self.__buffer
+        pos = self.__pos
+        if buffer[pos:pos + 1] == " ":
+            pos += 1
+
+        try:
+            key, end = SCANNER(buffer, pos)
+            if buffer[end:end + 2] == ": ":
+                start = end + 2
+                value, end = SCANNER(buffer, start)
+                if end < len(buffer):
+                    self.__pos = end
+                    if text:
+                        return (key, value, buffer[start:end],
+                                self.position(start))
+                    return key, value
+        except (StopIteration, json.JSONDecodeError):
+            pass
+
+        key = self.decode()
+        self.expect(":")
+        if text:
+            return (key,) + self.decode(text)
+        return key, self.decode()
+
+    def decode(self, text=False):
+        """
+        Decodes the next JSON value, reading until it is complete.
+
+        Parameters:
+            text (bool, optional): If True, the JSON text of the value
+                and its position are returned too, see position().
+
+        Returns:
+            any: The decoded value, or the (value, JSON text, position)
+            tuple.
+
+        Raises:
+            json.JSONDecodeError: If the value is invalid.
+        """
+        self._skip_whitespace()
+        while True:
+            try:
+                value, end = DECODER.raw_decode(self.__buffer, self.__pos)
+            except json.JSONDecodeError:
+                if self.__eof:
+                    raise
+            else:
+                # A value ending with the buffer may be cut, a number
+                # for instance: it is only trusted at the end of the file.
+                if end < len(self.__buffer) or self.__eof:
+                    start, self.__pos = self.__pos, end
+                    if text:
+                        return (value, self.__buffer[start:end],
+                                self.position(start))
+                    return value
+
+            self._fill()
+
+    def position(self, index):
+        """
+        Returns the offset in the file of a character of the buffer.
+
+        Parameters:
+            index (int): The index of the character in the buffer.
+
+        Returns:
+            int: The offset in bytes, None once non-ASCII text was read,
+            as its characters may take several bytes.
+        """
+        if not self.__ascii:
+            return None
+
+        return self.__offset + index
+
+    def _skip_whitespace(self):
+        """Moves past whitespace, reading more text if needed"""
+        while True:
+            self.__pos = WHITESPACE.match(self.__buffer, self.__pos).end()
+            if self.__pos < len(self.__buffer) or not self._fill():
+                return
+
+    def _fill(self):
+        """
+        Reads more text into the buffer, dropping the consumed part.
+        At least as much as is left unconsumed is read, so a value
+        spanning many reads is decoded in linear time.
+
+        Returns:
+            bool: False at the end of the file.
+        """
+        unread = self.__buffer[self.__pos:]
+        chunk = self.__file.read(max(self.__read_size, len(unread)))
+        if not chunk:
+            self.__eof = True
+            return False
+
+        if self.__ascii and not chunk.isascii():
+            self.__ascii = False
+        self.__offset += self.__pos
+        self.__buffer = unread + chunk
+        self.__pos = 0
+        return True
+
+
+def encode_dictionaries(dictionaries):
+    """
+    Encodes serialized objects into (key, JSON text) pairs.
+
+    Parameters:
+        dictionaries (dict[str, dict]): The serialized objects by key.
+
+    Returns:
+        generator: The (key, JSON text) pairs.
+    """
+    return (
+        (key, json.dumps(dictionary))
+        for key, dictionary in dictionaries.items()
+    )
+
+
+def json_object_chunks(encoded_objects):
+    """
+    Splices a JSON object made of already encoded values.
+
+    Parameters:
+        encoded_objects (iterable[tuple[str, str]]): The
+            (key, JSON text) pairs of the object.
+
+    Returns:
+        generator: The JSON text of the object, piece by piece.
+    """
+    yield "{"
+    separator = ""
+    for key, text in encoded_objects:
+        yield "{}{}: {}".format(separator, json.dumps(key), text)
+        separator = ", "
+    yield "}"
+
+
+def write_atomically(path, chunks, binary=False, compression=None):
+    """
+    Writes a file atomically: the content goes to a temporary file,
+    synced to disk, which then replaces the target.
+
+    The temporary file is named after the process and the thread
+    writing it, so writers sharing the directory never write to the
+    same one, and it is removed if the write fails.
+
+    Parameters:
+        path (str): The file path.
+        chunks (iterable[str | bytes]): The content, piece by piece.
+        binary (bool, optional): If True, the chunks are bytes,
+            otherwise text written as UTF-8.
+        compression (Compression, optional): The compression applied
+            as the content streams to the file.
+    """
+    tmp_path = "{}.{}.{}.tmp".format(path, os.getpid(),
+                                     threading.get_ident())
+    try:
+        with open(tmp_path, "wb") as file:
+            stream = compression.writer(file) if compression else file
+            if not binary:
+                stream = io.TextIOWrapper(stream, encoding="utf-8")
+
+            for chunk in chunks:
+                stream.write(chunk)
+
+            stream.flush()
+            if not binary:
+                stream = stream.detach()
+            if stream is not file:
+                stream.close()
+            file.flush()
+            os.fsync(file.fileno())
+
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class JSONSnapshot:
+    """
+    JSONSnapshot class represents a snapshot stored in a single JSON file.
+    """
+
+    def __init__(self, path, compression=None):
+        """
+        Initialize the JSONSnapshot instance.
+
+        Parameters:
+            path (str): The JSON file path.
+            compression (Compression, optional): The compression the
+                files are written with.
+        """
+        self._path = path
+        self._compression = compression
+
+    @property
+    def path(self):
+        """The snapshot base path, the journal logs are named after it"""
+        return self._path
+
+    def paths(self):
+        """Returns the paths of every file of the snapshot"""
+        return tuple(path for path, _ in self._variants(self._path))
+
+    def exists(self):
+        """Returns True if the snapshot was written"""
+        return self._find(self._path) is not None
+
+    def encode_object(self, obj):
+        """
+        Encodes an object into the record dump() expects.
+
+        Parameters:
+            obj (BaseModel): The object.
+
+        Returns:
+            str: The JSON text of the object, cached until its next change.
+        """
+        return obj.to_json()
+
+    def encode_record(self, text):
+        """
+        Encodes an object kept as the JSON text it was loaded from
+        into the record dump() expects.
+
+        Parameters:
+            text (str): The JSON text of the object.
+
+        Returns:
+            str: The JSON text itself.
+        """
+        return text
+
+    def encode_dictionaries(self, dictionaries):
+        """
+        Encodes serialized objects into the records dump() expects.
+
+        Parameters:
+            dictionaries (dict[str, dict]): The serialized objects by key.
+
+        Returns:
+            iterable[tuple[str, str]]: The (key, JSON text) pairs.
+        """
+        return encode_dictionaries(dictionaries)
+
+    def load(self):
+        """
+        Loads the serialized objects.
+
+        Returns:
+            dict[str, dict]: The serialized objects by key,
+            empty if the snapshot was never written.
+
+        Raises:
+            OSError, json.JSONDecodeError: If the file can't be read.
+        """
+        return dict(self.stream())
+
+    def stream(self):
+        """
+        Decodes the serialized objects one at a time.
+
+        Returns:
+            iterator: The (key, serialized object) pairs,
+            none if the snapshot was never written.
+
+        Raises:
+            OSError, json.JSONDecodeError: If the file can't be read,
+                while iterating.
+        """
+        found = self._find(self._path)
+        if not found:
+            return iter(())
+
+        path, compression = found
+        return iter_json_object(path, compression=compression)
+
+    def stream_texts(self, source=None):
+        """
+        Decodes the serialized objects one at a time, keeping the JSON
+        text each object is stored as, when the format stores one.
+
+        Parameters:
+            source (RecordSource, optional): The file to decode, opened
+                by open_source(), so the positions returned are those of
+                the texts in it.
+
+        Returns:
+            iterator: The (key, serialized object, JSON text or None,
+            position or None) tuples, see iter_json_file(), none if the
+            snapshot was never written.
+
+        Raises:
+            OSError, ValueError: If the file can't be read,
+                while iterating.
+        """
+        if source:
+            return source.stream_texts()
+
+        found = self._find(self._path)
+        if not found:
+            return iter(())
+
+        path, compression = found
+        return iter_json_object(path, compression=compression, texts=True)
+
+    def open_source(self):
+        """
+        Opens the snapshot file, to read objects back from their
+        position after decoding it with stream_texts().
+
+        Returns:
+            RecordSource: The open file, None if the snapshot was never
+            written or is not a single uncompressed JSON file.
+        """
+        found = self._find(self._path)
+        if not found or found[1]:
+            return None
+
+        try:
+            return RecordSource(found[0])
+        except OSError:
+            return None
+
+    def dump(self, encoded_by_class, class_names=None):
+        """
+        Writes the serialized objects.
+
+        Parameters:
+            encoded_by_class (dict[str, iterable[tuple[str, str]]]): The
+                (key, JSON text) pairs of the objects, by class name.
+            class_names (iterable[str], optional): The classes whose
+                objects changed. The single file is always fully rewritten.
+        """
+        self._write(self._path, json_object_chunks(
+            pair for encoded_objects in encoded_by_class.values()
+            for pair in encoded_objects
+        ))
+
+    def _variants(self, path):
+        """
+        Returns the ways a file of the snapshot can be stored.
+
+        Parameters:
+            path (str): The uncompressed file path.
+
+        Returns:
+            tuple[tuple[str, Compression | None]]: The (file path,
+            compression) pairs, the one written by the snapshot first.
+        """
+        if not self._compression:
+            return ((path, None),)
+
+        return ((path + self._compression.suffix, self._compression),
+                (path, None))
+
+    def _find(self, path):
+        """
+        Finds how a file of the snapshot is stored.
+
+        Parameters:
+            path (str): The uncompressed file path.
+
+        Returns:
+            tuple[str, Compression | None]: The (file path, compression)
+            of the stored file, None if it does not exist.
+        """
+        for variant in self._variants(path):
+            if os.path.isfile(variant[0]):
+                return variant
+
+        return None
+
+    def _write(self, path, chunks, binary=False):
+        """
+        Writes a file of the snapshot atomically, with the snapshot
+        compression, then removes the file stored another way if any.
+
+        Parameters:
+            path (str): The uncompressed file path.
+            chunks (iterable[str | bytes]): The content, piece by piece.
+            binary (bool, optional): If True, the chunks are bytes.
+        """
+        (file_path, compression), *others = self._variants(path)
+        write_atomically(file_path, chunks, binary, compression)
+
+        for other_path, _ in others:
+            if os.path.isfile(other_path):
+                os.remove(other_path)
+
+
+class PartitionedJSONSnapshot(JSONSnapshot):
+    """
+    PartitionedJSONSnapshot class represents a snapshot stored in one
+    JSON file per class, so only the classes that changed are rewritten
+    and the partitions can be decoded in parallel.
+
+    A single-file snapshot found at the base path is read instead when
+    no partition exists yet, and removed once the partitions are written.
+    """
+
+    PARALLEL_LOAD_SIZE = 8 * 1024 * 1024
+
+    def __init__(self, path, compression=None):
+        """
+        Initialize the PartitionedJSONSnapshot instance.
+
+        Parameters:
+            path (str): The base path, `file.json` gives the
+                partitions `file.<class name>.json`.
+            compression (Compression, optional): The compression the
+                files are written with.
+        """
+        super().__init__(path, compression)
+
+        root, ext = os.path.splitext(path)
+        self.__partitions = {
+            class_name: "{}.{}{}".format(root, class_name, ext)
+            for class_name in CLASSES.keys()
+        }
+
+    def paths(self):
+        """Returns the paths of every file of the snapshot"""
+        return super().paths() + tuple(
+            path for partition in self.__partitions.values()
+            for path, _ in self._variants(partition)
+        )
+
+    def exists(self):
+        """Returns True if a partition or a single-file snapshot exists"""
+        return self._has_partitions() or super().exists()
+
+    def stream(self):
+        """
+        Decodes the serialized objects of every partition.
+
+        Partitions are decoded concurrently by a process pool when they
+        are large enough to pay for it and more than one CPU is available.
+        This holds every decoded partition in memory at once, while the
+        sequential path decodes one object at a time.
+
+        Returns:
+            iterator: The (key, serialized object) pairs.
+
+        Raises:
+            OSError, json.JSONDecodeError: If a file can't be read,
+                while iterating.
+        """
+        if not self._has_partitions():
+            return super().stream()
+
+        return self._stream_partitions(False)
+
+    def stream_texts(self, source=None):
+        """
+        Decodes the serialized objects of every partition, see stream(),
+        keeping the JSON text of each object, unless decoded concurrently.
+
+        Parameters:
+            source (RecordSource, optional): The single-file snapshot
+                opened by open_source(), if any.
+
+        Returns:
+            iterator: The (key, serialized object, JSON text or None,
+            position or None) tuples.
+
+        Raises:
+            OSError, json.JSONDecodeError: If a file can't be read,
+                while iterating.
+        """
+        if not self._has_partitions():
+            return super().stream_texts(source)
+
+        return self._stream_partitions(True)
+
+    def open_source(self):
+        """
+        Returns:
+            RecordSource: The single-file snapshot opened, None once
+            partitioned.
+        """
+        if self._has_partitions():
+            return None
+
+        return super().open_source()
+
+    def _stream_partitions(self, texts):
+        """
+        Decodes every partition, see stream() and stream_texts().
+
+        Parameters:
+            texts (bool): If True, the tuples of stream_texts() are
+                returned instead of pairs.
+
+        Returns:
+            iterator: The pairs or the tuples.
+        """
+        found = [self._find(partition)
+                 for partition in self.__partitions.values()]
+        paths, compressions = zip(*filter(None, found))
+        total_size = sum(os.path.getsize(path) for path in paths)
+        workers = min(len(paths), os.cpu_count() or 1)
+
+        if workers > 1 and total_size >= self.PARALLEL_LOAD_SIZE:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                partitions = list(executor.map(load_json, paths,
+                                               compressions))
+            if texts:
+                return ((key, dictionary, None, None)
+                        for partition in partitions
+                        for key, dictionary in partition.items())
+            return (pair for partition in partitions
+                    for pair in partition.items())
+
+        return (
+            item for path, compression in zip(paths, compressions)
+            for item in iter_json_object(path, compression=compression,
+                                         texts=texts)
+        )
+
+    def dump(self, encoded_by_class, class_names=None):
+        """
+        Writes the partitions of the classes whose objects changed.
+
+        Every partition is written when migrating from a single-file
+        snapshot, which is then removed.
+
+        Parameters:
+            encoded_by_class (dict[str, iterable[tuple[str, str]]]): The
+                (key, JSON text) pairs of the objects, by class name.
+            class_names (iterable[str], optional): The classes whose
+                objects changed. Defaults to every class.
+        """
+        migrating = super().exists()
+        if class_names is None or migrating:
+            class_names = self.__partitions.keys()
+
+        for class_name in class_names:
+            self._write(self.__partitions[class_name], json_object_chunks(
+                encoded_by_class.get(class_name, ())))
+
+        if migrating:
+            for path in super().paths():
+                if os.path.isfile(path):
+                    os.remove(path)
+
+    def migrate(self):
+        """
+        Splits a single-file snapshot into per-class partitions.
+        Does nothing if there is no single-file snapshot.
+        """
+        found = self._find(self._path)
+        if not found:
+            return
+
+        path, compression = found
+        dictionaries = dict(iter_json_object(path, compression=compression))
+        self.dump({
+            class_name: self.encode_dictionaries(class_dictionaries)
+            for class_name, class_dictionaries
+            in group_by_class(dictionaries).items()
+        })
+
+    def _has_partitions(self):
+        """Returns True if at least one partition was written"""
+        return any(self._find(partition)
+                   for partition in self.__partitions.values())
+
+
+class PackedSnapshot(JSONSnapshot):
+    """
+    PackedSnapshot class represents a snapshot stored in a single
+    packed binary file, see the packed module for the format.
+
+    The file is read whole, then decoded one class at a time.
+    """
+
+    def encode_object(self, obj):
+        """
+        Encodes an object into the record dump() expects.
+
+        Parameters:
+            obj (BaseModel): The object.
+
+        Returns:
+            dict: The `to_dict()` representation of the object.
+        """
+        return obj.to_dict()
+
+    def encode_record(self, text):
+        """
+        Encodes an object kept as the JSON text it was loaded from
+        into the record dump() expects.
+
+        Parameters:
+            text (str): The JSON text of the object.
+
+        Returns:
+            dict: The decoded dictionary.
+        """
+        return json.loads(text)
+
+    def encode_dictionaries(self, dictionaries):
+        """
+        Encodes serialized objects into the records dump() expects.
+
+        Parameters:
+            dictionaries (dict[str, dict]): The serialized objects by key.
+
+        Returns:
+            iterable[tuple[str, dict]]: The (key, dictionary) pairs.
+        """
+        return dictionaries.items()
+
+    def stream(self):
+        """
+        Decodes the serialized objects one class at a time.
+
+        Returns:
+            iterator: The (key, serialized object) pairs,
+            none if the snapshot was never written.
+
+        Raises:
+            OSError, ValueError: If the file can't be read,
+                while iterating.
+        """
+        found = self._find(self._path)
+        if not found:
+            return iter(())
+
+        return self._unpack(*found)
+
+    def stream_texts(self, source=None):
+        """
+        Decodes the serialized objects one class at a time, see stream().
+        The packed format stores no JSON text.
+
+        Parameters:
+            source (RecordSource, optional): Unused, see open_source().
+
+        Returns:
+            iterator: The (key, serialized object, None, None) tuples.
+
+        Raises:
+            OSError, ValueError: If the file can't be read,
+                while iterating.
+        """
+        return ((key, dictionary, None, None)
+                for key, dictionary in self.stream())
+
+    def open_source(self):
+        """
+        Returns:
+            None: Objects can't be read back from a packed file.
+        """
+        return None
+
+    def dump(self, encoded_by_class, class_names=None):
+        """
+        Writes the serialized objects, one block per class.
+
+        Parameters:
+            encoded_by_class (dict[str, iterable[tuple[str, dict]]]): The
+                (key, dictionary) pairs of the objects, by class name.
+            class_names (iterable[str], optional): The classes whose
+                objects changed. The file is always fully rewritten.
+        """
+        self._write(self._path, [MAGIC] + [
+            pack_records(class_name, [
+                dictionary for key, dictionary in encoded_objects
+            ])
+            for class_name, encoded_objects in encoded_by_class.items()
+        ], binary=True)
+
+    @staticmethod
+    def _unpack(path, compression):
+        """
+        Yields the (key, serialized object) pairs of a packed file
+        Parameters:
+            path (str): The file path.
+            compression (Compression | None): The file compression.
+        """
+        with open_for_reading(path, compression, binary=True) as file:
+            data = file.read()
+
+        if not data.startswith(MAGIC):
+            raise ValueError("{} is not a packed snapshot".format(path))
+
+        offset = len(MAGIC)
+        try:
+            while offset < len(data):
+                records, offset = unpack_records(data, offset)
+                yield from records
+        except (IndexError, KeyError, struct.error) as error:
+            raise ValueError("{} is corrupted: {}".format(path, error))
+
+
+class MappedSnapshot(JSONSnapshot):
+    """
+    MappedSnapshot class represents a snapshot stored in a single
+    mapped file, see the mapped module for the layout, the JSON text of
+    each object indexed by key and by parent.
+
+    The file is never compressed, so it can be mapped, see open_map().
+    """
+
+    def __init__(self, path, compression=None):
+        """
+        Initialize the MappedSnapshot instance.
+
+        Parameters:
+            path (str): The mapped file path.
+            compression (Compression, optional): Ignored, the mapped
+                file is written uncompressed.
+        """
+        super().__init__(path)
+
+    def encode_object(self, obj):
+        """
+        Encodes an object into the record dump() expects.
+
+        Parameters:
+            obj (BaseModel): The object.
+
+        Returns:
+            tuple[str, tuple]: The JSON text of the object, cached until
+            its next change, and its (foreign key, parent id) pairs.
+        """
+        return obj.to_json(), references(
+            obj.__class__.__name__,
+            lambda attr: getattr(obj, attr, None))
+
+    def encode_record(self, text):
+        """
+        Encodes an object kept as the JSON text it was loaded from
+        into the record dump() expects.
+
+        Parameters:
+            text (str): The JSON text of the object.
+
+        Returns:
+            tuple[str, tuple]: The JSON text and the (foreign key,
+            parent id) pairs read from it.
+        """
+        return text, self._parents(json.loads(text))
+
+    def encode_dictionaries(self, dictionaries):
+        """
+        Encodes serialized objects into the records dump() expects.
+
+        Parameters:
+            dictionaries (dict[str, dict]): The serialized objects by key.
+
+        Returns:
+            iterable[tuple[str, tuple[str, tuple]]]: The (key, (JSON text,
+            parents)) pairs.
+        """
+        return (
+            (key, (json.dumps(dictionary), self._parents(dictionary)))
+            for key, dictionary in dictionaries.items()
+        )
+
+    def stream(self):
+        """
+        Decodes the serialized objects one at a time.
+
+        Returns:
+            iterator: The (key, serialized object) pairs,
+            none if the snapshot was never written.
+
+        Raises:
+            OSError, ValueError: If the file can't be read,
+                while iterating.
+        """
+        return ((key, dictionary)
+                for key, dictionary, _, _ in self.stream_texts())
+
+    def stream_texts(self, source=None):
+        """
+        Decodes the serialized objects one at a time, with their JSON text.
+
+        Parameters:
+            source (RecordSource, optional): Unused, see open_source().
+
+        Returns:
+            iterator: The (key, serialized object, JSON text, None)
+            tuples, none if the snapshot was never written.
+
+        Raises:
+            OSError, ValueError: If the file can't be read,
+                while iterating.
+        """
+        if not self.exists():
+            return iter(())
+
+        return self._decode(self.open_map())
+
+    def open_source(self):
+        """
+        Returns:
+            None: Objects are read back through open_map() instead.
+        """
+        return None
+
+    def open_map(self):
+        """
+        Maps the snapshot file.
+
+        Returns:
+            MappedFile: The mapped file, None if the snapshot was never
+            written.
+
+        Raises:
+            OSError, ValueError: If the file can't be mapped.
+        """
+        if not self.exists():
+            return None
+
+        return MappedFile(self._path)
+
+    def dump(self, encoded_by_class, class_names=None):
+        """
+        Writes the serialized objects and their indexes.
+
+        Parameters:
+            encoded_by_class (dict[str, iterable[tuple[str, tuple]]]): The
+                (key, (JSON text, parents)) pairs of the objects, by
+                class name.
+            class_names (iterable[str], optional): The classes whose
+                objects changed. The file is always fully rewritten.
+        """
+        self._write(self._path, map_chunks(encoded_by_class), binary=True)
+
+    @staticmethod
+    def _decode(mapped_file):
+        """
+        Yields the tuples of stream_texts() read from a mapped file
+        Parameters:
+            mapped_file (MappedFile): The mapped file.
+        """
+        for class_name in CLASSES.keys():
+            for _id, text in mapped_file.entries(class_name):
+                yield ("{}.{}".format(class_name, _id), json.loads(text),
+                       text, None)
+
+    @staticmethod
+    def _parents(dictionary):
+        """
+        Returns the (foreign key, parent id) pairs of a serialized object
+        Parameters:
+            dictionary (dict): The serialized object.
+        """
+        if dictionary.get("__class__") not in FOREIGN_KEYS_BY_CLASS:
+            return ()
+
+        return references(dictionary["__class__"], dictionary.get)
+
+
+class RecordSource:
+    """
+    RecordSource class represents a JSON snapshot file kept open, so
+    the JSON text of an object can be read back from its position even
+    after the file was replaced by a save.
+
+    A record is the position of a text packed in one int,
+    `offset << 32 | length`.
+    """
+
+    def __init__(self, path):
+        """
+        Initialize the RecordSource instance, opening the file.
+
+        Parameters:
+            path (str): The uncompressed JSON file path.
+
+        Raises:
+            OSError: If the file can't be opened.
+        """
+        self.path = path
+        self.__file = open(path, "rb")
+
+    def fileno(self):
+        """Returns the file descriptor of the open file"""
+        return self.__file.fileno()
+
+    def stream_texts(self):
+        """
+        Decodes the objects of the file, see iter_json_file().
+
+        Returns:
+            generator: The (key, serialized object, JSON text, position)
+            tuples.
+        """
+        fd = os.dup(self.__file.fileno())
+        os.lseek(fd, 0, os.SEEK_SET)
+        with io.TextIOWrapper(open(fd, "rb"), encoding="utf-8",
+                              newline="") as file:
+            yield from iter_json_file(file, texts=True)
+
+    @staticmethod
+    def record(position, text):
+        """
+        Returns the record of a text read at a position, None if the
+        text is too long to be packed.
+
+        Parameters:
+            position (int): The offset of the text in the file.
+            text (str): The ASCII text.
+
+        Returns:
+            int: The record.
+        """
+        if len(text) >> 32:
+            return None
+
+        return position << 32 | len(text)
+
+    def read(self, record):
+        """
+        Reads back the text of a record.
+
+        Parameters:
+            record (int): The record.
+
+        Returns:
+            str: The JSON text.
+
+        Raises:
+            OSError: If the file can't be read.
+        """
+        return os.pread(self.__file.fileno(), record & 0xFFFFFFFF,
+                        record >> 32).decode("ascii")
+
+    def close(self):
+        """Closes the file"""
+        self.__file.close()
+
+    def __del__(self):
+        """Closes the file once no indexes read from it anymore"""
+        self.close()
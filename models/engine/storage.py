@@ -11,10 +11,17 @@ from models.engine.stored_classes import CLASSES
 
 class Storage(ABC):
     __CLASSES = CLASSES
+    __CLASSES_VALUES = tuple(CLASSES.values())
+    __CLASSES_NAMES = tuple(CLASSES.keys())
 
     @abstractmethod
-    def all(self, cls=None):
-        """Retrieve all objects of a given class or all classes."""
+    def all(self, cls=None, load=None):
+        """
+        Retrieve all objects of a given class or all classes.
+
+        `load` names the relationships of a class to load along with its
+        objects, see get().
+        """
         pass
 
     @abstractmethod
@@ -38,23 +45,28 @@ class Storage(ABC):
         pass
 
     @abstractmethod
-    def find(self, class_name, _id):
+    def find(self, class_name, _id, load=None):
         """Find an object by its class name and ID."""
         pass
 
-    def get(self, cls, _id):
+    def get(self, cls, _id, load=None):
         """
         Get an object by its class and ID
         Parameters:
             cls (BaseModel): the class of the object
             _id (str): the ID of the object
+            load (list[str], optional): the relationships to load along
+                with the object, each a name such as "amenities" or a
+                dotted path such as "cities.places", so that reading
+                them sends no query per object. Storages that keep
+                relationships in memory ignore it.
         Returns:
             The object if found, otherwise None
         """
         if not cls or cls not in self.get_classes():
             return None
 
-        return self.find(cls.__name__, _id)
+        return self.find(cls.__name__, _id, load=load)
 
     def count(self, cls=None):
         """
@@ -66,10 +78,7 @@ class Storage(ABC):
             all classes if cls is None or 0 if the class is not found (int)
         """
         if not cls:
-            return sum(
-                self.count_by_class_name(cls.__name__)
-                for cls in self.get_classes()
-            )
+            return sum(self.counts().values())
 
         if cls not in self.get_classes():
             return 0
@@ -86,11 +95,80 @@ class Storage(ABC):
         """Update an object's attribute."""
         pass
 
+    def update_attributes(self, obj, attributes):
+        """
+        Update several attributes of an object.
+
+        Storages that can write all the changes at once override this,
+        the default updates one attribute at a time.
+
+        Parameters:
+            obj (BaseModel): the object to update
+            attributes (dict[str, any]): the new values by attribute name
+        """
+        for attr, value in attributes.items():
+            self.update(obj, attr=attr, value=value)
+
     @abstractmethod
     def count_by_class_name(self, class_name):
         """Count the number of objects of a given class."""
         pass
 
+    def counts(self):
+        """
+        Count the number of objects of every class.
+
+        Storages that can count all the classes at once override this,
+        the default counts one class at a time.
+
+        Returns:
+            dict[str, int]: the number of objects by class name
+        """
+        return {
+            class_name: self.count_by_class_name(class_name)
+            for class_name in self.get_classes_names()
+        }
+
+    def search_places(self, states=None, cities=None, amenities=None):
+        """
+        Search the places of some states or cities that have some
+        amenities, as the places_search endpoint does.
+
+        A place matches if its city belongs to one of `states` or is one
+        of `cities`, any place if both are empty, and if it has every
+        one of `amenities`.
+
+        Storages that can filter the places without loading them all
+        override this, the default reads every place, its city and its
+        amenities.
+
+        Parameters:
+            states (list[str], optional): the ids of the states
+            cities (list[str], optional): the ids of the cities
+            amenities (list[str], optional): the ids of the amenities
+
+        Returns:
+            list[Place]: the matching places
+        """
+        load = ["amenities"] if amenities else []
+        places = []
+
+        for place in self.all(self.get_class("Place"), load=load).values():
+            if states or cities:
+                city = self.find("City", place.city_id) if states else None
+                if not (city and city.state_id in states or
+                        cities and place.city_id in cities):
+                    continue
+
+            if amenities:
+                amenity_ids = {amenity.id for amenity in place.amenities}
+                if not all(_id in amenity_ids for _id in amenities):
+                    continue
+
+            places.append(place)
+
+        return places
+
     @abstractmethod
     def close(self):
         """Close the storage session."""
@@ -113,11 +191,11 @@ class Storage(ABC):
 
     def get_classes(self):
         """Returns a tuple of classes"""
-        return tuple(self.__CLASSES.values())
+        return self.__CLASSES_VALUES
 
     def get_classes_names(self):
         """Returns a tuple of model names"""
-        return tuple(self.__CLASSES.keys())
+        return self.__CLASSES_NAMES
 
     def get_class(self, class_name):
         """
@@ -127,7 +205,4 @@ class Storage(ABC):
         Returns:
             The class if found (BaseModel), otherwise None
         """
-        if class_name not in self.get_classes_names():
-            return None
-
         return self.__CLASSES.get(class_name)
@@ -73,30 +73,27 @@ class Place(*parent_classes):
             """
             from models import storage
 
-            related_reviews = []
-            reviews = storage.all(Review)
-
-            for review in reviews.values():
-                if review.place_id == self.id:
-                    related_reviews.append(review)
-
-            return related_reviews
+            return list(
+                storage.all_by_foreign_key(
+                    Review, "place_id", self.id).values()
+            )
 
         @property
         def amenities(self):
             """
-            Retrieves the amenities associated with the place.
+            Retrieves the amenities associated with the place,
+            looking each of its amenity_ids up.
 
             Returns:
                 list: A list of Amenity objects associated with the place.
             """
             from models import storage
 
-            amenities = storage.all(Amenity)
             related_amenities = []
 
-            for amenity in amenities.values():
-                if amenity.id in self.amenity_ids:
+            for amenity_id in self.amenity_ids:
+                amenity = storage.get(Amenity, amenity_id)
+                if amenity:
                     related_amenities.append(amenity)
 
             return related_amenities
@@ -116,7 +113,12 @@ class Place(*parent_classes):
                 return
 
             if obj.id not in self.amenity_ids:
-                self.amenity_ids.append(obj.id)
+                from models import storage
+
+                # Through the storage, which indexes the place
+                # under each of its amenities
+                storage.update(self, "amenity_ids",
+                               self.amenity_ids + [obj.id])
 
     def to_dict(self):
         """
@@ -43,11 +43,6 @@ class State(*parent_classes):
             """
             from models import storage
 
-            related_cities = []
-            cities = storage.all(City)
-
-            for city in cities.values():
-                if city.state_id == self.id:
-                    related_cities.append(city)
-
-            return related_cities
+            return list(
+                storage.all_by_foreign_key(City, "state_id", self.id).values()
+            )
@@ -42,6 +42,37 @@ class User(*parent_classes):
         first_name = ""
         last_name = ""
 
+        @property
+        def places(self):
+            """
+            Retrieves the places owned by the user.
+
+            Returns:
+                list: A list of Place objects associated with the user.
+            """
+            from models import storage
+            from models.place import Place
+
+            return list(
+                storage.all_by_foreign_key(Place, "user_id", self.id).values()
+            )
+
+        @property
+        def reviews(self):
+            """
+            Retrieves the reviews written by the user.
+
+            Returns:
+                list: A list of Review objects associated with the user.
+            """
+            from models import storage
+            from models.review import Review
+
+            return list(
+                storage.all_by_foreign_key(
+                    Review, "user_id", self.id).values()
+            )
+
     def __init__(self, *args, **kwargs):
         """
         Initializes a new User instance. If a password is provided,
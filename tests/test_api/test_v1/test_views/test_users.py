@@ -1,11 +1,14 @@
 #!/usr/bin/python3
 """testing the users routes"""
 import json
+import os
 import unittest
 from models.user import User
 from models import storage
 from api.v1.app import app
 
+storage_type = os.getenv("HBNB_TYPE_STORAGE")
+
 
 class TestUsers(unittest.TestCase):
     """test user"""
@@ -42,7 +45,8 @@ class TestUsers(unittest.TestCase):
             self.assertEqual(res.status_code, 200)
 
             res = client.delete('api/v1/users/{}'.format(new_user.id))
-            self.assertEqual(res.status_code, 404)
+            self.assertEqual(res.status_code,
+                             404 if storage_type == 'db' else 200)
 
             res = client.get('api/v1/users/{}'.format(new_user.id))
             self.assertEqual(res.status_code, 404)
@@ -1,12 +1,57 @@
 #!/usr/bin/python3
 """Defines unittests for models/base_model.py"""
 
+import json
+import os
 import unittest
 
+from models.base_model import BaseModel
+
+storage_type = os.getenv("HBNB_TYPE_STORAGE")
+
 
 class TestBaseModel(unittest.TestCase):
     """Unittests for testing the BaseModel class."""
-    pass
+
+    @unittest.skipIf(storage_type == 'db', 'File Storage test')
+    def test_dirty_fields(self):
+        """Test if attribute writes are tracked until cleared"""
+        model = BaseModel()
+        model.clear_dirty_fields()
+        self.assertEqual(model.get_dirty_fields(), frozenset())
+
+        model.name = "Holberton"
+        self.assertEqual(model.get_dirty_fields(),
+                         frozenset({"name", "updated_at"}))
+
+    def test_dirty_fields_not_serialized(self):
+        """Test if the dirty fields tracking stays out of to_dict/str"""
+        model = BaseModel()
+        model.name = "Holberton"
+
+        self.assertNotIn("_dirty_fields", model.to_dict())
+        self.assertNotIn("_dirty_fields", str(model))
+
+    def test_to_json(self):
+        """Test if to_json encodes to_dict and follows attribute writes"""
+        model = BaseModel()
+        model.name = "Holberton"
+        self.assertEqual(json.loads(model.to_json()), model.to_dict())
+
+        model.name = "School"
+        self.assertEqual(json.loads(model.to_json())["name"], "School")
+
+    def test_from_dict_round_trip(self):
+        """Test if from_dict rebuilds the object with its timestamps"""
+        model = BaseModel()
+        model.name = "Holberton"
+        dictionary = model.to_dict()
+
+        rebuilt = BaseModel.from_dict(dictionary)
+
+        self.assertEqual(rebuilt.to_dict(), dictionary)
+        self.assertEqual(rebuilt.updated_at, model.updated_at)
+        self.assertEqual(rebuilt.get_dirty_fields(), frozenset())
 
 
 if __name__ == "__main__":
@@ -0,0 +1,76 @@
+#!/usr/bin/python3
+"""Defines unittests for models/compact.py"""
+
+import os
+import subprocess
+import sys
+import unittest
+
+from models.compact import CompactModelMeta
+
+storage_type = os.getenv("HBNB_TYPE_STORAGE")
+
+COMPACT_MODELS_CHECK = """
+import pickle
+from models import storage
+from models.amenity import Amenity
+from models.place import Place
+from models.review import Review
+
+place = Place(name="Loft", city_id="c1")
+place.wifi_password = "secret"
+assert not hasattr(place, "__dict__")
+assert place.number_rooms == 0
+assert "number_rooms" not in place.to_dict()
+assert place.to_dict()["wifi_password"] == "secret"
+assert "Loft" in str(place)
+assert Place.from_dict(place.to_dict()).to_dict() == place.to_dict()
+assert pickle.loads(pickle.dumps(place)).to_dict() == place.to_dict()
+
+amenity = Amenity(name="Wifi")
+review = Review(place_id=place.id, text="Nice")
+for obj in (place, amenity, review):
+    storage.new(obj)
+place.amenities = amenity
+assert place.amenities == [amenity]
+assert place.reviews == [review]
+"""
+
+
+class TestCompactModelMeta(unittest.TestCase):
+    """Unittests for testing the CompactModelMeta metaclass."""
+
+    def test_fields_become_slots(self):
+        """Test if declared fields become slots with defaults"""
+        class Model(metaclass=CompactModelMeta):
+            __slots__ = ("id",)
+            NAMES = ["id"]
+            name = ""
+            rooms = 0
+
+        class Child(Model):
+            text = "none"
+
+        child = Child()
+        self.assertFalse(hasattr(child, "__dict__"))
+        self.assertEqual(Child._SLOTS, frozenset({"id", "name", "rooms",
+                                                  "text"}))
+        self.assertEqual(Child._FIELD_DEFAULTS,
+                         {"name": "", "rooms": 0, "text": "none"})
+        self.assertEqual([name for name, _ in Child._FIELD_GETTERS],
+                         ["id", "name", "rooms", "text"])
+        self.assertEqual(Child.NAMES, ["id"])
+
+    @unittest.skipIf(storage_type == 'db', 'File Storage test')
+    def test_compact_models(self):
+        """Test the models built with HBNB_COMPACT_MODELS set"""
+        env = dict(os.environ, HBNB_COMPACT_MODELS="1")
+        result = subprocess.run(
+            [sys.executable, "-c", COMPACT_MODELS_CHECK],
+            env=env, capture_output=True, text=True
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+
+
+if __name__ == '__main__':
+    unittest.main()
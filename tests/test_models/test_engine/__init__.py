@@ -0,0 +1,38 @@
+#!/usr/bin/python3
+"""Helpers shared by the storage engine tests"""
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+
+def clear_file_storage_env(test):
+    """
+    Unsets the HBNB_FILE_* environment variables until the end of a
+    test, so each FileStorage it builds only has the options it passes.
+
+    Parameters:
+        test (unittest.TestCase): The running test.
+    """
+    patcher = mock.patch.dict(os.environ, {
+        name: value for name, value in os.environ.items()
+        if not name.startswith("HBNB_FILE_")
+    }, clear=True)
+    patcher.start()
+    test.addCleanup(patcher.stop)
+
+
+class StorageTestCase(unittest.TestCase):
+    """
+    Runs each test without the HBNB_FILE_* environment variables, see
+    clear_file_storage_env(), with `file_path`, a file named `file_name`
+    in a temporary directory `tmp_dir` removed after the test.
+    """
+    file_name = "file.json"
+
+    def setUp(self):
+        """Creates a temporary directory for the storage files"""
+        clear_file_storage_env(self)
+        self.tmp_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp_dir.cleanup)
+        self.file_path = os.path.join(self.tmp_dir.name, self.file_name)
@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+"""test for the compressed FileStorage snapshots"""
+import os
+import unittest
+from models.engine import compression as compression_module
+from models.engine.compression import Compression
+from models.engine.file_storage import FileStorage
+from models.state import State
+from tests.test_models.test_engine import StorageTestCase
+
+storage_type = os.getenv("HBNB_TYPE_STORAGE")
+CODECS = ["gzip", "lzma"]
+if compression_module.zstandard:
+    CODECS.append("zstd")
+
+
+@unittest.skipIf(storage_type == 'db', 'File Storage test')
+class TestCompression(StorageTestCase):
+    """Tests the File Storage written with streaming compression"""
+    def round_trip(self, file_path=None, **options):
+        """Saves a state and returns it reloaded"""
+        file_path = file_path or self.file_path
+        file_storage = FileStorage(file_path, **options)
+        state = State(name="Kansas")
+        file_storage.new(state)
+        file_storage.save()
+
+        reloaded = FileStorage(file_path, **options)
+        reloaded.reload()
+        return state, reloaded.get(State, state.id)
+
+    def test_round_trip(self):
+        """Test if every codec and layout round-trips the objects"""
+        for codec in CODECS:
+            for index, options in enumerate(({}, {"partitioned": True},
+                                             {"file_format": "packed"})):
+                with self.subTest(codec=codec, **options):
+                    file_path = os.path.join(
+                        self.tmp_dir.name, "{}-{}.json".format(codec, index))
+                    state, reloaded = self.round_trip(
+                        file_path, compression=Compression(codec, level=1),
+                        **options)
+                    self.assertEqual(reloaded.to_dict(), state.to_dict())
+
+    def test_compressed_file_name(self):
+        """Test if the compressed file gets the codec suffix"""
+        self.round_trip(compression=Compression("gzip"))
+        self.assertTrue(os.path.isfile(self.file_path + ".gz"))
+        self.assertFalse(os.path.isfile(self.file_path))
+
+    def test_uncompressed_file_is_replaced(self):
+        """Test if an uncompressed file is read then replaced"""
+        file_storage = FileStorage(self.file_path)
+        state = State(name="Kentucky")
+        file_storage.new(state)
+        file_storage.save()
+
+        compressed = FileStorage(self.file_path,
+                                 compression=Compression("lzma"))
+        compressed.reload()
+        self.assertEqual(compressed.get(State, state.id).name, "Kentucky")
+
+        compressed.save()
+        self.assertTrue(os.path.isfile(self.file_path + ".xz"))
+        self.assertFalse(os.path.isfile(self.file_path))
+
+    def test_unknown_codec(self):
+        """Test if an unknown codec is rejected"""
+        with self.assertRaises(ValueError):
+            Compression("rar")
+
+
+if __name__ == '__main__':
+    unittest.main()
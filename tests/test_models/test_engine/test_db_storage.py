@@ -1,9 +1,18 @@
 #!/usr/bin/python3
 """test for DB storage"""
+import gc
 import os
 import unittest
+from unittest import mock
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
 from models import storage
+from models.amenity import Amenity
+from models.city import City
+from models.engine.storage import Storage
+from models.place import Place
 from models.state import State
+from models.user import User
 
 storage_type = os.getenv("HBNB_TYPE_STORAGE")
 
@@ -36,6 +45,144 @@ class TestDBStorage(unittest.TestCase):
 
         self.assertEqual(old_count + 3, storage.count(State))
 
+    def count_queries(self, func):
+        """Returns the number of statements sent by a call"""
+        queries = []
+
+        def count(*args):
+            queries.append(args)
+
+        event.listen(Engine, "before_cursor_execute", count)
+        try:
+            func()
+        finally:
+            event.remove(Engine, "before_cursor_execute", count)
+        return len(queries)
+
+    def test_get_uses_identity_map(self):
+        """Test if get queries an object once per session"""
+        new_state = State(name="Oregon")
+        storage.new(new_state)
+        storage.save()
+        storage.close()
+
+        def get():
+            self.assertEqual(storage.get(State, new_state.id).name, "Oregon")
+
+        self.assertEqual(self.count_queries(get), 1)
+        self.assertEqual(self.count_queries(get), 0)
+
+    def test_get_refreshes_stale_objects(self):
+        """Test if get refreshes objects older than max_staleness"""
+        new_state = State(name="Nevada")
+        storage.new(new_state)
+        storage.save()
+        storage.close()
+        storage.get(State, new_state.id)
+
+        with mock.patch.object(storage, "max_staleness", 0):
+            self.assertEqual(self.count_queries(
+                lambda: storage.get(State, new_state.id)), 1)
+            storage.close()
+            self.assertEqual(self.count_queries(
+                lambda: storage.get(State, new_state.id)), 1)
+
+    def test_get_pins_a_bounded_number_of_objects(self):
+        """Test if get keeps only the last objects found referenced"""
+        states = [State(name="state-{}".format(index)) for index in range(3)]
+        for state in states:
+            storage.new(state)
+        storage.save()
+        storage.close()
+
+        with mock.patch.object(storage, "PINNED_OBJECTS", 2):
+            for state in states:
+                storage.get(State, state.id)
+            gc.collect()
+
+            self.assertEqual(self.count_queries(
+                lambda: storage.get(State, states[2].id)), 0)
+            self.assertEqual(self.count_queries(
+                lambda: storage.get(State, states[0].id)), 1)
+
+    def test_counts(self):
+        """Test if counts returns the count of every class at once"""
+        storage.new(State(name="Kansas"))
+        counts = {}
+        self.assertEqual(self.count_queries(
+            lambda: counts.update(storage.counts())), 1)
+        self.assertEqual(counts, {
+            cls.__name__: storage.count(cls)
+            for cls in storage.get_classes()
+        })
+
+    def test_all_loads_relationships(self):
+        """Test if all loads the relationships asked for at once"""
+        ids = []
+        for name in ("Alaska", "Hawaii"):
+            new_state = State(name=name)
+            storage.new(new_state)
+            storage.new(City(name="Capital", state_id=new_state.id))
+            ids.append(new_state.id)
+        storage.save()
+        storage.close()
+
+        def read_cities():
+            # Referenced, as a view reading them does: the session only
+            # holds the objects weakly
+            states = storage.all(State, load=["cities"])
+            for state in states.values():
+                self.assertIsInstance(state.cities, list)
+            for _id in ids:
+                state = storage.get(State, _id)
+                self.assertEqual(len(state.cities), 1)
+                self.assertNotIn("cities", state.to_dict())
+
+        self.assertEqual(self.count_queries(read_cities), 2)
+
+    def test_load_unknown_relationship(self):
+        """Test if loading a name that is not a relationship fails"""
+        with self.assertRaises(ValueError):
+            storage.all(State, load=["name"])
+
+    def test_search_places(self):
+        """Test if the search query finds the places the default finds"""
+        user = User(email="search@hbnb.io", password="pwd")
+        wifi = Amenity(name="Wifi")
+        pool = Amenity(name="Pool")
+        state = State(name="Nevada")
+        other_state = State(name="Utah")
+        city = City(name="Reno", state_id=state.id)
+        other_city = City(name="Provo", state_id=other_state.id)
+        for obj in (user, wifi, pool, state, other_state, city, other_city):
+            storage.new(obj)
+        for place_city, amenities in ((city, [wifi, pool]), (city, []),
+                                      (other_city, [wifi])):
+            place = Place(name="Place", city_id=place_city.id,
+                          user_id=user.id)
+            storage.new(place)
+            place.amenities.extend(amenities)
+        storage.save()
+
+        searches = [
+            {},
+            {"states": [state.id]},
+            {"cities": [other_city.id]},
+            {"states": [state.id], "cities": [other_city.id]},
+            {"amenities": [wifi.id, pool.id]},
+            {"states": [other_state.id], "amenities": [wifi.id]},
+            {"amenities": [wifi.id, "unknown"]},
+        ]
+        for search in searches:
+            with self.subTest(search=search):
+                self.assertEqual(
+                    self.count_queries(
+                        lambda: storage.search_places(**search)), 1)
+                self.assertEqual(
+                    {place.id for place in storage.search_places(**search)},
+                    {place.id for place in
+                     Storage.search_places(storage, **search)})
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,15 +1,26 @@
 #!/usr/bin/python3
 """test for File storage"""
 import os
+import threading
 import unittest
+from unittest import mock
+import models
 from models import storage
+from models.engine import indexes
+from models.base_model import BaseModel
+from models.engine.file_storage import FileStorage
+from models.engine.storage import Storage
+from models.amenity import Amenity
+from models.city import City
+from models.place import Place
 from models.state import State
+from tests.test_models.test_engine import StorageTestCase
 
 storage_type = os.getenv("HBNB_TYPE_STORAGE")
 
 
 @unittest.skipIf(storage_type == 'db', 'File Storage test')
-class TestFileStorage(unittest.TestCase):
+class TestFileStorage(StorageTestCase):
     """Tests the File Storage"""
     def test_get(self):
         """Test if get method retrieves obj requested"""
@@ -36,6 +47,326 @@ class TestFileStorage(unittest.TestCase):
 
         self.assertEqual(old_count + 3, storage.count(State))
 
+    def test_all_by_class(self):
+        """Test if all(cls) returns only the objects of that class"""
+        file_storage = FileStorage(self.file_path)
+        state = State(name="Texas")
+        city = City(name="Austin", state_id=state.id)
+        file_storage.new(state)
+        file_storage.new(city)
+
+        self.assertEqual(file_storage.all(State),
+                         {"State.{}".format(state.id): state})
+        self.assertEqual(file_storage.all(City),
+                         {"City.{}".format(city.id): city})
+        self.assertEqual(len(file_storage.all()), 2)
+
+    def test_delete_updates_class_index(self):
+        """Test if delete removes the object from its class bucket"""
+        file_storage = FileStorage(self.file_path)
+        state = State(name="Ohio")
+        file_storage.new(state)
+        file_storage.delete(state)
+
+        self.assertEqual(file_storage.all(State), {})
+        self.assertEqual(file_storage.count(State), 0)
+        self.assertEqual(file_storage.find_all("State"), [])
+
+    def test_counts(self):
+        """Test if counts returns the count of every class"""
+        file_storage = FileStorage(self.file_path)
+        state = State(name="Utah")
+        file_storage.new(state)
+        file_storage.new(City(name="Provo", state_id=state.id))
+
+        counts = file_storage.counts()
+        self.assertEqual(counts["State"], 1)
+        self.assertEqual(counts["City"], 1)
+        self.assertEqual(counts["User"], 0)
+        self.assertEqual(file_storage.count(), 2)
+
+    def test_load_is_ignored(self):
+        """Test if the relationships to load are ignored in file mode"""
+        file_storage = FileStorage(self.file_path)
+        state = State(name="Idaho")
+        file_storage.new(state)
+
+        self.assertIs(file_storage.get(State, state.id, load=["cities"]),
+                      state)
+        self.assertEqual(file_storage.all(State, load=["cities"]),
+                         {"State.{}".format(state.id): state})
+
+    def test_all_by_foreign_key(self):
+        """Test if children are indexed under their parent id"""
+        file_storage = FileStorage(self.file_path)
+        state = State(name="Utah")
+        other_state = State(name="Idaho")
+        city = City(name="Provo", state_id=state.id)
+        file_storage.new(city)
+        file_storage.new(City(name="Boise", state_id=other_state.id))
+
+        self.assertEqual(
+            list(file_storage.all_by_foreign_key(
+                City, "state_id", state.id).values()), [city])
+
+        file_storage.update(city, "state_id", other_state.id)
+        self.assertEqual(
+            file_storage.all_by_foreign_key(City, "state_id", state.id), {})
+        self.assertEqual(len(file_storage.all_by_foreign_key(
+            City, "state_id", other_state.id)), 2)
+
+        file_storage.delete(city)
+        self.assertEqual(len(file_storage.all_by_foreign_key(
+            City, "state_id", other_state.id)), 1)
+
+    def test_foreign_key_set_directly(self):
+        """Test if a foreign key set without update() is indexed again"""
+        file_storage = FileStorage(self.file_path)
+        state = State(name="Utah")
+        other_state = State(name="Idaho")
+        city = City(name="Provo", state_id=state.id)
+        file_storage.new(city)
+
+        city.state_id = other_state.id
+        self.assertEqual(
+            file_storage.all_by_foreign_key(City, "state_id", state.id), {})
+        self.assertEqual(list(file_storage.all_by_foreign_key(
+            City, "state_id", other_state.id).values()), [city])
+
+    def test_save_cost_independent_of_size(self):
+        """
+        Test if a journaled save only reads the objects changed, however
+        many are stored
+        """
+        calls = []
+
+        def counted(name):
+            method = getattr(BaseModel, name)
+            return mock.patch.object(
+                BaseModel, name,
+                lambda obj: calls.append(name) or method(obj))
+
+        def save_calls(size):
+            file_storage = FileStorage(os.path.join(
+                self.tmp_dir.name, "{}.json".format(size)), journal=True)
+            states = [State(name="state-{}".format(index))
+                      for index in range(size)]
+            for state in states:
+                file_storage.new(state)
+            file_storage.save()
+
+            states[0].name = "Renamed"
+            del calls[:]
+            with counted("get_dirty_fields"), counted("to_json"):
+                file_storage.save()
+            return list(calls)
+
+        self.assertEqual(save_calls(10), ["to_json"])
+        self.assertEqual(save_calls(1000), ["to_json"])
+
+    def test_search_places(self):
+        """Test if search_places finds the places the default loop finds"""
+        file_storage = FileStorage(self.file_path)
+        states = [State(name="Utah"), State(name="Idaho")]
+        cities = [City(name="Provo", state_id=states[0].id),
+                  City(name="Ogden", state_id=states[0].id),
+                  City(name="Boise", state_id=states[1].id)]
+        amenities = [Amenity(name="Wifi"), Amenity(name="Pool")]
+        places = [Place(name="place-{}".format(index),
+                        city_id=cities[index % 3].id)
+                  for index in range(6)]
+        for obj in states + cities + amenities + places:
+            file_storage.new(obj)
+        for index, place in enumerate(places):
+            file_storage.update(place, "amenity_ids",
+                                [amenity.id for amenity
+                                 in amenities[:index % 3]])
+
+        searches = [
+            {},
+            {"states": [states[0].id]},
+            {"cities": [cities[2].id]},
+            {"states": [states[1].id], "cities": [cities[0].id]},
+            {"amenities": [amenities[0].id]},
+            {"amenities": [amenities[0].id, amenities[1].id]},
+            {"states": [states[0].id], "amenities": [amenities[1].id]},
+            {"states": ["missing"], "amenities": [amenities[0].id]},
+        ]
+        # Place.amenities, read by the default loop, uses models.storage
+        with mock.patch.object(models, "storage", file_storage):
+            for search in searches:
+                self.assertCountEqual(
+                    file_storage.search_places(**search),
+                    Storage.search_places(file_storage, **search))
+
+        file_storage.update(places[0], "amenity_ids", [amenities[1].id])
+        self.assertEqual(file_storage.search_places(
+            amenities=[amenities[1].id], cities=[cities[0].id]),
+            [places[0]])
+        self.assertEqual(
+            file_storage.search_places(amenities=[amenities[0].id]),
+            sorted(places[1::3] + places[2::3], key=lambda place: place.id))
+
+        # DELETE /places/<id>/amenities/<id> deletes the amenity itself
+        file_storage.delete(amenities[1])
+        self.assertEqual(file_storage.search_places(
+            amenities=[amenities[1].id], cities=[cities[0].id]), [])
+
+    def test_state_cities(self):
+        """Test if State.cities returns the cities of the state"""
+        state = State(name="Oregon")
+        city = City(name="Salem", state_id=state.id)
+        storage.new(state)
+        storage.new(city)
+
+        self.assertEqual(state.cities, [city])
+
+    def test_save_reserializes_dirty_objects(self):
+        """Test if save picks up attributes changed after the last save"""
+        file_storage = FileStorage(self.file_path)
+        state = State(name="Kansas")
+        file_storage.new(state)
+        file_storage.save()
+        self.assertEqual(state.get_dirty_fields(), frozenset())
+
+        state.name = "Arkansas"
+        file_storage.save()
+
+        reloaded = FileStorage(self.file_path)
+        reloaded.reload()
+        self.assertEqual(reloaded.get(State, state.id).name, "Arkansas")
+
+    def test_save_lists_changed_in_place(self):
+        """Test if save writes a list changed in place since a save"""
+        file_storage = FileStorage(self.file_path)
+        place = Place(name="Loft", amenity_ids=["a1"])
+        file_storage.new(place)
+        file_storage.save()
+
+        place.amenity_ids.append("a2")
+        file_storage.save()
+
+        reloaded = FileStorage(self.file_path)
+        reloaded.reload()
+        self.assertEqual(reloaded.get(Place, place.id).amenity_ids,
+                         ["a1", "a2"])
+
+    def test_close_reloads_only_changed_file(self):
+        """Test if close reloads only after another writer saved"""
+        file_storage = FileStorage(self.file_path)
+        file_storage.save()
+        state = State(name="Iowa")
+        file_storage.new(state)
+
+        file_storage.close()
+        self.assertIs(file_storage.get(State, state.id), state)
+
+        other_storage = FileStorage(self.file_path)
+        other_storage.new(State(name="Vermont"))
+        other_storage.save()
+
+        file_storage.close()
+        self.assertIsNone(file_storage.get(State, state.id))
+        self.assertEqual(file_storage.count(State), 1)
+
+    def test_reload_shares_referenced_ids(self):
+        """Test if reloaded foreign keys share the string of the parent id"""
+        file_storage = FileStorage(self.file_path)
+        state = State(name="Texas")
+        file_storage.new(state)
+        file_storage.new(City(name="Austin", state_id=state.id))
+        file_storage.new(City(name="Dallas", state_id=state.id))
+        file_storage.save()
+
+        file_storage.reload()
+        state = file_storage.get(State, state.id)
+        for city in file_storage.all(City).values():
+            self.assertIs(city.state_id, state.id)
+
+    def test_concurrent_readers_and_writers(self):
+        """Test if threads can read while others write and save"""
+        file_storage = FileStorage(self.file_path)
+        errors = []
+
+        def write():
+            try:
+                for index in range(200):
+                    file_storage.new(State(name="state-{}".format(index)))
+                    if index % 50 == 0:
+                        file_storage.save()
+            except Exception as err:
+                errors.append(err)
+
+        def read():
+            try:
+                for _ in range(200):
+                    for state in file_storage.all(State).values():
+                        self.assertIsInstance(state, State)
+                    file_storage.find_all()
+            except Exception as err:
+                errors.append(err)
+
+        threads = [threading.Thread(target=target)
+                   for target in (write, write, read, read)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(file_storage.count(State), 400)
+
+
+@unittest.skipIf(storage_type == 'db', 'File Storage test')
+class TestLazyFileStorage(StorageTestCase):
+    """Tests the File Storage building its objects on first read"""
+    def setUp(self):
+        """Saves a state and its cities"""
+        super().setUp()
+        self.state = State(name="Texas")
+        self.cities = [City(name=name, state_id=self.state.id)
+                       for name in ("Austin", "Dallas")]
+        file_storage = FileStorage(self.file_path)
+        for obj in [self.state] + self.cities:
+            file_storage.new(obj)
+        file_storage.save()
+
+        self.file_storage = FileStorage(self.file_path, lazy=True)
+        self.file_storage.reload()
+
+    def test_build_on_first_read(self):
+        """Test if objects are only built by the reads returning them"""
+        with mock.patch.object(indexes, "hydrate",
+                               wraps=indexes.hydrate) as hydrate:
+            self.assertEqual(self.file_storage.count(City), 2)
+            self.assertEqual(hydrate.call_count, 0)
+
+            state = self.file_storage.get(State, self.state.id)
+            self.assertEqual(state.to_dict(), self.state.to_dict())
+            self.assertIs(self.file_storage.get(State, self.state.id), state)
+            self.assertEqual(hydrate.call_count, 1)
+
+            cities = self.file_storage.all_by_foreign_key(
+                City, "state_id", state.id)
+            self.assertEqual(hydrate.call_count, 3)
+            self.assertEqual(self.file_storage.all(City), cities)
+            self.assertEqual(hydrate.call_count, 3)
+
+    def test_save_unread_objects(self):
+        """Test if save keeps the objects never read"""
+        state = self.file_storage.get(State, self.state.id)
+        self.file_storage.update(state, "name", "Utah")
+        self.file_storage.delete(self.file_storage.get(
+            City, self.cities[0].id))
+        self.file_storage.save()
+
+        reloaded = FileStorage(self.file_path)
+        reloaded.reload()
+        self.assertEqual(reloaded.get(State, self.state.id).name, "Utah")
+        self.assertEqual(list(reloaded.all(City).values())[0].to_dict(),
+                         self.cities[1].to_dict())
+        self.assertEqual(reloaded.count(City), 1)
+
 
 if __name__ == '__main__':
     unittest.main()
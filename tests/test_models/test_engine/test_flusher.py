@@ -0,0 +1,95 @@
+#!/usr/bin/python3
+"""test for the FileStorage write-behind mode"""
+import os
+import time
+import unittest
+from models.engine.file_storage import FileStorage
+from models.engine.flusher import WriteBehindFlusher
+from models.state import State
+from tests.test_models.test_engine import StorageTestCase
+
+storage_type = os.getenv("HBNB_TYPE_STORAGE")
+
+
+@unittest.skipIf(storage_type == 'db', 'File Storage test')
+class TestWriteBehind(StorageTestCase):
+    """Tests the write-behind File Storage"""
+    def test_save_is_deferred_until_flush(self):
+        """Test if save returns before writing and flush persists"""
+        file_storage = FileStorage(self.file_path, flush_interval=60000)
+        state = State(name="Ohio")
+        file_storage.new(state)
+        file_storage.save()
+        self.assertFalse(os.path.isfile(self.file_path))
+
+        file_storage.flush()
+        reloaded = FileStorage(self.file_path)
+        reloaded.reload()
+        self.assertEqual(reloaded.get(State, state.id).name, "Ohio")
+
+    def test_flush_after_max_changes(self):
+        """Test if a burst of saves is flushed without waiting"""
+        file_storage = FileStorage(self.file_path, flush_interval=60000,
+                                   flush_changes=3)
+        for index in range(3):
+            file_storage.new(State(name="state-{}".format(index)))
+            file_storage.save()
+
+        deadline = time.monotonic() + 5
+        while (not os.path.isfile(self.file_path) and
+               time.monotonic() < deadline):
+            time.sleep(0.01)
+
+        reloaded = FileStorage(self.file_path)
+        reloaded.reload()
+        self.assertEqual(reloaded.count(State), 3)
+
+    def test_flush_after_interval(self):
+        """Test if a pending save is flushed once the interval elapses"""
+        flushes = []
+        flusher = WriteBehindFlusher(lambda: flushes.append(1), 10, 1000)
+        for _ in range(5):
+            flusher.notify()
+
+        deadline = time.monotonic() + 5
+        while not flushes and time.monotonic() < deadline:
+            time.sleep(0.01)
+        flushed = list(flushes)
+        flusher.stop()
+
+        self.assertEqual(flushed, [1])
+        self.assertEqual(flusher.pending(), 0)
+
+    def test_flush_error_keeps_thread_alive(self):
+        """Test if a flush raising any error is retried by the thread"""
+        flushes = []
+
+        def flush():
+            flushes.append(1)
+            if len(flushes) == 1:
+                raise TypeError("Object is not JSON serializable")
+
+        flusher = WriteBehindFlusher(flush, 10, 1)
+        with self.assertLogs("models.engine.flusher") as logs:
+            flusher.notify()
+            deadline = time.monotonic() + 5
+            while len(flushes) < 2 and time.monotonic() < deadline:
+                time.sleep(0.01)
+        flusher.stop()
+
+        self.assertEqual(len(flushes), 2)
+        self.assertEqual(flusher.pending(), 0)
+        self.assertIn("TypeError", logs.output[0])
+
+    def test_stop_flushes_pending_saves(self):
+        """Test if stopping the flusher persists the pending saves"""
+        flushes = []
+        flusher = WriteBehindFlusher(lambda: flushes.append(1), 60000, 1000)
+        flusher.notify()
+        flusher.stop()
+
+        self.assertEqual(flushes, [1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+#!/usr/bin/python3
+"""test for the GroupCommit class"""
+import threading
+import time
+import unittest
+from models.engine.group_commit import GroupCommit
+
+
+class TestGroupCommit(unittest.TestCase):
+    """Tests the batching of concurrent commits"""
+    def test_concurrent_commits_share_writes(self):
+        """Test if commits queued during a write share the next one"""
+        writes = []
+        started = threading.Event()
+
+        def write():
+            writes.append(time.monotonic())
+            started.set()
+            time.sleep(0.1)
+
+        group_commit = GroupCommit(write)
+        leader = threading.Thread(target=group_commit.commit)
+        leader.start()
+        started.wait()
+
+        followers = [threading.Thread(target=group_commit.commit)
+                     for _ in range(8)]
+        for thread in followers:
+            thread.start()
+        for thread in [leader] + followers:
+            thread.join()
+
+        self.assertEqual(len(writes), 2)
+
+    def test_failed_write_is_retried(self):
+        """Test if a failed write raises and the next commit retries"""
+        calls = []
+
+        def write():
+            calls.append(1)
+            if len(calls) == 1:
+                raise OSError("disk full")
+
+        group_commit = GroupCommit(write)
+        with self.assertRaises(OSError):
+            group_commit.commit()
+        group_commit.commit()
+
+        self.assertEqual(len(calls), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+#!/usr/bin/python3
+"""test for the FileStorage journal"""
+import os
+import subprocess
+import sys
+import unittest
+from models.engine.file_storage import FileStorage
+from models.engine.journal import Journal
+from models.engine.snapshots import JSONSnapshot
+from models.state import State
+from tests.test_models.test_engine import StorageTestCase
+
+storage_type = os.getenv("HBNB_TYPE_STORAGE")
+
+
+@unittest.skipIf(storage_type == 'db', 'File Storage test')
+class TestJournal(StorageTestCase):
+    """Tests the journaled File Storage"""
+    def test_save_appends_changes(self):
+        """Test if save appends to the log instead of the snapshot"""
+        file_storage = FileStorage(self.file_path, journal=True)
+        state = State(name="Nevada")
+        file_storage.new(state)
+        file_storage.save()
+
+        self.assertFalse(os.path.isfile(self.file_path))
+        self.assertTrue(os.path.isfile(self.file_path + ".log"))
+
+        reloaded = FileStorage(self.file_path, journal=True)
+        reloaded.reload()
+        self.assertEqual(reloaded.get(State, state.id).name, "Nevada")
+
+    def test_save_attributes_set_directly(self):
+        """Test if save logs the attributes set without update()"""
+        file_storage = FileStorage(self.file_path, journal=True)
+        state = State(name="Nevada")
+        file_storage.new(state)
+        file_storage.save()
+
+        state.name = "Oregon"
+        file_storage.save()
+
+        reloaded = FileStorage(self.file_path, journal=True)
+        reloaded.reload()
+        self.assertEqual(reloaded.get(State, state.id).name, "Oregon")
+
+    def test_reload_replays_deletes(self):
+        """Test if deletes logged after a snapshot are replayed"""
+        file_storage = FileStorage(self.file_path)
+        state = State(name="Maine")
+        file_storage.new(state)
+        file_storage.save()
+
+        file_storage = FileStorage(self.file_path, journal=True)
+        file_storage.reload()
+        file_storage.delete(file_storage.get(State, state.id))
+        file_storage.save()
+
+        reloaded = FileStorage(self.file_path)
+        reloaded.reload()
+        self.assertIsNone(reloaded.get(State, state.id))
+
+    def test_compaction(self):
+        """Test if the log is folded into the snapshot past its max size"""
+        journal = Journal(JSONSnapshot(self.file_path), max_size=1)
+        journal.append({"State.1": '{"id": "1", "__class__": "State"}'})
+        journal.wait()
+
+        self.assertTrue(os.path.isfile(self.file_path))
+        self.assertFalse(journal.exists())
+        self.assertEqual(journal.replay({}), {})
+
+        reloaded = FileStorage(self.file_path)
+        reloaded.reload()
+        self.assertEqual(reloaded.count(State), 1)
+
+    def test_leftover_rotated_log(self):
+        """
+        Test if the rotated log and the temporary files left by a
+        process that exited mid-compaction are cleaned by the next append
+        """
+        process = subprocess.Popen([sys.executable, "-c", "pass"])
+        process.wait()
+        with open(self.file_path + ".log.1", "w") as file:
+            file.write('{"key": "State.1", "value": '
+                       '{"id": "1", "__class__": "State"}}\n')
+        with open(self.file_path + ".log.1.pid", "w") as file:
+            file.write(str(process.pid))
+        tmp_path = "{}.{}.1.tmp".format(self.file_path, process.pid)
+        with open(tmp_path, "w") as file:
+            file.write("{")
+
+        journal = Journal(JSONSnapshot(self.file_path), max_size=1)
+        journal.append({"State.2": '{"id": "2", "__class__": "State"}'})
+        journal.wait()
+
+        self.assertFalse(journal.exists())
+        self.assertFalse(os.path.isfile(self.file_path + ".log.1.pid"))
+        self.assertFalse(os.path.isfile(tmp_path))
+        reloaded = FileStorage(self.file_path)
+        reloaded.reload()
+        self.assertEqual(reloaded.count(State), 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,166 @@
+#!/usr/bin/python3
+"""test for the mapped snapshot format"""
+import os
+import unittest
+from unittest import mock
+from models.engine import indexes
+from models.engine.file_storage import FileStorage
+from models.engine.journal import Journal
+from models.engine.mapped import MAGIC, MappedFile, map_chunks
+from models.engine.snapshots import MappedSnapshot
+from models.city import City
+from models.state import State
+from tests.test_models.test_engine import StorageTestCase
+
+storage_type = os.getenv("HBNB_TYPE_STORAGE")
+
+
+class TestMappedFile(StorageTestCase):
+    """Tests the mapped file layout"""
+    file_name = "file.map"
+
+    def write(self, encoded_by_class):
+        """Writes and maps a file"""
+        with open(self.file_path, "wb") as file:
+            for chunk in map_chunks(encoded_by_class):
+                file.write(chunk)
+        return MappedFile(self.file_path)
+
+    def test_find_and_children(self):
+        """Test if objects are found by id and by parent"""
+        mapped_file = self.write({
+            "State": [("State.b", ('{"id": "b"}', ())),
+                      ("State.a", ('{"id": "a"}', ()))],
+            "City": [("City.{}".format(index),
+                      ('{{"n": {}}}'.format(index),
+                       (("state_id", "ab"[index % 2]),)))
+                     for index in range(5)],
+        })
+
+        self.assertEqual(mapped_file.count("State"), 2)
+        self.assertEqual(mapped_file.count("User"), 0)
+        self.assertEqual(list(mapped_file.entries("State")),
+                         [("a", '{"id": "a"}'), ("b", '{"id": "b"}')])
+        index = mapped_file.find("State", "b")
+        self.assertEqual(mapped_file.text("State", index), '{"id": "b"}')
+        self.assertIsNone(mapped_file.find("State", "c"))
+        self.assertIsNone(mapped_file.find("User", "a"))
+
+        self.assertEqual(
+            [mapped_file.id("City", index) for index
+             in mapped_file.children("City", "state_id", "a")],
+            ["0", "2", "4"])
+        self.assertEqual(mapped_file.children("City", "state_id", "c"), [])
+        self.assertEqual(mapped_file.children("City", "city_id", "a"), [])
+
+    def test_lone_surrogates(self):
+        """Test if ids and texts with lone surrogates are mapped"""
+        mapped_file = self.write({
+            "State": [("State.a\udc00", ('{"name": "\ud800"}', ()))],
+            "City": [("City.c", ('{}', (("state_id", "a\udc00"),)))],
+        })
+
+        index = mapped_file.find("State", "a\udc00")
+        self.assertEqual(mapped_file.text("State", index),
+                         '{"name": "\ud800"}')
+        self.assertEqual(list(mapped_file.entries("State")),
+                         [("a\udc00", '{"name": "\ud800"}')])
+        self.assertEqual(
+            [mapped_file.id("City", index) for index
+             in mapped_file.children("City", "state_id", "a\udc00")],
+            ["c"])
+
+    def test_invalid_file(self):
+        """Test if a file that is not mapped raises ValueError"""
+        for data in (b"{}", MAGIC, MAGIC + b"{" + bytes(8)):
+            with open(self.file_path, "wb") as file:
+                file.write(data)
+            with self.assertRaises(ValueError):
+                MappedFile(self.file_path)
+
+
+@unittest.skipIf(storage_type == 'db', 'File Storage test')
+class TestMappedFileStorage(StorageTestCase):
+    """Tests the File Storage reading a mapped file"""
+    file_name = "file.map"
+
+    def setUp(self):
+        """Saves a state and its cities in a mapped file"""
+        super().setUp()
+        self.state = State(name="Ohio")
+        self.cities = [City(name=name, state_id=self.state.id)
+                       for name in ("Akron", "Dayton")]
+        file_storage = self.storage()
+        for obj in [self.state] + self.cities:
+            file_storage.new(obj)
+        file_storage.save()
+
+    def storage(self, **kwargs):
+        """Returns a storage of the mapped file, reloaded"""
+        file_storage = FileStorage(self.file_path, file_format="mapped",
+                                   **kwargs)
+        file_storage.reload()
+        return file_storage
+
+    def test_build_on_read(self):
+        """Test if only the objects read are built, once"""
+        file_storage = self.storage()
+        with mock.patch.object(indexes, "hydrate",
+                               wraps=indexes.hydrate) as hydrate:
+            self.assertEqual(file_storage.count(City), 2)
+            self.assertEqual(hydrate.call_count, 0)
+
+            state = file_storage.get(State, self.state.id)
+            self.assertIs(file_storage.get(State, self.state.id), state)
+            self.assertEqual(state.to_dict(), self.state.to_dict())
+            self.assertEqual(hydrate.call_count, 1)
+
+            self.assertEqual(len(file_storage.all_by_foreign_key(
+                City, "state_id", self.state.id)), 2)
+            self.assertEqual(len(file_storage.all()), 3)
+            self.assertEqual(hydrate.call_count, 3)
+
+    def assert_changed(self, file_storage):
+        """Checks the objects of a storage after test_delta() changes"""
+        self.assertEqual(file_storage.count(City), 2)
+        self.assertIsNone(file_storage.get(City, self.cities[0].id))
+        cities = file_storage.all_by_foreign_key(City, "state_id",
+                                                 self.state.id)
+        self.assertEqual([city.name for city in cities.values()],
+                         ["Toledo"])
+        self.assertEqual(len(file_storage.all_by_foreign_key(
+            City, "state_id", "other")), 1)
+
+    def test_delta(self):
+        """Test if the changes hide the mapped objects, until saved"""
+        file_storage = self.storage()
+        file_storage.delete(file_storage.get(City, self.cities[0].id))
+        dayton = file_storage.get(City, self.cities[1].id)
+        file_storage.update(dayton, "state_id", "other")
+        file_storage.new(City(name="Toledo", state_id=self.state.id))
+        self.assert_changed(file_storage)
+
+        file_storage.save()
+        self.assert_changed(file_storage)
+        self.assert_changed(self.storage())
+
+    def test_journal(self):
+        """Test if journaled changes are replayed, then compacted"""
+        file_storage = self.storage(journal=True)
+        file_storage.delete(file_storage.get(City, self.cities[0].id))
+        file_storage.save()
+        self.assertEqual(self.storage(journal=True).count(City), 1)
+
+        journal = Journal(MappedSnapshot(self.file_path), max_size=1)
+        journal.append({"State.1": '{"id": "1", "__class__": "State"}'})
+        journal.wait()
+        self.assertFalse(journal.exists())
+
+        reloaded = self.storage()
+        self.assertEqual(reloaded.count(City), 1)
+        self.assertEqual(reloaded.count(State), 2)
+        self.assertEqual(reloaded.get(State, "1").id, "1")
+
+
+if __name__ == '__main__':
+    unittest.main()
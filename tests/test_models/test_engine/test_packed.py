@@ -0,0 +1,113 @@
+#!/usr/bin/python3
+"""test for the packed binary snapshot format"""
+import os
+import unittest
+from models.engine.file_storage import FileStorage
+from models.engine.journal import Journal
+from models.engine.packed import MAGIC, pack_records, unpack_records
+from models.engine.snapshots import PackedSnapshot
+from models.place import Place
+from models.state import State
+from tests.test_models.test_engine import StorageTestCase
+
+storage_type = os.getenv("HBNB_TYPE_STORAGE")
+
+
+class TestPackedRecords(unittest.TestCase):
+    """Tests the packed encoding of records"""
+    def round_trip(self, class_name, records):
+        """Packs then unpacks records"""
+        data = MAGIC + pack_records(class_name, records)
+        pairs, offset = unpack_records(data, len(MAGIC))
+        self.assertEqual(offset, len(data))
+        return pairs
+
+    def test_round_trip(self):
+        """Test if every kind of value survives packing"""
+        records = [
+            {"id": "1f0c3a9e-8d3b-4c7e-9a55-0c2b1d6f4e21",
+             "created_at": "2017-09-28T21:05:54.119427",
+             "updated_at": "2017-09-28T21:05:54",
+             "city_id": "7e7e3c39-2b1c-4d6e-8f00-aa2b3c4d5e6f",
+             "name": "Chez Zoé 🏠", "number_rooms": 3,
+             "latitude": 37.77, "amenity_ids": [],
+             "__class__": "Place"},
+            {"id": "not-a-uuid",
+             "created_at": "2017-09-28T21:05:54+00:00",
+             "updated_at": "2017-09-28T21:05:54.000000",
+             "name": "", "number_rooms": 2 ** 70,
+             "latitude": 1, "amenity_ids": [
+                 "1f0c3a9e-8d3b-4c7e-9a55-0c2b1d6f4e21"],
+             "extra": {"nested": [True, None]}, "__class__": "Place"},
+        ]
+
+        pairs = self.round_trip("Place", records)
+        self.assertEqual(pairs, [
+            ("Place.{}".format(record["id"]), record) for record in records
+        ])
+
+    def test_missing_attributes(self):
+        """Test if attributes set on some records only are kept apart"""
+        records = [{"id": str(index), "__class__": "State"}
+                   for index in range(3)]
+        records[1]["name"] = "Utah"
+
+        pairs = self.round_trip("State", records)
+        self.assertEqual([record for key, record in pairs], records)
+
+    def test_lone_surrogates(self):
+        """Test if strings with lone surrogates, valid JSON, are packed"""
+        records = [{"id": "a\udc00b", "name": "\ud800",
+                    "extra": ["\udfff"], "__class__": "State"}]
+
+        pairs = self.round_trip("State", records)
+        self.assertEqual([record for key, record in pairs], records)
+
+    def test_empty_class(self):
+        """Test if a class without records packs to an empty block"""
+        self.assertEqual(self.round_trip("State", []), [])
+
+
+@unittest.skipIf(storage_type == 'db', 'File Storage test')
+class TestPackedSnapshot(StorageTestCase):
+    """Tests the File Storage saved in the packed format"""
+    file_name = "file.bin"
+
+    def test_save_and_reload(self):
+        """Test if objects round-trip through a packed file"""
+        file_storage = FileStorage(self.file_path, file_format="packed")
+        state = State(name="Oregon")
+        place = Place(name="Cabin", max_guest=4, latitude=45.5)
+        file_storage.new(state)
+        file_storage.new(place)
+        file_storage.save()
+
+        with open(self.file_path, "rb") as file:
+            self.assertTrue(file.read().startswith(MAGIC))
+
+        reloaded = FileStorage(self.file_path, file_format="packed")
+        reloaded.reload()
+        self.assertEqual(reloaded.get(State, state.id).to_dict(),
+                         state.to_dict())
+        self.assertEqual(reloaded.get(Place, place.id).to_dict(),
+                         place.to_dict())
+
+    def test_journal_compaction(self):
+        """Test if the journal is folded into a packed file"""
+        journal = Journal(PackedSnapshot(self.file_path), max_size=1)
+        journal.append({"State.1": '{"id": "1", "__class__": "State"}'})
+        journal.wait()
+        self.assertFalse(journal.exists())
+
+        reloaded = FileStorage(self.file_path, file_format="packed")
+        reloaded.reload()
+        self.assertEqual(reloaded.get(State, "1").id, "1")
+
+    def test_unknown_format(self):
+        """Test if an unknown file format is rejected"""
+        with self.assertRaises(ValueError):
+            FileStorage(self.file_path, file_format="xml")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,123 @@
+#!/usr/bin/python3
+"""test for the FileStorage files shared between processes"""
+import multiprocessing
+import os
+import unittest
+from unittest import mock
+from models.engine.file_storage import FileStorage
+from models.engine.journal import Journal
+from models.engine.shared import ChangeCounter
+from models.engine.snapshots import JSONSnapshot
+from models.state import State
+from tests.test_models.test_engine import StorageTestCase
+
+storage_type = os.getenv("HBNB_TYPE_STORAGE")
+
+
+def save_states(file_path, count):
+    """Saves states one at a time, from another process"""
+    file_storage = FileStorage(file_path, shared=True)
+    file_storage.reload()
+    for index in range(count):
+        file_storage.new(State(name=str(index)))
+        file_storage.save()
+
+
+class TestJournalChangesSince(StorageTestCase):
+    """Tests reading the journal incrementally"""
+    def setUp(self):
+        """Creates a journal in a temporary directory"""
+        super().setUp()
+        self.journal = Journal(JSONSnapshot(self.file_path))
+
+    def test_counter(self):
+        """Test if the counter is 0 until written"""
+        counter = ChangeCounter(self.file_path + ".changes")
+        self.assertEqual(counter.read(), 0)
+        counter.write(42)
+        self.assertEqual(counter.read(), 42)
+
+    def test_reads_new_records_only(self):
+        """Test if each call returns the records saved since the last"""
+        self.journal.append({"State.1": '{"id": "1"}'}, 1)
+        self.journal.append({"State.2": '{"id": "2"}', "State.1": None}, 2)
+        self.assertEqual(self.journal.changes_since(1),
+                         ({"State.2": {"id": "2"}, "State.1": None}, 2))
+
+        self.assertEqual(self.journal.changes_since(2), ({}, 2))
+
+        self.journal.append({"State.3": '{"id": "3"}'}, 3)
+        self.assertEqual(self.journal.changes_since(2),
+                         ({"State.3": {"id": "3"}}, 3))
+
+    def test_missing_records(self):
+        """Test if records folded into the snapshot or unnumbered fail"""
+        self.journal.append({"State.2": '{"id": "2"}'}, 2)
+        self.assertIsNone(self.journal.changes_since(0))
+
+        self.journal.append({"State.3": '{"id": "3"}'})
+        self.assertIsNone(self.journal.changes_since(2))
+
+
+@unittest.skipIf(storage_type == 'db', 'File Storage test')
+class TestSharedFileStorage(StorageTestCase):
+    """Tests the File Storage in shared mode"""
+    def storage(self):
+        """Returns a reloaded storage of the shared files"""
+        file_storage = FileStorage(self.file_path, shared=True)
+        file_storage.reload()
+        return file_storage
+
+    def test_close_applies_missed_changes(self):
+        """Test if close() applies the saves of others, incrementally"""
+        writer = self.storage()
+        reader = self.storage()
+        state = State(name="Utah")
+        writer.new(state)
+        writer.save()
+
+        with mock.patch.object(FileStorage, "_reload") as reload:
+            reader.close()
+            reader.close()
+        reload.assert_not_called()
+        self.assertEqual(reader.get(State, state.id).name, "Utah")
+
+        writer.delete(state)
+        writer.save()
+        reader.close()
+        self.assertEqual(reader.count(State), 0)
+
+    def test_save_keeps_other_changes(self):
+        """Test if a save applies the saves of others before its own"""
+        first = self.storage()
+        second = self.storage()
+        state = State(name="Iowa")
+        first.new(state)
+        first.save()
+
+        second.new(State(name="Ohio"))
+        second.save()
+        first.update(first.get(State, state.id), "name", "Idaho")
+        first.save()
+
+        for file_storage in (first, second, self.storage()):
+            file_storage.close()
+            self.assertEqual(sorted(obj.name for obj in
+                                    file_storage.all(State).values()),
+                             ["Idaho", "Ohio"])
+
+    def test_concurrent_processes(self):
+        """Test if no save is lost when processes save at once"""
+        workers = [multiprocessing.Process(target=save_states,
+                                           args=(self.file_path, 10))
+                   for _ in range(3)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        self.assertEqual(self.storage().count(State), 30)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+#!/usr/bin/python3
+"""test for the snapshot cache of File storage"""
+import os
+import unittest
+from unittest import mock
+from models.engine.file_storage import FileStorage
+from models.engine.snapshot_cache import SnapshotCache
+from models.engine.snapshots import JSONSnapshot
+from models.state import State
+from tests.test_models.test_engine import StorageTestCase
+
+storage_type = os.getenv("HBNB_TYPE_STORAGE")
+
+
+class TestSnapshotCache(StorageTestCase):
+    """Tests the cache file"""
+    def setUp(self):
+        """Creates a temporary directory for the files"""
+        super().setUp()
+        self.cache = SnapshotCache(self.file_path + ".cache")
+
+    def test_checksum_follows_content(self):
+        """Test if the checksum changes with the content of the files"""
+        missing = self.cache.checksum([self.file_path])
+        with open(self.file_path, "w") as file:
+            file.write("{}")
+        empty = self.cache.checksum([self.file_path])
+
+        self.assertNotEqual(missing, empty)
+        self.assertEqual(empty, self.cache.checksum([self.file_path]))
+
+    def test_load_matching_checksum_only(self):
+        """Test if the pairs are only loaded for their checksum"""
+        pairs = [("State.1", {"id": "1", "__class__": "State"})]
+        self.cache.dump(b"a" * 20, pairs)
+
+        self.assertEqual(self.cache.load(b"a" * 20), pairs)
+        self.assertIsNone(self.cache.load(b"b" * 20))
+
+    def test_load_corrupted(self):
+        """Test if a truncated or missing cache is ignored"""
+        self.assertIsNone(self.cache.load(b"a" * 20))
+
+        self.cache.dump(b"a" * 20, [("State.1", {"id": "1"})])
+        with open(self.cache.path, "r+b") as file:
+            file.truncate(os.path.getsize(self.cache.path) - 3)
+        self.assertIsNone(self.cache.load(b"a" * 20))
+
+
+@unittest.skipIf(storage_type == 'db', 'File Storage test')
+class TestFileStorageCache(StorageTestCase):
+    """Tests the File Storage reloading from its cache"""
+    def setUp(self):
+        """Saves a storage in a temporary directory"""
+        super().setUp()
+        self.state = State(name="Nevada")
+        file_storage = FileStorage(self.file_path)
+        file_storage.new(self.state)
+        file_storage.save()
+
+    def reload(self, lazy=False):
+        """Returns a storage reloaded with the cache"""
+        file_storage = FileStorage(self.file_path, cache=True, lazy=lazy)
+        file_storage.reload()
+        return file_storage
+
+    def test_reload_from_cache(self):
+        """Test if a second reload reads the cache, not the file"""
+        self.reload()
+        self.assertTrue(os.path.exists(self.file_path + ".cache"))
+
+        with mock.patch.object(JSONSnapshot, "stream") as stream:
+            file_storage = self.reload()
+        stream.assert_not_called()
+        self.assertEqual(file_storage.get(State, self.state.id).to_dict(),
+                         self.state.to_dict())
+
+    def test_lazy_reload_from_cache(self):
+        """Test if the lazy records of the cache are read from the file"""
+        self.reload(lazy=True)
+        self.assertTrue(os.path.exists(self.file_path + ".lazy.cache"))
+
+        with mock.patch.object(JSONSnapshot, "stream_texts") as stream:
+            file_storage = self.reload(lazy=True)
+        stream.assert_not_called()
+        self.assertEqual(file_storage.get(State, self.state.id).to_dict(),
+                         self.state.to_dict())
+
+    def test_reload_stale_cache(self):
+        """Test if the file is read again once changed"""
+        self.reload()
+        other_storage = FileStorage(self.file_path)
+        other_storage.reload()
+        other_storage.update(other_storage.get(State, self.state.id),
+                             "name", "Arizona")
+        other_storage.save()
+
+        self.assertEqual(self.reload().get(State, self.state.id).name,
+                         "Arizona")
+        with mock.patch.object(JSONSnapshot, "stream") as stream:
+            file_storage = self.reload()
+        stream.assert_not_called()
+        self.assertEqual(file_storage.get(State, self.state.id).name,
+                         "Arizona")
+
+
+if __name__ == '__main__':
+    unittest.main()
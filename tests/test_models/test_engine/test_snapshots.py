@@ -0,0 +1,137 @@
+#!/usr/bin/python3
+"""test for the FileStorage snapshot layouts"""
+import json
+import os
+import unittest
+from unittest.mock import patch
+from models.engine.file_storage import FileStorage
+from models.engine.snapshots import PartitionedJSONSnapshot, \
+    iter_json_object
+from models.city import City
+from models.state import State
+from tests.test_models.test_engine import StorageTestCase
+
+storage_type = os.getenv("HBNB_TYPE_STORAGE")
+
+
+@unittest.skipIf(storage_type == 'db', 'File Storage test')
+class TestPartitionedJSONSnapshot(StorageTestCase):
+    """Tests the per-class partitioned File Storage layout"""
+    def partition(self, class_name):
+        """Returns the partition path of a class"""
+        return os.path.join(self.tmp_dir.name,
+                            "file.{}.json".format(class_name))
+
+    def test_save_rewrites_changed_partitions(self):
+        """Test if save only rewrites the partitions that changed"""
+        file_storage = FileStorage(self.file_path, partitioned=True)
+        state = State(name="Alaska")
+        file_storage.new(state)
+        file_storage.new(City(name="Juneau", state_id=state.id))
+        file_storage.save()
+
+        self.assertTrue(os.path.isfile(self.partition("State")))
+        city_mtime = os.stat(self.partition("City")).st_mtime_ns
+
+        state.name = "Hawaii"
+        file_storage.save()
+        self.assertEqual(os.stat(self.partition("City")).st_mtime_ns,
+                         city_mtime)
+
+        reloaded = FileStorage(self.file_path, partitioned=True)
+        reloaded.reload()
+        self.assertEqual(reloaded.get(State, state.id).name, "Hawaii")
+        self.assertEqual(reloaded.count(City), 1)
+
+    @patch.object(PartitionedJSONSnapshot, "PARALLEL_LOAD_SIZE", 0)
+    @patch("os.cpu_count", return_value=2)
+    def test_parallel_load(self, cpu_count):
+        """Test if partitions decoded by the process pool are merged"""
+        file_storage = FileStorage(self.file_path, partitioned=True)
+        state = State(name="Florida")
+        file_storage.new(state)
+        file_storage.new(City(name="Miami", state_id=state.id))
+        file_storage.save()
+
+        reloaded = FileStorage(self.file_path, partitioned=True)
+        reloaded.reload()
+        self.assertEqual(len(reloaded.all()), 2)
+        self.assertEqual(len(reloaded.all_by_foreign_key(
+            City, "state_id", state.id)), 1)
+
+    def test_migrate_single_file(self):
+        """Test if a single-file snapshot is split into partitions"""
+        file_storage = FileStorage(self.file_path)
+        state = State(name="Georgia")
+        file_storage.new(state)
+        file_storage.save()
+
+        PartitionedJSONSnapshot(self.file_path).migrate()
+        self.assertFalse(os.path.isfile(self.file_path))
+        self.assertTrue(os.path.isfile(self.partition("State")))
+
+        reloaded = FileStorage(self.file_path, partitioned=True)
+        reloaded.reload()
+        self.assertEqual(reloaded.get(State, state.id).name, "Georgia")
+
+
+class TestIterJSONObject(StorageTestCase):
+    """Tests the incremental JSON object decoder"""
+    def write(self, text):
+        """Writes the temporary file"""
+        with open(self.file_path, "w") as file:
+            file.write(text)
+
+    def test_decodes_across_reads(self):
+        """Test if members split across reads are decoded whole"""
+        content = {
+            "State.1": {"id": "1", "name": "Ohio", "rank": 12345},
+            "Place.2": {"id": "2", "amenity_ids": ["a", "b"],
+                        "latitude": 37.5, "description": None},
+            "User.3": {},
+        }
+        for indent in (None, 4):
+            self.write(json.dumps(content, indent=indent))
+            for read_size in (1, 3, 7, 4096):
+                self.assertEqual(
+                    dict(iter_json_object(self.file_path, read_size)),
+                    content)
+
+    def test_texts_and_positions(self):
+        """Test if each text is found at its position, until non-ASCII"""
+        content = {"State.1": {"id": "1"}, "Place.2": {"name": "Loft"},
+                   "Place.3": {"name": "Zoé"}, "Place.4": {"id": "4"}}
+        self.write(json.dumps(content, indent=2, ensure_ascii=False))
+        with open(self.file_path, "rb") as file:
+            data = file.read()
+
+        for read_size in (1, 5, 4096):
+            items = list(iter_json_object(self.file_path, read_size,
+                                          texts=True))
+            self.assertEqual([(key, json.loads(text))
+                              for key, value, text, position in items],
+                             list(content.items()))
+            for key, value, text, position in items:
+                if position is not None:
+                    self.assertEqual(
+                        data[position:position + len(text)].decode(), text)
+            self.assertIsNone(items[-1][3])
+            if read_size == 1:
+                self.assertIsNotNone(items[1][3])
+
+    def test_empty_object(self):
+        """Test if an empty object yields nothing"""
+        self.write(" {\n} \n")
+        self.assertEqual(list(iter_json_object(self.file_path, 1)), [])
+
+    def test_invalid_files(self):
+        """Test if truncated or invalid files raise JSONDecodeError"""
+        for text in ('{"State.1": {"id": "1"', '{"State.1": 12',
+                     '{"State.1": {}} {}', '[]', ''):
+            self.write(text)
+            with self.assertRaises(json.JSONDecodeError):
+                list(iter_json_object(self.file_path, 4))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -13,7 +13,7 @@ app.url_map.strict_slashes = False
 @app.route('/hbnb_filters')
 def hbnb():
     amenities = storage.all(Amenity).values()
-    states = storage.all(State).values()
+    states = storage.all(State, load=["cities"]).values()
     return render_template(
         "10-hbnb_filters.html",
         amenities=amenities,
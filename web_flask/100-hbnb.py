@@ -19,8 +19,8 @@ app.url_map.strict_slashes = False
 def hbnb():
     """Displays the main HBnB filters HTML page."""
     amenities = storage.all(Amenity).values()
-    places = storage.all(Place).values()
-    states = storage.all(State).values()
+    places = storage.all(Place, load=["user"]).values()
+    states = storage.all(State, load=["cities"]).values()
     return render_template(
         "100-hbnb.html",
         amenities=amenities,
@@ -45,7 +45,7 @@ def state_id(id):
         Rendered HTML template displaying the state
         details if found, otherwise an empty template.
     """
-    state = storage.find("State", id)
+    state = storage.find("State", id, load=["cities"])
     if not state:
         return render_template("9-states.html")
 